@@ -3,14 +3,13 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import time
 from pathlib import Path
 from typing import Any
 
 from fastapi import FastAPI, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 
 from api.schemas import (
     ChainInfoResponse,
@@ -22,6 +21,8 @@ from api.schemas import (
     OpportunityResponse,
     StatsResponse,
 )
+from src import jsonio
+from src.state_store import StateStore
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "data"
@@ -33,11 +34,22 @@ def _load_json(path: Path, default: dict[str, Any]) -> dict[str, Any]:
     if not path.exists():
         return default
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return jsonio.read_json(path)
     except Exception:
         return default
 
 
+_STATE: StateStore | None = None
+
+
+def _state() -> StateStore | None:
+    """Read-only view of the agent's SQLite state store, once the agent has created it."""
+    global _STATE
+    if _STATE is None and (DATA_DIR / "arbsense.db").exists():
+        _STATE = StateStore(DATA_DIR / "arbsense.db", readonly=True)
+    return _STATE
+
+
 def _read_env() -> dict[str, str]:
     """Parse .env values for non-secret display fields."""
     if not ENV_PATH.exists():
@@ -159,7 +171,7 @@ def _onchain_opportunity_count(rpc_url: str, contract_address: str) -> int:
     try:
         from web3 import Web3  # type: ignore
 
-        artifact = json.loads(artifact_path.read_text(encoding="utf-8"))
+        artifact = jsonio.read_json(artifact_path)
         abi = artifact.get("abi", [])
         w3 = Web3(Web3.HTTPProvider(rpc_url))
         if not w3.is_connected():
@@ -170,7 +182,11 @@ def _onchain_opportunity_count(rpc_url: str, contract_address: str) -> int:
         return 0
 
 
-app = FastAPI(title="ArbSense API", version="1.0.0")
+app = FastAPI(
+    title="ArbSense API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse if jsonio.backend() == "orjson" else JSONResponse,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -186,33 +202,58 @@ def health() -> HealthResponse:
     return HealthResponse(status="ok")
 
 
+def _involves(row: dict[str, Any], market_id: str | None) -> bool:
+    if market_id is None:
+        return True
+    return market_id in (str(row.get("market_a", {}).get("market_id")), str(row.get("market_b", {}).get("market_id")))
+
+
 @app.get("/markets", response_model=list[MarketResponse])
-def markets() -> list[MarketResponse]:
-    """Return all market data as a list."""
-    payload = _load_json(DATA_DIR / "markets.json", {"markets": []})
-    return [MarketResponse(**m) for m in payload.get("markets", [])]
+def markets(platform: str | None = None) -> list[MarketResponse]:
+    """Return all market data as a list, optionally for one platform."""
+    state = _state()
+    if state is not None:
+        rows = state.markets(platform=platform)
+    else:
+        payload = _load_json(DATA_DIR / "markets.json", {"markets": []})
+        rows = [m for m in payload.get("markets", []) if platform is None or m.get("platform") == platform]
+    return [MarketResponse(**m) for m in rows]
 
 
 @app.get("/opportunities", response_model=list[OpportunityResponse])
-def opportunities() -> list[OpportunityResponse]:
-    """Return scored opportunities list."""
-    payload = _load_json(DATA_DIR / "opportunities.json", {"all_opportunities": [], "time_value_spreads": []})
-    rows = payload.get("all_opportunities", []) + payload.get("time_value_spreads", [])
+def opportunities(market_id: str | None = None) -> list[OpportunityResponse]:
+    """Return scored opportunities list, optionally those involving one market."""
+    state = _state()
+    if state is not None:
+        rows = state.opportunities(market_id=market_id)
+    else:
+        payload = _load_json(DATA_DIR / "opportunities.json", {"all_opportunities": [], "time_value_spreads": []})
+        rows = payload.get("all_opportunities", []) + payload.get("time_value_spreads", [])
+        rows = [row for row in rows if _involves(row, market_id)]
     return [_normalize_opportunity(row) for row in rows]
 
 
 @app.get("/matches", response_model=list[MatchResponse])
-def matches() -> list[MatchResponse]:
-    """Return semantic verification list (matches and non-matches)."""
-    payload = _load_json(DATA_DIR / "verified_matches.json", {"all_verifications": []})
-    return [_normalize_match(row) for row in payload.get("all_verifications", [])]
+def matches(market_id: str | None = None) -> list[MatchResponse]:
+    """Return semantic verification list (matches and non-matches), optionally for one market."""
+    state = _state()
+    if state is not None:
+        rows = state.verdicts(market_id=market_id)
+    else:
+        payload = _load_json(DATA_DIR / "verified_matches.json", {"all_verifications": []})
+        rows = [row for row in payload.get("all_verifications", []) if _involves(row, market_id)]
+    return [_normalize_match(row) for row in rows]
 
 
 @app.get("/logs", response_model=list[LogEntryResponse])
 def logs() -> list[LogEntryResponse]:
     """Return latest 100 logs, newest first."""
-    payload = _load_json(DATA_DIR / "agent_logs.json", {"logs": []})
-    rows = list(reversed(payload.get("logs", [])[-100:]))
+    state = _state()
+    if state is not None:
+        rows = state.logs(limit=100)
+    else:
+        payload = _load_json(DATA_DIR / "agent_logs.json", {"logs": []})
+        rows = list(reversed(payload.get("logs", [])[-100:]))
     out: list[LogEntryResponse] = []
     for i, row in enumerate(rows, start=1):
         out.append(
@@ -229,6 +270,23 @@ def logs() -> list[LogEntryResponse]:
 @app.get("/stats", response_model=StatsResponse)
 def stats() -> StatsResponse:
     """Return dashboard metrics in the documented shape."""
+    state = _state()
+    if state is not None:
+        aggregates = state.stats()
+        return StatsResponse(
+            markets_scanned=aggregates["markets_scanned"],
+            platforms_count=len(aggregates["platform_names"]),
+            platform_names=aggregates["platform_names"],
+            matched_pairs=aggregates["matched_pairs"],
+            total_opportunities=aggregates["total_opportunities"],
+            safe_opportunities=aggregates["safe_opportunities"],
+            caution_opportunities=aggregates["caution_opportunities"],
+            danger_opportunities=aggregates["danger_opportunities"],
+            avg_spread_pct=round(aggregates["avg_spread_pct"], 4),
+            best_spread_pct=round(aggregates["best_spread_pct"], 4),
+            avg_confidence=round(aggregates["avg_confidence"], 4),
+            avg_quality_score=round(aggregates["avg_quality_score"], 2),
+        )
     market_payload = _load_json(DATA_DIR / "markets.json", {"markets": []})
     verified_payload = _load_json(DATA_DIR / "verified_matches.json", {"all_verifications": []})
     opportunities_payload = _load_json(DATA_DIR / "opportunities.json", {"all_opportunities": [], "time_value_spreads": []})
@@ -300,31 +358,41 @@ async def refresh(background_tasks: BackgroundTasks) -> dict[str, str]:
     return {"status": "started", "message": "Live pipeline refresh started in background."}
 
 
+def _pulse() -> tuple[int, int, float]:
+    """Return (market count, safe opportunity count, mean positive spread) for the stream."""
+    state = _state()
+    if state is not None:
+        pulse = state.pulse()
+        return pulse["markets_scanned"], pulse["opportunities"], pulse["avg_spread"]
+
+    payload = _load_json(DATA_DIR / "markets.json", {"markets": []})
+    market_count = len(payload.get("markets", []))
+
+    opp_payload = _load_json(DATA_DIR / "opportunities.json", {"all_opportunities": []})
+    opps = opp_payload.get("all_opportunities", [])
+
+    spreads = []
+    for row in opps:
+        s = float(row.get("spread_pct", 0))
+        if s > 0:
+            spreads.append(s)
+    return market_count, len(opps), sum(spreads) / len(spreads) if spreads else 0
+
+
 async def _sse_generator():
     """Server-Sent Events generator that pushes fresh stats every 5s."""
     while True:
         try:
-            payload = _load_json(DATA_DIR / "markets.json", {"markets": []})
-            market_count = len(payload.get("markets", []))
-
-            opp_payload = _load_json(DATA_DIR / "opportunities.json", {"all_opportunities": []})
-            opps = opp_payload.get("all_opportunities", [])
-
-            spreads = []
-            for row in opps:
-                s = float(row.get("spread_pct", 0))
-                if s > 0:
-                    spreads.append(s)
-
+            market_count, opportunity_count, avg_spread = _pulse()
             stats_data = {
                 "markets_scanned": market_count,
-                "opportunities": len(opps),
-                "avg_spread": round(sum(spreads) / len(spreads), 4) if spreads else 0,
+                "opportunities": opportunity_count,
+                "avg_spread": round(avg_spread, 4),
                 "timestamp": time.time(),
             }
-            yield f"data: {json.dumps(stats_data)}\n\n"
+            yield f"data: {jsonio.dumps(stats_data)}\n\n"
         except Exception:
-            yield f"data: {json.dumps({'error': 'read_failed'})}\n\n"
+            yield f"data: {jsonio.dumps({'error': 'read_failed'})}\n\n"
 
         await asyncio.sleep(5)
 
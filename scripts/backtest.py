@@ -0,0 +1,173 @@
+"""CLI entrypoint for replaying stored market snapshots through the pipeline."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src import jsonio
+from src.backtest import STEPS, BacktestConfig, Backtester, VerdictCache, append_snapshot, iter_snapshots
+from src.config import load_settings
+from src.data_collector import build_sample_markets, with_prices
+from src.embeddings import LOCAL_EMBEDDING_MODEL, EmbeddingCache
+from src.fee_schedules import load_fee_table
+from src.local_verifier import load_local_verifier
+from src.snapshot_store import ParquetSnapshotStore, parquet_available
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Backtest the pipeline over stored market snapshots.")
+    parser.add_argument(
+        "--snapshots",
+        type=str,
+        default="data/snapshot_store",
+        help="Parquet snapshot store, snapshot JSONL file, or directory of *.jsonl / *.jsonl.gz files.",
+    )
+    parser.add_argument("--output", type=str, default="data/backtest_summary.json", help="Summary JSON path.")
+    parser.add_argument(
+        "--steps-output",
+        type=str,
+        default="data/backtest_steps.jsonl",
+        help="Per-snapshot step records (JSONL), streamed during the replay.",
+    )
+    parser.add_argument(
+        "--embedding-cache",
+        type=str,
+        default="data/embedding_cache.jsonl",
+        help="Embedding cache the agent writes; replays read it and append local embeddings they compute.",
+    )
+    parser.add_argument(
+        "--embedding-model",
+        type=str,
+        default=LOCAL_EMBEDDING_MODEL,
+        help="Model whose cached vectors to replay (e.g. the agent's EMBEDDING_MODEL); snapshots with "
+        "uncached markets fall back to local embeddings.",
+    )
+    parser.add_argument(
+        "--no-clustering",
+        action="store_true",
+        help="Verify every candidate pair independently instead of per event cluster.",
+    )
+    parser.add_argument("--limit", type=int, default=None, help="Replay at most this many snapshots.")
+    parser.add_argument(
+        "--platform",
+        action="append",
+        default=None,
+        help="Only replay markets from this platform (repeatable); pushed down into a Parquet store.",
+    )
+    parser.add_argument("--start", type=str, default=None, help="Replay snapshots from this ISO date or timestamp.")
+    parser.add_argument("--end", type=str, default=None, help="Replay snapshots up to this ISO date or timestamp.")
+    parser.add_argument("--embedding-threshold", type=float, default=0.70)
+    parser.add_argument("--match-threshold", type=float, default=0.78)
+    parser.add_argument("--fee-rate", type=float, default=0.01)
+    parser.add_argument("--slippage-rate", type=float, default=0.005)
+    parser.add_argument("--gas-cost-usd", type=float, default=0.004)
+    parser.add_argument("--fee-schedules", action="store_true", help="Apply per-platform fee schedules.")
+    parser.add_argument(
+        "--generate-sample",
+        type=int,
+        default=0,
+        metavar="MINUTES",
+        help="Write this many 1-minute random-walk snapshots of the sample markets to --snapshots first "
+        "(Parquet unless --snapshots names a .jsonl file).",
+    )
+    return parser.parse_args()
+
+
+def generate_sample_snapshots(path: Path, minutes: int, seed: int = 7) -> None:
+    """Write 1-minute snapshots of the sample markets with random-walk prices."""
+    rng = random.Random(seed)
+    markets = build_sample_markets()
+    store = None
+    if path.suffix in {".jsonl", ".gz"} or not parquet_available():
+        target = path if path.suffix in {".jsonl", ".gz"} else path / "sample.jsonl"
+        if target.exists():
+            target.unlink()
+        target.parent.mkdir(parents=True, exist_ok=True)
+    else:
+        store = ParquetSnapshotStore(path)
+        if path.exists():
+            shutil.rmtree(path)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for minute in range(minutes):
+        walked = []
+        for market in markets:
+            yes = float(market["outcomes"][0]["price"])
+            yes = min(0.98, max(0.02, yes + rng.gauss(0.0, 0.01)))
+            no = min(0.98, max(0.02, 1.0 - yes + rng.gauss(0.0, 0.02)))
+            walked.append(with_prices(market, yes, no))
+        markets = walked
+        timestamp = (start + timedelta(minutes=minute)).isoformat()
+        if store is not None:
+            store.append(markets, timestamp)
+        else:
+            append_snapshot(markets, target, timestamp)
+
+
+def main() -> None:
+    """Replay snapshots and print per-step latency and opportunity outcomes."""
+    args = parse_args()
+    snapshots_path = Path(args.snapshots)
+    if args.generate_sample:
+        generate_sample_snapshots(snapshots_path, args.generate_sample)
+
+    settings = load_settings()
+    data_dir = settings.data_dir
+    embeddings = EmbeddingCache()
+    cache_path = Path(args.embedding_cache)
+    seeded_vectors = embeddings.load(cache_path)
+    verdicts = VerdictCache(
+        learned=load_local_verifier(data_dir / "local_verifier.json"),
+        min_confidence=settings.learned_verifier_confidence,
+    )
+    seeded_verdicts = verdicts.seed([data_dir / "verdict_history.jsonl", data_dir / "verified_matches.json"])
+    fee_table = (
+        load_fee_table(data_dir / "fee_schedules.json", fee_rate=args.fee_rate, gas_cost_usd=args.gas_cost_usd)
+        if args.fee_schedules
+        else None
+    )
+    config = BacktestConfig(
+        embedding_threshold=args.embedding_threshold,
+        match_threshold=args.match_threshold,
+        fee_rate=args.fee_rate,
+        slippage_rate=args.slippage_rate,
+        gas_cost_usd=args.gas_cost_usd,
+        embedding_model=args.embedding_model,
+        use_event_clustering=not args.no_clustering,
+    )
+    backtester = Backtester(
+        config=config, embeddings=embeddings, verdicts=verdicts, fee_table=fee_table, settings=settings
+    )
+    snapshots = iter_snapshots(snapshots_path, platforms=args.platform, start=args.start, end=args.end)
+    summary = backtester.run(snapshots, steps_path=Path(args.steps_output), limit=args.limit)
+    embeddings.save(cache_path)
+
+    output_path = Path(args.output)
+    jsonio.write_json(summary, output_path, pretty=True)
+
+    print(f"Seeded: {seeded_vectors} embeddings, {seeded_verdicts} LLM verdicts")
+    print(f"Replayed {summary['snapshots']} snapshots in {summary['wall_seconds']:.2f}s")
+    print(f"{'step':>8} {'mean_ms':>9} {'p50_ms':>9} {'p95_ms':>9} {'max_ms':>9}")
+    for step in STEPS:
+        stats = summary["latency_ms"][step]
+        print(f"{step:>8} {stats['mean']:>9.3f} {stats['p50']:>9.3f} {stats['p95']:>9.3f} {stats['max']:>9.3f}")
+    print(f"Embedding cache: {summary['embedding_cache']} | verdict cache: {summary['verdict_cache']}")
+    print(f"Distinct opportunities: {summary['distinct_opportunities']}")
+    for outcome in summary["opportunity_outcomes"][:5]:
+        print(
+            f"  {outcome['key']}: {outcome['snapshots']} snapshots over {outcome['episodes']} episodes, "
+            f"max net_profit={outcome['max_net_profit']:.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
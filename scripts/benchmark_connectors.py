@@ -0,0 +1,237 @@
+"""Benchmark live collection against a local stub HTTP server with simulated latency.
+
+Serves minimal Polymarket Gamma and Kalshi events/markets responses, points
+the connectors at it, and compares the sequential path (one source after the
+other, one Kalshi series at a time) with concurrent collection. With
+--catalog-size it also streams the paginated catalogs, unfiltered and with a
+connector-side filter plus per-source limit, to show the filtered early stop.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src import jsonio
+from src.connectors import kalshi, polymarket
+from src.connectors.filters import MarketFilter
+from src.connectors.http import get_client
+from src.data_collector import maybe_collect_live_markets, stream_live_markets
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark connector collection against a stub server.")
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="Simulated per-request latency.")
+    parser.add_argument("--events", type=int, default=24, help="Kalshi events served (one series each).")
+    parser.add_argument("--series-concurrency", type=int, default=8, help="Parallel Kalshi series requests.")
+    parser.add_argument(
+        "--catalog-size",
+        type=int,
+        default=0,
+        help="Also stream a paginated catalog of this many markets per source (0 skips).",
+    )
+    parser.add_argument(
+        "--error-every",
+        type=int,
+        default=0,
+        help="Answer every Nth request with 503 to exercise retries (0 disables).",
+    )
+    return parser.parse_args()
+
+
+def _gamma_markets(count: int) -> list[dict]:
+    return [
+        {
+            "id": str(1000 + i),
+            "question": f"Stub Polymarket question {i}?",
+            "description": "Stub market served locally.",
+            "outcomes": '["Yes", "No"]',
+            "outcomePrices": f'["{0.3 + i % 5 * 0.1:.2f}", "{0.7 - i % 5 * 0.1:.2f}"]',
+            "volume": 20000,
+            "liquidity": 12000,
+            "endDate": "2026-12-31T00:00:00Z",
+            "category": "crypto",
+        }
+        for i in range(count)
+    ]
+
+
+def _kalshi_series_markets(series: str) -> list[dict]:
+    return [
+        {
+            "ticker": f"{series}-M{j}",
+            "title": f"Stub Kalshi {series} market {j}",
+            "last_price": 40 + j,
+            "volume": 9000,
+            "open_interest": 800,
+            "close_time": "2026-12-31T00:00:00Z",
+        }
+        for j in range(2)
+    ]
+
+
+def _gamma_page(offset: int, limit: int, catalog_size: int) -> list[dict]:
+    page = _gamma_markets(min(limit, max(0, catalog_size - offset)))
+    for i, item in enumerate(page):
+        item["id"] = str(100000 + offset + i)
+        item["question"] = f"Stub Polymarket catalog question {offset + i}?"
+        item["liquidity"] = 2000 * (1 + (offset + i) % 10)
+    return page
+
+
+def _kalshi_events_page(cursor: str, limit: int, catalog_size: int) -> dict:
+    # Two markets per event; the cursor is the next event offset.
+    start = int(cursor or 0)
+    total_events = catalog_size // 2
+    stop = min(total_events, start + limit)
+    events = [
+        {
+            "title": f"Stub catalog event {i}",
+            "category": "Economics" if i % 2 else "Sports",
+            "series_ticker": f"KXC{i}",
+            "markets": _kalshi_series_markets(f"KXC{i}"),
+        }
+        for i in range(start, stop)
+    ]
+    return {"events": events, "cursor": str(stop) if stop < total_events else ""}
+
+
+def make_handler(
+    latency_s: float, events: int, error_every: int = 0, catalog_size: int = 0
+) -> type[BaseHTTPRequestHandler]:
+    """Build a request handler serving stub Gamma and Kalshi endpoints."""
+    counter = itertools.count(1)
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            time.sleep(latency_s)
+            if error_every and next(counter) % error_every == 0:
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            limit = int(query.get("limit", ["40"])[0])
+            if url.path == "/gamma/markets" and "offset" in query:
+                body: object = _gamma_page(int(query["offset"][0]), limit, catalog_size)
+            elif url.path == "/gamma/markets":
+                body = _gamma_markets(limit)
+            elif url.path == "/kalshi/events" and catalog_size:
+                body = _kalshi_events_page(query.get("cursor", [""])[0], limit, catalog_size)
+            elif url.path == "/kalshi/events":
+                body = {
+                    "events": [
+                        {"title": f"Stub event {i}", "category": "Economics", "series_ticker": f"KXS{i}", "markets": []}
+                        for i in range(events)
+                    ]
+                }
+            elif url.path == "/kalshi/markets":
+                body = {"markets": _kalshi_series_markets(query.get("series_ticker", [""])[0])}
+            else:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            payload = jsonio.dumpb(body)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args: object) -> None:
+            return None
+
+    return StubHandler
+
+
+def main() -> None:
+    """Start the stub server, run both collection paths and report timings."""
+    args = parse_args()
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), make_handler(args.latency_ms / 1000.0, args.events, args.error_every, args.catalog_size)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    polymarket.GAMMA_API = f"{base}/gamma"
+    polymarket.CLOB_API = f"{base}/clob"
+    kalshi.KALSHI_API = f"{base}/kalshi"
+
+    try:
+        started = time.perf_counter()
+        sequential = polymarket.fetch_polymarket_markets(limit=40) + kalshi.fetch_kalshi_markets(
+            limit=40, series_concurrency=1
+        )
+        sequential_s = time.perf_counter() - started
+
+        get_client().reset_metrics()
+        started = time.perf_counter()
+        concurrent = maybe_collect_live_markets(series_concurrency=args.series_concurrency)
+        concurrent_s = time.perf_counter() - started
+        metrics = get_client().metrics()
+
+        if args.catalog_size:
+            started = time.perf_counter()
+            first_market_s = 0.0
+            streamed = 0
+            for _ in stream_live_markets():
+                if not streamed:
+                    first_market_s = time.perf_counter() - started
+                streamed += 1
+            catalog_s = time.perf_counter() - started
+
+            # Thin Polymarket items and Kalshi sports events are rejected
+            # before normalization; each source stops after a tenth of the catalog.
+            market_filter = MarketFilter.build(min_liquidity=2000, categories=["crypto", "macro"])
+            get_client().reset_metrics()
+            started = time.perf_counter()
+            filtered = sum(
+                1
+                for _ in stream_live_markets(
+                    market_filter=market_filter, limit_per_source=max(1, args.catalog_size // 10)
+                )
+            )
+            filtered_s = time.perf_counter() - started
+            filtered_requests = sum(stats["requests"] for stats in get_client().metrics().values())
+    finally:
+        server.shutdown()
+
+    same = [m["market_id"] for m in sequential] == [m["market_id"] for m in concurrent]
+    print(f"Stub latency: {args.latency_ms:.0f} ms/request, Kalshi series: {args.events}")
+    print(f"Sequential: {len(sequential)} markets in {sequential_s:.2f}s")
+    print(f"Concurrent: {len(concurrent)} markets in {concurrent_s:.2f}s ({sequential_s / concurrent_s:.1f}x)")
+    print(f"Identical market order: {same}")
+    if args.catalog_size:
+        print(
+            f"Full catalog: streamed {streamed} markets in {catalog_s:.2f}s "
+            f"(first market after {first_market_s * 1000:.0f} ms)"
+        )
+        print(
+            f"Filtered catalog: {filtered} qualifying markets in {filtered_s:.2f}s "
+            f"using {filtered_requests} requests"
+        )
+    for host, stats in metrics.items():
+        print(
+            f"{host}: {stats['requests']} requests, {stats['retries']} retries, {stats['errors']} errors, "
+            f"mean {stats['latency_mean_ms']:.1f} ms, throttled {stats['throttled_seconds']:.2f}s, "
+            f"statuses {stats['status_counts']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Benchmark JSON encode/decode throughput on pipeline-shaped payloads.
+
+Compares the previous stdlib path (`json.dumps(..., indent=2)` writes,
+`json.loads` of decoded text) with `src.jsonio` on both of its backends:
+the stdlib fallback and orjson when installed. Payloads are a raw Gamma
+markets page (decoded together with its stringified outcome fields, as the
+connector does), a markets.json artifact and an opportunities.json artifact.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src import jsonio
+from src.connectors.polymarket import normalize_market
+from src.data_collector import _market
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Measure JSON encode/decode throughput.")
+    parser.add_argument("--markets", type=int, default=2000, help="Markets per payload.")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed repetitions; the best is reported.")
+    return parser.parse_args()
+
+
+def gamma_page(count: int) -> list[dict[str, Any]]:
+    """Raw Gamma /markets items, with outcomes and prices as JSON strings."""
+    return [
+        {
+            "id": str(500000 + i),
+            "question": f"Will candidate {i} win the {2026 + i % 3} election in district {i % 435}?",
+            "description": "This market resolves to Yes if the named candidate is certified the winner. " * 4,
+            "outcomes": '["Yes", "No"]',
+            "outcomePrices": f'["{0.3 + i % 50 / 100:.3f}", "{0.7 - i % 50 / 100:.3f}"]',
+            "clobTokenIds": f'["{10**70 + i}", "{10**70 + i + 1}"]',
+            "volume": str(10000 + i * 13),
+            "volume24hr": 1200.5 + i,
+            "liquidity": 5000 + i % 97 * 100,
+            "endDate": "2026-11-03T00:00:00Z",
+            "category": ("Politics", "Crypto", "Sports")[i % 3],
+            "active": True,
+            "closed": False,
+            "tags": [{"id": str(i % 40), "label": f"tag-{i % 40}"}],
+        }
+        for i in range(count)
+    ]
+
+
+def markets_payload(count: int) -> dict[str, Any]:
+    """A markets.json artifact as save_markets writes it."""
+    platforms = ("Polymarket", "Kalshi", "Opinion", "predict.fun")
+    markets = []
+    for i in range(count):
+        market = _market(
+            platforms[i % 4],
+            f"m-{i}",
+            f"Will event {i} happen before the deadline?",
+            f"Resolves Yes if event {i} happens before the stated deadline.",
+            0.4 + (i % 20) / 100,
+            0.6 - (i % 20) / 100,
+            1000.0 + i,
+            1500.0 + i,
+            f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            ("politics", "crypto", "sports")[i % 3],
+        )
+        market["quality_score"] = 60 + i % 40
+        market["quality_flags"] = ["clear_resolution"] if i % 2 else []
+        markets.append(market)
+    return {"generated_at": "2026-01-01", "count": count, "markets": markets}
+
+
+def opportunities_payload(markets: list[dict[str, Any]]) -> dict[str, Any]:
+    """An opportunities.json artifact: one verified pair per two markets."""
+    opportunities = []
+    for i in range(0, len(markets) - 1, 2):
+        opportunities.append(
+            {
+                "market_a": markets[i],
+                "market_b": markets[i + 1],
+                "similarity_score": 0.91,
+                "verification": {
+                    "match_confidence": 0.88,
+                    "arbitrage_safe": True,
+                    "resolution_verdict": "SAFE",
+                    "reasoning": "Both markets resolve on the same event and date.",
+                },
+                "direction": "BUY_YES_A_BUY_NO_B",
+                "cost": 0.953,
+                "net_profit": 0.0312,
+                "roi_pct": 3.27,
+            }
+        )
+    return {"generated_at": "2026-01-01T00:00:00+00:00", "count": len(opportunities), "opportunities": opportunities}
+
+
+@contextmanager
+def stdlib_backend() -> Iterator[None]:
+    """Run src.jsonio on its stdlib fallback."""
+    saved = jsonio.orjson
+    jsonio.orjson = None
+    try:
+        yield
+    finally:
+        jsonio.orjson = saved
+
+
+def best_seconds(fn: Callable[[], Any], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def report(name: str, size: int, seconds: float) -> None:
+    print(f"  {name:<34} {seconds * 1000:>9.2f} ms {size / seconds / 1e6:>9.1f} MB/s")
+
+
+def main() -> None:
+    """Time encode and decode for every payload and backend."""
+    args = parse_args()
+    page = gamma_page(args.markets)
+    artifact = markets_payload(args.markets)
+    payloads = {
+        "gamma page": page,
+        "markets.json": artifact,
+        "opportunities.json": opportunities_payload(artifact["markets"]),
+    }
+    backends = [("jsonio[json]", stdlib_backend)]
+    if jsonio.orjson is not None:
+        backends.append(("jsonio[orjson]", nullcontext))
+    print(f"jsonio backend: {jsonio.backend()}")
+
+    for name, payload in payloads.items():
+        legacy_text = json.dumps(payload, indent=2)
+        size = len(jsonio.dumpb(payload))
+        print(f"{name}: {size / 1e6:.2f} MB compact, {len(legacy_text.encode('utf-8')) / 1e6:.2f} MB indented")
+        report(
+            "encode stdlib indent=2 (before)",
+            size,
+            best_seconds(lambda: json.dumps(payload, indent=2), args.rounds),
+        )
+        report(
+            "decode stdlib from text (before)",
+            size,
+            best_seconds(lambda: json.loads(legacy_text.encode("utf-8").decode("utf-8")), args.rounds),
+        )
+        for label, backend in backends:
+            with backend():
+                compact = jsonio.dumpb(payload)
+                assert jsonio.loads(compact) == payload
+                report(f"encode {label} compact", size, best_seconds(lambda: jsonio.dumpb(payload), args.rounds))
+                report(
+                    f"encode {label} pretty",
+                    size,
+                    best_seconds(lambda: jsonio.dumpb(payload, pretty=True), args.rounds),
+                )
+                report(f"decode {label}", size, best_seconds(lambda: jsonio.loads(compact), args.rounds))
+                if name == "gamma page":
+                    report(
+                        f"decode+normalize {label}",
+                        size,
+                        best_seconds(lambda: [normalize_market(item) for item in jsonio.loads(compact)], args.rounds),
+                    )
+
+
+if __name__ == "__main__":
+    main()
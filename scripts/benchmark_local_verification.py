@@ -0,0 +1,68 @@
+"""Benchmark local pair verification with and without the per-market feature index."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data_collector import build_sample_markets
+from src.market_features import MarketFeatureIndex
+from src.semantic_matcher import _local_precision_fallback
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark local fallback verification throughput.")
+    parser.add_argument("--pairs", type=int, default=100_000, help="Number of pairs to verify.")
+    parser.add_argument("--markets", type=int, default=2_000, help="Distinct synthetic markets.")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def build_markets(count: int, rng: random.Random) -> list[dict]:
+    """Clone sample markets with distinct ids and light wording noise."""
+    base = build_sample_markets()
+    out = []
+    for i in range(count):
+        market = dict(base[i % len(base)])
+        market["market_id"] = f"{market['market_id']}-{i}"
+        market["description"] = f"{market['description']} Ref {rng.randint(1, 500)}."
+        out.append(market)
+    return out
+
+
+def main() -> None:
+    """Run both paths over the same pairs and print throughput."""
+    args = parse_args()
+    rng = random.Random(args.seed)
+    markets = build_markets(args.markets, rng)
+    pairs = [
+        (rng.choice(markets), rng.choice(markets), rng.uniform(0.6, 0.95)) for _ in range(args.pairs)
+    ]
+
+    start = time.perf_counter()
+    for a, b, score in pairs:
+        _local_precision_fallback(a, b, score)
+    per_pair = time.perf_counter() - start
+
+    index = MarketFeatureIndex()
+    start = time.perf_counter()
+    for a, b, score in pairs:
+        _local_precision_fallback(a, b, score, index)
+    indexed = time.perf_counter() - start
+
+    print(f"Pairs: {args.pairs} over {args.markets} markets (vocab={len(index.vocab)})")
+    print(f"Per-pair tokenization: {per_pair:.3f}s ({args.pairs / per_pair:,.0f} pairs/s)")
+    print(f"Shared feature index:  {indexed:.3f}s ({args.pairs / indexed:,.0f} pairs/s)")
+    print(f"Speedup: {per_pair / indexed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
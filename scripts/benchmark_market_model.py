@@ -0,0 +1,93 @@
+"""Benchmark per-market memory and hot-path access for dict markets vs `Market`.
+
+Builds synthetic normalized markets, measures retained memory with
+tracemalloc for the dict form and the slotted form, and times the price,
+liquidity and resolution-date reads the detector and filters repeat per pair.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.arbitrage_detector import _extract_min_liquidity, _extract_yes_no_prices, _resolution_ordinal
+from src.data_collector import _market
+from src.market_model import Market
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Compare dict markets with the slotted Market model.")
+    parser.add_argument("--markets", type=int, default=20000, help="Synthetic markets to build.")
+    parser.add_argument("--rounds", type=int, default=5, help="Access passes over all markets.")
+    return parser.parse_args()
+
+
+def build_dicts(count: int) -> list[dict]:
+    """Build normalized market dicts with the shape collectors produce."""
+    platforms = ("Polymarket", "Kalshi", "Opinion", "predict.fun")
+    return [
+        _market(
+            platforms[i % 4],
+            f"m-{i}",
+            f"Will event {i} happen before the deadline?",
+            f"Resolves Yes if event {i} happens.",
+            0.4 + (i % 20) / 100,
+            0.6 - (i % 20) / 100,
+            1000.0 + i,
+            1500.0 + i,
+            f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            ("Politics", "Crypto", "Sports")[i % 3],
+        )
+        for i in range(count)
+    ]
+
+
+def retained_bytes(build) -> tuple[int, object]:
+    """Return bytes still allocated after build() and the built object."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename")), result
+
+
+def time_access(markets: list, rounds: int) -> float:
+    """Seconds to read prices, min liquidity and resolution ordinal for every market."""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for market in markets:
+            _extract_yes_no_prices(market)
+            _extract_min_liquidity(market)
+            _resolution_ordinal(market)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    """Report memory per market and access time for both representations."""
+    args = parse_args()
+    dict_bytes, dicts = retained_bytes(lambda: build_dicts(args.markets))
+    model_bytes, models = retained_bytes(lambda: [Market.from_dict(market) for market in build_dicts(args.markets)])
+    assert all(Market.from_dict(market).to_dict() == market for market in dicts[:1000])
+
+    dict_seconds = time_access(dicts, args.rounds)
+    model_seconds = time_access(models, args.rounds)
+    reads = args.markets * args.rounds
+    print(f"Markets: {args.markets}")
+    print(f"Memory per market: dict {dict_bytes / args.markets:.0f} B | Market {model_bytes / args.markets:.0f} B")
+    print(
+        f"Hot-path reads: dict {dict_seconds / reads * 1e9:.0f} ns | Market {model_seconds / reads * 1e9:.0f} ns "
+        f"({dict_seconds / model_seconds:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
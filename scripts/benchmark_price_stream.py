@@ -0,0 +1,109 @@
+"""Benchmark WebSocket price ingestion against the local mock feed server.
+
+Replays recorded ticks (or a synthetic Polymarket session) through
+`MockFeedServer`, streams them into a `PriceStream` whose updates re-score an
+`OpportunityBook`, and reports throughput and tick-to-book latency.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data_collector import _market
+from src.opportunity_book import OpportunityBook
+from src.price_stream import MockFeedServer, PolymarketFeed, PriceStream, load_recorded_ticks
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark streaming price ingestion against a mock feed.")
+    parser.add_argument("--ticks", type=str, default="", help="Recorded ticks JSONL; synthetic ticks when omitted.")
+    parser.add_argument("--markets", type=int, default=50, help="Synthetic Polymarket markets.")
+    parser.add_argument("--count", type=int, default=5000, help="Synthetic ticks to replay.")
+    parser.add_argument("--interval-ms", type=float, default=0.5, help="Synthetic spacing between ticks.")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier (0 = no pacing).")
+    return parser.parse_args()
+
+
+def synthetic_session(markets: int, count: int, interval_ms: float, seed: int = 11) -> tuple[list[dict], list[dict]]:
+    """Build matched Polymarket/sample market pairs and a random-walk price_change session."""
+    rng = random.Random(seed)
+    matches = []
+    for i in range(markets):
+        poly = {
+            **_market("Polymarket", f"poly-{i}", f"Stub question {i}?", "", 0.5, 0.5, 20000, 20000, "2026-12-31", "x"),
+            "token_ids": [f"{i}-yes", f"{i}-no"],
+        }
+        other = _market("Opinion", f"op-{i}", f"Stub question {i}?", "", 0.5, 0.5, 20000, 20000, "2026-12-31", "x")
+        verification = {"is_match": True, "arbitrage_safe": True, "resolution_verdict": "SAFE", "confidence": 0.9}
+        matches.append({"market_a": poly, "market_b": other, "verification": verification, "similarity_score": 0.9})
+
+    mids = {f"{i}-{side}": 0.5 for i in range(markets) for side in ("yes", "no")}
+    ticks = []
+    for n in range(count):
+        asset_id = rng.choice(list(mids))
+        mids[asset_id] = round(min(0.95, max(0.05, mids[asset_id] + rng.choice((-0.01, 0.01)))), 2)
+        change = {
+            "asset_id": asset_id,
+            "price": mids[asset_id],
+            "best_bid": round(mids[asset_id] - 0.01, 2),
+            "best_ask": round(mids[asset_id] + 0.01, 2),
+        }
+        message = {"event_type": "price_change", "price_changes": [change]}
+        ticks.append({"t": n * interval_ms / 1000.0, "venue": "Polymarket", "message": message})
+    return matches, ticks
+
+
+def main() -> None:
+    """Replay ticks into a PriceStream feeding an OpportunityBook and report latency."""
+    args = parse_args()
+    matches, ticks = synthetic_session(args.markets, args.count, args.interval_ms)
+    if args.ticks:
+        ticks = load_recorded_ticks(Path(args.ticks))
+
+    book = OpportunityBook()
+    book.load_matches(matches)
+    received: list[float] = []
+    events = 0
+
+    def on_update(market_id: str, yes_price: float, no_price: float) -> None:
+        nonlocal events
+        events += len(book.apply_price_update(market_id, yes_price, no_price))
+        received.append(time.perf_counter())
+
+    server = MockFeedServer(ticks, speed=args.speed).start()
+    markets = [row["market_a"] for row in matches]
+    stream = PriceStream([PolymarketFeed(markets, url=server.url("Polymarket"))], on_update=on_update)
+    started = time.perf_counter()
+    stream.start()
+    expected = sum(1 for tick in ticks if str(tick.get("venue", "")).lower() == "polymarket")
+    deadline = started + 60.0
+    while stream.stats["messages"] < expected and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    stream.stop()
+    server.stop()
+
+    # Every synthetic tick moves one token by a cent, so ticks and updates pair up in order.
+    latencies = [(r - s) * 1000.0 for s, r in zip(server.sent_at, received)]
+    print(f"Replayed {stream.stats['messages']} messages in {elapsed:.2f}s ({stream.stats['messages'] / elapsed:.0f}/s)")
+    print(f"Price updates: {stream.stats['updates']} | book events: {events} | tracked: {len(stream.table)} markets")
+    if latencies and not args.ticks:
+        ordered = sorted(latencies)
+        print(
+            f"Tick-to-book latency: mean {statistics.fmean(latencies):.3f} ms, "
+            f"p50 {ordered[len(ordered) // 2]:.3f} ms, p99 {ordered[int(len(ordered) * 0.99)]:.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
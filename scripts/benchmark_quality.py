@@ -0,0 +1,78 @@
+"""Benchmark batch quality scoring against per-market scoring.
+
+Scores synthetic markets three ways: one market at a time with no cache (as
+the previous per-market scorer did), as one cold batch, and again as a warm
+batch after every price has moved, which the content-hash cache absorbs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data_collector import _market, with_prices
+from src.quality_scorer import QualityScorer, enrich_with_quality_scores
+
+_VOCABULARY = (
+    "will the official election rate bitcoin price above below before after resolves yes if source "
+    "close date announce federal reserve cut hike win team championship market by end of"
+).split()
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Compare batch and per-market quality scoring.")
+    parser.add_argument("--markets", type=int, default=20000, help="Synthetic markets to score.")
+    return parser.parse_args()
+
+
+def build_markets(count: int, seed: int = 3) -> list[dict]:
+    """Markets with realistic title/description lengths; one in 40 uses an ambiguous term."""
+    rng = random.Random(seed)
+    markets = []
+    for i in range(count):
+        title = " ".join(rng.choice(_VOCABULARY) for _ in range(9)) + f" {i}?"
+        description = " ".join(rng.choice(_VOCABULARY) for _ in range(40))
+        if i % 40 == 0:
+            description += " and could slip"
+        markets.append(_market("Polymarket", f"m-{i}", title, description, 0.4, 0.6, 900.0, 1100.0, "2026-11-03", "x"))
+    return markets
+
+
+def main() -> None:
+    """Report scoring time for each path."""
+    args = parse_args()
+    markets = build_markets(args.markets)
+
+    uncached = QualityScorer(max_entries=0)
+    started = time.perf_counter()
+    single = [uncached.score(market) for market in markets]
+    single_s = time.perf_counter() - started
+
+    scorer = QualityScorer()
+    started = time.perf_counter()
+    cold = enrich_with_quality_scores(markets, scorer=scorer)
+    cold_s = time.perf_counter() - started
+    assert [(m["quality_score"], m["quality_grade"], m["quality_reasoning"]) for m in cold] == single
+
+    repriced = [with_prices(market, 0.45, 0.55) for market in markets]
+    started = time.perf_counter()
+    enrich_with_quality_scores(repriced, scorer=scorer, in_place=True)
+    warm_s = time.perf_counter() - started
+
+    print(f"Markets: {len(markets)}")
+    print(f"Per market, uncached: {single_s * 1000:8.1f} ms")
+    print(f"Batch, cold cache:    {cold_s * 1000:8.1f} ms ({single_s / cold_s:.1f}x)")
+    print(f"Batch, repriced:      {warm_s * 1000:8.1f} ms ({single_s / warm_s:.1f}x)")
+    print(f"Cache: {scorer.stats()}")
+
+
+if __name__ == "__main__":
+    main()
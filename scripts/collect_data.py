@@ -5,8 +5,10 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
+from src import jsonio
 from src.config import load_settings
-from src.data_collector import collect_markets, save_markets
+from src.connectors.filters import MarketFilter
+from src.data_collector import collect_markets, market_filter_from_settings, save_markets, stream_live_markets
 
 
 def parse_args() -> argparse.Namespace:
@@ -29,12 +31,56 @@ def parse_args() -> argparse.Namespace:
         default="data/markets.json",
         help="Output JSON path.",
     )
+    parser.add_argument(
+        "--full-catalog",
+        action="store_true",
+        help=(
+            "Stream every open Polymarket and Kalshi market to --catalog-output (JSONL). "
+            "Export only: the agent does not embed or pair from this stream."
+        ),
+    )
+    parser.add_argument("--catalog-output", type=str, default="data/catalog.jsonl", help="Catalog JSONL path.")
+    parser.add_argument("--max-pages", type=int, default=None, help="Page cap per source for --full-catalog.")
+    parser.add_argument(
+        "--filtered",
+        action="store_true",
+        help="Apply the liquidity/category/horizon settings to --full-catalog inside the connectors.",
+    )
+    parser.add_argument(
+        "--limit-per-source",
+        type=int,
+        default=None,
+        help="Stop each --full-catalog source after this many (qualifying) markets.",
+    )
     return parser.parse_args()
 
 
+def write_catalog(
+    output_path: Path,
+    max_pages: int | None,
+    market_filter: MarketFilter | None = None,
+    limit_per_source: int | None = None,
+) -> int:
+    """Stream the live catalogs to JSONL, one market per line as pages arrive."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with output_path.open("w", encoding="utf-8") as handle:
+        for market in stream_live_markets(
+            max_pages_per_source=max_pages, market_filter=market_filter, limit_per_source=limit_per_source
+        ):
+            handle.write(jsonio.dumps(market) + "\n")
+            count += 1
+    return count
+
+
 def main() -> None:
     """Run market collection and write normalized JSON output."""
     args = parse_args()
+    if args.full_catalog:
+        market_filter = market_filter_from_settings(load_settings()) if args.filtered else None
+        count = write_catalog(Path(args.catalog_output), args.max_pages, market_filter, args.limit_per_source)
+        print(f"Streamed {count} markets to {args.catalog_output}")
+        return
     settings = load_settings()
     markets = collect_markets(
         settings=settings, use_live=args.use_live, target_count=args.target_count
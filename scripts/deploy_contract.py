@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 from typing import Any
@@ -12,6 +11,7 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from src import jsonio
 from src.config import load_settings
 
 
@@ -78,8 +78,7 @@ def main() -> None:
     bytecode = contract_data["evm"]["bytecode"]["object"]
     artifact = {"abi": abi, "bytecode": bytecode, "solc_version": args.solc_version}
     artifact_path = Path(args.artifact_output)
-    artifact_path.parent.mkdir(parents=True, exist_ok=True)
-    artifact_path.write_text(json.dumps(artifact, indent=2), encoding="utf-8")
+    jsonio.write_json(artifact, artifact_path, pretty=True)
 
     account = w3.eth.account.from_key(settings.private_key)
     contract = w3.eth.contract(abi=abi, bytecode=bytecode)
@@ -3,20 +3,39 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
+import time
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from src import jsonio
 from src.arbitrage_detector import (
+    detect_cluster_opportunities,
     detect_opportunities,
+    friction_grid,
     save_opportunities,
     select_top_opportunity,
     split_time_value_spreads,
+    sweep_frictions,
 )
+from src.config import load_settings
+from src.fee_schedules import load_fee_table
+from src.state_store import StateStore
+
+
+def _parse_values(spec: str) -> list[float]:
+    """Parse "a,b,c" or "start:stop:count" (inclusive linspace) into floats."""
+    if ":" in spec:
+        start, stop, count = spec.split(":")
+        n = int(count)
+        if n <= 1:
+            return [float(start)]
+        step = (float(stop) - float(start)) / (n - 1)
+        return [float(start) + step * i for i in range(n)]
+    return [float(v) for v in spec.split(",") if v.strip()]
 
 
 def parse_args() -> argparse.Namespace:
@@ -25,32 +44,115 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--input",
         type=str,
-        default="data/verified_matches.json",
-        help="Input verified matches JSON path.",
+        default=None,
+        help="Verified matches JSON path; defaults to the latest verified cycle in the state store.",
     )
     parser.add_argument(
         "--output",
         type=str,
         default="data/opportunities.json",
-        help="Output opportunities JSON path.",
+        help="Output opportunities JSON path (opportunities are also written to the state store).",
     )
     parser.add_argument("--fee-rate", type=float, default=0.01, help="Fee rate as decimal.")
     parser.add_argument("--slippage-rate", type=float, default=0.005, help="Slippage rate as decimal.")
     parser.add_argument("--gas-cost-usd", type=float, default=0.004, help="Estimated gas cost in USD.")
+    parser.add_argument(
+        "--fee-schedules",
+        type=str,
+        nargs="?",
+        const="data/fee_schedules.json",
+        default=None,
+        help="Apply per-platform fee schedules, optionally overridden by this JSON file.",
+    )
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="Evaluate a grid of friction parameters instead of a single run.",
+    )
+    parser.add_argument("--fee-grid", type=str, default="0:0.03:16", help='Fee rates: "a,b,c" or "start:stop:count".')
+    parser.add_argument("--slippage-grid", type=str, default="0:0.02:11", help="Slippage rates grid.")
+    parser.add_argument("--gas-grid", type=str, default="0:0.05:11", help="Gas cost (USD) grid.")
+    parser.add_argument(
+        "--sweep-output",
+        type=str,
+        default="data/friction_sweep.json",
+        help="Output JSON path for the full sweep grid.",
+    )
+    parser.add_argument("--sweep-top", type=int, default=10, help="Grid points to print, by total net profit.")
     return parser.parse_args()
 
 
+def run_sweep(args: argparse.Namespace, accepted: list[dict]) -> None:
+    """Evaluate the friction grid once over the loaded matches and print a compact summary.
+
+    The full grid goes to --sweep-output; the console gets the grid size,
+    timing, the highest value of each friction that still leaves an
+    opportunity, and the top points by total net profit.
+    """
+    fees, slippages, gases = (
+        _parse_values(args.fee_grid), _parse_values(args.slippage_grid), _parse_values(args.gas_grid)
+    )
+    grid = friction_grid(fees, slippages, gases)
+    started = time.perf_counter()
+    rows = sweep_frictions(accepted, grid)
+    elapsed = time.perf_counter() - started
+    jsonio.write_json(
+        {"input_matches": len(accepted), "grid_points": len(rows), "results": rows},
+        Path(args.sweep_output),
+    )
+
+    profitable = [row for row in rows if row["opportunity_count"] > 0]
+    print(f"Accepted matches: {len(accepted)}")
+    print(
+        f"Grid: {len(fees)} fee x {len(slippages)} slippage x {len(gases)} gas = {len(rows)} points "
+        f"evaluated in {elapsed * 1000:.1f} ms; {len(profitable)} leave an opportunity."
+    )
+    if profitable:
+        print(
+            "Highest friction still profitable: "
+            f"fee {max(row['fee_rate'] for row in profitable):.4f}, "
+            f"slippage {max(row['slippage_rate'] for row in profitable):.4f}, "
+            f"gas ${max(row['gas_cost_usd'] for row in profitable):.4f}"
+        )
+    top = sorted(rows, key=lambda row: (row["total_net_profit"], row["best_score"]), reverse=True)[: args.sweep_top]
+    print(f"Top {len(top)} points by total net profit (full grid in {args.sweep_output}):")
+    print(f"{'fee':>8} {'slippage':>9} {'gas_usd':>8} {'count':>6} {'total_net':>11} {'best_score':>11}")
+    for row in top:
+        print(
+            f"{row['fee_rate']:>8.4f} {row['slippage_rate']:>9.4f} {row['gas_cost_usd']:>8.4f} "
+            f"{row['opportunity_count']:>6d} {row['total_net_profit']:>11.4f} {row['best_score']:>11.4f}"
+        )
+
+
 def main() -> None:
     """Run arbitrage detection and save top-1 opportunity."""
     args = parse_args()
-    payload = json.loads(Path(args.input).read_text(encoding="utf-8"))
-    accepted = payload.get("accepted_matches", [])
+    state = StateStore(load_settings().data_dir / "arbsense.db")
+    if args.input:
+        accepted = jsonio.read_json(Path(args.input)).get("accepted_matches", [])
+    else:
+        accepted = state.verdicts(accepted_only=True)
+    if args.sweep:
+        run_sweep(args, accepted)
+        return
+
+    fee_table = None
+    if args.fee_schedules:
+        fee_table = load_fee_table(Path(args.fee_schedules), fee_rate=args.fee_rate, gas_cost_usd=args.gas_cost_usd)
 
     all_opps = detect_opportunities(
         accepted_matches=accepted,
         fee_rate=args.fee_rate,
         slippage_rate=args.slippage_rate,
         gas_cost_usd=args.gas_cost_usd,
+        fee_table=fee_table,
+    )
+    cluster_opps = detect_cluster_opportunities(
+        accepted_matches=accepted,
+        fee_rate=args.fee_rate,
+        slippage_rate=args.slippage_rate,
+        gas_cost_usd=args.gas_cost_usd,
+        fee_table=fee_table,
     )
     safe_opps, time_value_spreads = split_time_value_spreads(all_opps)
     top_opps = select_top_opportunity(safe_opps)
@@ -64,13 +166,21 @@ def main() -> None:
         "top_opportunity": top_opps[0] if top_opps else None,
         "all_opportunities": safe_opps,
         "time_value_spreads": time_value_spreads,
+        "cluster_opportunity_count": len(cluster_opps),
+        "cluster_opportunities": cluster_opps,
+        "fee_schedules": fee_table.to_dict() if fee_table is not None else None,
     }
     save_opportunities(output_payload, Path(args.output))
+    state.start_cycle()
+    state.write_opportunities(
+        {"safe": safe_opps, "time_value": time_value_spreads, "cluster": cluster_opps}, top_opps
+    )
 
     print(f"Accepted matches: {len(accepted)}")
     print(f"Detected opportunities: {len(all_opps)}")
     print(f"Safe opportunities: {len(safe_opps)}")
     print(f"Time-value spreads: {len(time_value_spreads)}")
+    print(f"Event-level (N-way) opportunities: {len(cluster_opps)}")
     print(f"Selected for reporting (Top-1): {len(top_opps)}")
     if top_opps:
         opp = top_opps[0]
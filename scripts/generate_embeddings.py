@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
@@ -11,8 +10,9 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from src import jsonio
 from src.config import load_settings
-from src.embeddings import embed_all_markets, find_candidate_pairs, save_json
+from src.embeddings import LOCAL_EMBEDDING_MODEL, embed_all_markets, find_candidate_pairs, save_json
 
 
 def parse_args() -> argparse.Namespace:
@@ -41,7 +41,7 @@ def main() -> None:
     settings = load_settings()
 
     input_path = Path(args.input)
-    payload = json.loads(input_path.read_text(encoding="utf-8"))
+    payload = jsonio.read_json(input_path)
     markets = payload.get("markets", [])
 
     embedded_records, provider = embed_all_markets(markets=markets, settings=settings)
@@ -49,7 +49,7 @@ def main() -> None:
 
     embeddings_payload = {
         "provider": provider,
-        "model": settings.embedding_model if provider == "openai" else "local_deterministic_hash",
+        "model": settings.embedding_model if provider == "openai" else LOCAL_EMBEDDING_MODEL,
         "count": len(embedded_records),
         "records": embedded_records,
     }
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
@@ -11,8 +10,10 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from src import jsonio
 from src.blockchain import ArbSenseChainClient, load_contract_artifact
 from src.config import load_settings
+from src.state_store import StateStore
 
 
 def parse_args() -> argparse.Namespace:
@@ -22,8 +23,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--opportunities",
         type=str,
-        default="data/opportunities.json",
-        help="Path to opportunities file.",
+        default=None,
+        help="Opportunities JSON path; defaults to the latest published cycle in the state store.",
     )
     parser.add_argument(
         "--artifact",
@@ -37,15 +38,17 @@ def parse_args() -> argparse.Namespace:
 def main() -> None:
     """Load top opportunity and call reportOpportunity on-chain."""
     args = parse_args()
-    payload = json.loads(Path(args.opportunities).read_text(encoding="utf-8"))
-    top = payload.get("top_opportunity")
+    settings = load_settings()
+    if args.opportunities:
+        top = jsonio.read_json(Path(args.opportunities)).get("top_opportunity")
+    else:
+        top = StateStore(settings.data_dir / "arbsense.db", readonly=True).top_opportunity()
     if not top:
         print("No top opportunity found, skipping on-chain report.")
         return
 
     artifact = load_contract_artifact(Path(args.artifact))
     abi = artifact["abi"]
-    settings = load_settings()
     client = ArbSenseChainClient(settings=settings, network=args.network, abi=abi)
 
     market_a = str(top["market_a"]["market_id"])
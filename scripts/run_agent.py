@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import argparse
 import sys
+import time
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -23,40 +24,140 @@ def parse_args() -> argparse.Namespace:
         default=300,
         help="Loop interval for continuous mode.",
     )
-    parser.add_argument("--use-live", action="store_true", help="Attempt live market collection.")
+    parser.add_argument(
+        "--reprice-interval-seconds",
+        type=int,
+        default=0,
+        help="In continuous mode, refresh prices for accepted matches this often between full cycles (0 disables).",
+    )
+    parser.add_argument(
+        "--use-live",
+        action="store_true",
+        help=(
+            "Attempt live market collection. Each cycle fetches up to --target-count markets per venue "
+            "before embedding starts; full catalogs are streamed only by collect_data.py --full-catalog."
+        ),
+    )
     parser.add_argument("--target-count", type=int, default=30, help="Target markets per cycle.")
     parser.add_argument("--embedding-threshold", type=float, default=0.70)
     parser.add_argument("--match-threshold", type=float, default=0.78)
+    parser.add_argument(
+        "--quality-gate",
+        choices=["off", "embed", "verify"],
+        default="off",
+        help="Hold back low-grade/spam markets: embed skips embedding and pairing them, "
+        "verify only skips verifying their pairs.",
+    )
+    parser.add_argument(
+        "--min-quality-grade",
+        choices=["A", "B", "C", "D"],
+        default="D",
+        help="Lowest quality grade that passes --quality-gate.",
+    )
+    parser.add_argument(
+        "--allow-spam", action="store_true", help="Let spam-flagged markets through --quality-gate on grade alone."
+    )
     parser.add_argument("--report-on-chain", action="store_true", help="Send top match on-chain.")
     parser.add_argument("--network", choices=["bsc", "opbnb"], default="bsc")
     parser.add_argument("--fee-rate", type=float, default=0.01)
     parser.add_argument("--slippage-rate", type=float, default=0.005)
     parser.add_argument("--gas-cost-usd", type=float, default=0.004)
+    parser.add_argument(
+        "--fee-schedules",
+        action="store_true",
+        help="Apply per-platform fee schedules (data/fee_schedules.json overrides) instead of global frictions.",
+    )
+    parser.add_argument(
+        "--record-snapshots",
+        action="store_true",
+        help="Append each cycle's collected markets to the snapshot store for backtesting.",
+    )
+    parser.add_argument(
+        "--snapshot-format",
+        choices=["parquet", "jsonl"],
+        default="parquet",
+        help="parquet: one partition file per cycle in data/snapshot_store; jsonl: data/snapshots/<date>.jsonl.",
+    )
+    parser.add_argument(
+        "--json-exports",
+        action="store_true",
+        help="Also write markets/embeddings/pairs/verdicts/opportunities/log JSON files next to data/arbsense.db.",
+    )
+    parser.add_argument(
+        "--delta-sync",
+        action="store_true",
+        help="Diff each cycle against data/sync_state.json and skip re-matching when only prices changed.",
+    )
+    parser.add_argument(
+        "--stream-prices",
+        action="store_true",
+        help="Stream Polymarket WebSocket prices for accepted matches into the opportunity book and "
+        "persist each re-scored opportunity as ticks arrive; Kalshi markets are not streamed and keep REST repricing.",
+    )
+    fixtures = parser.add_mutually_exclusive_group()
+    fixtures.add_argument(
+        "--record-fixtures",
+        type=str,
+        default="",
+        metavar="PATH",
+        help="Record connector and LLM traffic to a gzip JSONL fixture store (implies --use-live).",
+    )
+    fixtures.add_argument(
+        "--replay-fixtures",
+        type=str,
+        default="",
+        metavar="PATH",
+        help="Serve connector and LLM traffic from a recorded fixture store, offline (implies --use-live).",
+    )
+    parser.add_argument(
+        "--fixture-latency-ms",
+        type=float,
+        default=None,
+        help="Simulated latency per replayed call (default: the recorded latency).",
+    )
+    parser.add_argument("--no-depth-sizing", action="store_true", help="Skip order-book depth sizing.")
     return parser.parse_args()
 
 
 def main() -> None:
     """Run one or continuous ArbSense agent cycles."""
     args = parse_args()
+    fixtures_path = args.record_fixtures or args.replay_fixtures
     config = AgentConfig(
-        use_live_data=args.use_live,
+        use_live_data=args.use_live or bool(fixtures_path),
         target_market_count=args.target_count,
         embedding_threshold=args.embedding_threshold,
         match_threshold=args.match_threshold,
+        quality_gate=args.quality_gate,
+        min_quality_grade=args.min_quality_grade,
+        gate_spam=not args.allow_spam,
         fee_rate=args.fee_rate,
         slippage_rate=args.slippage_rate,
         gas_cost_usd=args.gas_cost_usd,
+        use_fee_schedules=args.fee_schedules,
+        depth_sizing=not args.no_depth_sizing,
         report_on_chain=args.report_on_chain,
         network=args.network,
         loop_interval_seconds=args.interval_seconds,
+        reprice_interval_seconds=args.reprice_interval_seconds,
+        record_snapshots=args.record_snapshots,
+        snapshot_format=args.snapshot_format,
+        json_exports=args.json_exports,
+        delta_sync=args.delta_sync,
+        stream_prices=args.stream_prices,
+        fixtures_mode="record" if args.record_fixtures else "replay" if args.replay_fixtures else "off",
+        fixtures_path=fixtures_path or AgentConfig.fixtures_path,
+        fixtures_latency_ms=args.fixture_latency_ms,
     )
     agent = ArbSenseAgent(config=config)
 
     if args.continuous:
         agent.run_continuous()
     else:
+        started = time.perf_counter()
         summary = agent.run_single_cycle()
         print(f"Cycle summary: {summary}")
+        print(f"Cycle time: {time.perf_counter() - started:.3f}s")
 
 
 if __name__ == "__main__":
@@ -5,7 +5,6 @@ Bypasses .transact() POA middleware issue by using build_transaction + sign + se
 
 from __future__ import annotations
 
-import json
 import sys
 import time
 from pathlib import Path
@@ -16,6 +15,7 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from web3 import Web3
 
+from src import jsonio
 from src.config import load_settings
 
 # --- Config ---
@@ -27,7 +27,7 @@ CHAIN_ID = 97
 
 # Load ABI
 artifact_path = PROJECT_ROOT / "contracts" / "ArbSenseRegistry.artifact.json"
-artifact = json.loads(artifact_path.read_text(encoding="utf-8"))
+artifact = jsonio.read_json(artifact_path)
 ABI = artifact["abi"]
 
 # Opportunities to report (from real data)
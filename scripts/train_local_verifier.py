@@ -0,0 +1,63 @@
+"""CLI entrypoint for training the learned local verifier from LLM verdicts."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.local_verifier import load_labelled_verdicts, save_local_verifier, train_local_verifier
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Train the local verifier from cached LLM verdicts.")
+    parser.add_argument(
+        "--history",
+        type=str,
+        default="data/verdict_history.jsonl",
+        help="Accumulated LLM verdict history (JSONL).",
+    )
+    parser.add_argument(
+        "--input",
+        type=str,
+        default=None,
+        help="Optional verified matches JSON export to train on alongside the history.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="data/local_verifier.json",
+        help="Output model JSON path.",
+    )
+    parser.add_argument("--holdout", type=float, default=0.2, help="Held-out fraction for calibration.")
+    parser.add_argument("--min-examples", type=int, default=20, help="Minimum labelled pairs required.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Train, report calibration against held-out LLM labels, and save the model."""
+    args = parse_args()
+    paths = [Path(args.history)] + ([Path(args.input)] if args.input else [])
+    rows = load_labelled_verdicts(paths)
+    model = train_local_verifier(rows, holdout_fraction=args.holdout, min_examples=args.min_examples)
+    save_local_verifier(model, Path(args.output))
+
+    print(f"LLM-labelled pairs: {len(rows)} (train={model['train_count']}, holdout={model['holdout_count']})")
+    for head, stats in model["calibration"].items():
+        if not stats.get("count"):
+            print(f"- {head}: no held-out rows")
+            continue
+        print(
+            f"- {head}: accuracy={stats['accuracy']:.3f} precision={stats['precision']:.3f} "
+            f"recall={stats['recall']:.3f} brier={stats['brier']:.4f} ece={stats['ece']:.4f}"
+        )
+    print(f"Saved model to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
@@ -11,9 +10,13 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from src import jsonio
 from src.config import load_settings
 from src.embeddings import save_json
+from src.event_clustering import verify_clustered_pairs
+from src.local_verifier import append_verdict_history
 from src.semantic_matcher import verify_candidate_pairs
+from src.state_store import StateStore
 
 
 def parse_args() -> argparse.Namespace:
@@ -29,7 +32,7 @@ def parse_args() -> argparse.Namespace:
         "--output",
         type=str,
         default="data/verified_matches.json",
-        help="Output verified matches path.",
+        help="Output verified matches path (verdicts are also written to the state store).",
     )
     parser.add_argument(
         "--match-threshold",
@@ -37,6 +40,11 @@ def parse_args() -> argparse.Namespace:
         default=0.78,
         help="Minimum verifier confidence to retain a positive match.",
     )
+    parser.add_argument(
+        "--no-clustering",
+        action="store_true",
+        help="Verify every candidate pair independently instead of per event cluster.",
+    )
     return parser.parse_args()
 
 
@@ -45,10 +53,16 @@ def main() -> None:
     args = parse_args()
     settings = load_settings()
 
-    pairs_payload = json.loads(Path(args.input).read_text(encoding="utf-8"))
+    pairs_payload = jsonio.read_json(Path(args.input))
     pairs = pairs_payload.get("pairs", [])
 
-    verified, provider = verify_candidate_pairs(pairs, settings=settings)
+    cluster_stats: dict[str, int] = {}
+    if args.no_clustering:
+        verified, provider = verify_candidate_pairs(pairs, settings=settings)
+    else:
+        verified, provider, cluster_stats = verify_clustered_pairs(
+            pairs, settings=settings, match_threshold=args.match_threshold
+        )
 
     accepted = [
         row
@@ -63,13 +77,25 @@ def main() -> None:
         "verified_count": len(verified),
         "accepted_count": len(accepted),
         "match_threshold": args.match_threshold,
+        "clustering": cluster_stats,
         "accepted_matches": accepted,
         "all_verifications": verified,
     }
     save_json(payload, Path(args.output))
+    append_verdict_history(verified, settings.data_dir / "verdict_history.jsonl")
+    state = StateStore(settings.data_dir / "arbsense.db")
+    state.start_cycle()
+    state.write_verdicts(verified, args.match_threshold)
+    state.update_cycle_meta(verify_provider=provider, match_threshold=args.match_threshold, clustering=cluster_stats)
 
     print(f"Verifier provider: {provider}")
     print(f"Input candidates: {len(pairs)}")
+    if cluster_stats:
+        print(
+            f"Event clusters: {cluster_stats['clusters']} | "
+            f"verification calls: {cluster_stats['verification_calls']} | "
+            f"inferred pairs: {cluster_stats['inferred_pairs']}"
+        )
     print(f"Accepted high-precision matches: {len(accepted)}")
     for item in accepted[:10]:
         print(
@@ -2,24 +2,69 @@
 
 from __future__ import annotations
 
-import json
+import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from src import jsonio
 from src.arbitrage_detector import (
-    detect_opportunities,
     save_opportunities,
     select_top_opportunity,
     split_time_value_spreads,
 )
+from src.backtest import append_snapshot
 from src.blockchain import ArbSenseChainClient, load_contract_artifact
 from src.config import Settings, load_settings
-from src.data_collector import collect_markets, save_markets
-from src.embeddings import embed_all_markets, find_candidate_pairs, save_json
+from src.data_collector import (
+    collect_markets,
+    fetch_orderbooks,
+    refresh_live_prices,
+    save_markets,
+    with_prices,
+)
+from src.delta_sync import MarketDelta, SyncState
+from src.embeddings import LOCAL_EMBEDDING_MODEL, EmbeddingCache, embed_all_markets, find_candidate_pairs, save_json
+from src.event_clustering import market_key, verify_clustered_pairs
+from src.fee_schedules import load_fee_table
+from src.fixtures import FixtureStore, activate_fixtures
+from src.local_verifier import append_verdict_history
+from src.market_model import Market
+from src.opportunity_book import OpportunityBook
+from src.orderbook import strip_orderbooks
+from src.price_stream import PriceStream, default_feeds
+from src.quality_scorer import passes_quality_gate
 from src.semantic_matcher import verify_candidate_pairs
+from src.snapshot_store import ParquetSnapshotStore, parquet_available
+from src.state_store import StateStore
+
+
+def _row_key(row: dict[str, Any]) -> tuple[str, str]:
+    ka, kb = market_key(row["market_a"]), market_key(row["market_b"])
+    return (ka, kb) if ka <= kb else (kb, ka)
+
+
+def _refresh_rows(
+    rows: list[dict[str, Any]], current: dict[str, dict[str, Any]], stale: set[str]
+) -> list[dict[str, Any]]:
+    """Pair rows whose markets are both still listed and not stale, with their current records swapped in."""
+    refreshed = []
+    for row in rows:
+        ka, kb = market_key(row["market_a"]), market_key(row["market_b"])
+        if ka in stale or kb in stale or ka not in current or kb not in current:
+            continue
+        refreshed.append({**row, "market_a": current[ka], "market_b": current[kb]})
+    return refreshed
+
+
+def _pair_comparisons(markets: list[dict[str, Any]]) -> int:
+    """Cross-platform similarity comparisons `find_candidate_pairs` makes over markets."""
+    per_platform: dict[Any, int] = {}
+    for market in markets:
+        per_platform[market.get("platform")] = per_platform.get(market.get("platform"), 0) + 1
+    return (len(markets) ** 2 - sum(count * count for count in per_platform.values())) // 2
 
 
 @dataclass
@@ -30,12 +75,32 @@ class AgentConfig:
     target_market_count: int = 30
     embedding_threshold: float = 0.70
     match_threshold: float = 0.78
+    use_event_clustering: bool = True
+    # "embed" keeps markets graded below min_quality_grade, or spam-flagged when gate_spam is set,
+    # out of embedding and pairing; "verify" still pairs them but verifies none of their pairs.
+    quality_gate: str = "off"
+    min_quality_grade: str = "D"
+    gate_spam: bool = True
     fee_rate: float = 0.01
     slippage_rate: float = 0.005
     gas_cost_usd: float = 0.004
+    use_fee_schedules: bool = False
+    depth_sizing: bool = True
     report_on_chain: bool = False
     network: str = "bsc"
     loop_interval_seconds: int = 300
+    reprice_interval_seconds: int = 0
+    record_snapshots: bool = False
+    # "parquet" appends to the data/snapshot_store Parquet store (JSONL when pyarrow is missing).
+    snapshot_format: str = "parquet"
+    # Pipeline state always goes to data/arbsense.db; this also writes the per-stage JSON files.
+    json_exports: bool = False
+    delta_sync: bool = False
+    stream_prices: bool = False
+    # "record" captures connector and LLM traffic to fixtures_path; "replay" serves it offline.
+    fixtures_mode: str = "off"
+    fixtures_path: str = "data/fixtures/traffic.jsonl.gz"
+    fixtures_latency_ms: float | None = None
 
 
 class ArbSenseAgent:
@@ -46,6 +111,46 @@ class ArbSenseAgent:
         self.config = config or AgentConfig()
         self.data_dir = self.settings.data_dir
         self.logs_path = self.data_dir / "agent_logs.json"
+        self._accepted_matches: list[dict[str, Any]] = []
+        # Last cycle's candidate pairs and verdicts; None until markets have been matched once.
+        self._candidate_pairs: list[dict[str, Any]] = []
+        self._verified_rows: list[dict[str, Any]] | None = None
+        self.state = StateStore(self.data_dir / "arbsense.db")
+        # Shared with backtest replays, which look vectors up by the same model and text keys.
+        self.embedding_cache = EmbeddingCache()
+        self.embedding_cache.load(self.data_dir / "embedding_cache.jsonl")
+        self._in_cycle = False
+        if self.config.fixtures_mode != "off":
+            activate_fixtures(
+                FixtureStore(
+                    Path(self.config.fixtures_path),
+                    mode=self.config.fixtures_mode,
+                    latency_ms=self.config.fixtures_latency_ms,
+                )
+            )
+        self._pair_count = 0
+        self._quality_gated = 0
+        self.price_stream: PriceStream | None = None
+        self._book_lock = threading.Lock()
+        self._stream_events = 0
+        self.sync_state = SyncState.load(self.data_dir / "sync_state.json") if self.config.delta_sync else None
+        self.fee_table = (
+            load_fee_table(
+                self.data_dir / "fee_schedules.json",
+                fee_rate=self.config.fee_rate,
+                gas_cost_usd=self.config.gas_cost_usd,
+            )
+            if self.config.use_fee_schedules
+            else None
+        )
+        self.book = OpportunityBook(
+            fee_rate=self.config.fee_rate,
+            slippage_rate=self.config.slippage_rate,
+            gas_cost_usd=self.config.gas_cost_usd,
+            fee_table=self.fee_table,
+            depth_sizing=self.config.depth_sizing,
+        )
+        self.book.subscribe(self._on_book_event)
 
     def _utc_now(self) -> str:
         """Return current UTC timestamp in ISO-8601."""
@@ -56,14 +161,14 @@ class ArbSenseAgent:
         if not self.logs_path.exists():
             return []
         try:
-            payload = json.loads(self.logs_path.read_text(encoding="utf-8"))
+            payload = jsonio.read_json(self.logs_path)
             logs = payload.get("logs", [])
             return logs if isinstance(logs, list) else []
         except Exception:
             return []
 
     def log(self, ltype: str, message: str, extra: dict[str, Any] | None = None) -> None:
-        """Write log entry to console and persistent JSON file."""
+        """Write log entry to console and the state store (batched within a cycle)."""
         entry = {
             "timestamp": self._utc_now(),
             "type": ltype,
@@ -74,110 +179,341 @@ class ArbSenseAgent:
 
         print(f"[{entry['timestamp']}] [{ltype}] {message}")
 
+        self.state.log(entry, flush=not self._in_cycle)
+        if not self.config.json_exports:
+            return
         logs = self._load_logs()
         logs.append(entry)
         payload = {"count": len(logs), "logs": logs[-500:]}
-        self.logs_path.parent.mkdir(parents=True, exist_ok=True)
-        self.logs_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        jsonio.write_json(payload, self.logs_path)
 
-    def run_single_cycle(self) -> dict[str, Any]:
-        """Run one full agent cycle and return summary output."""
-        self.log("system", "Starting agent cycle.")
+    def _record_snapshot(self, markets: list[dict[str, Any]]) -> None:
+        """Append this cycle's markets to the snapshot store used by backtests."""
+        if self.config.snapshot_format == "parquet" and parquet_available():
+            ParquetSnapshotStore(self.data_dir / "snapshot_store").append(markets, self._utc_now())
+            return
+        snapshot_path = self.data_dir / "snapshots" / f"{datetime.now(timezone.utc).date().isoformat()}.jsonl"
+        append_snapshot(markets, snapshot_path, self._utc_now())
 
-        markets = collect_markets(
-            settings=self.settings,
-            use_live=self.config.use_live_data,
-            target_count=self.config.target_market_count,
-        )
-        markets_path = self.data_dir / "markets.json"
-        save_markets(markets, markets_path)
-        self.log("scan", f"Collected {len(markets)} markets.", {"path": str(markets_path)})
-
-        embedded_records, embedding_provider = embed_all_markets(markets=markets, settings=self.settings)
-        pairs = find_candidate_pairs(
-            embedded_records=embedded_records,
-            threshold=self.config.embedding_threshold,
-        )
-        embeddings_path = self.data_dir / "embeddings.json"
-        pairs_path = self.data_dir / "candidate_pairs.json"
-        save_json(
+    def _attach_orderbooks(self, accepted: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Return accepted matches whose live markets carry fetched depth ladders."""
+        markets: dict[str, Market] = {}
+        for row in accepted:
+            for market in (row["market_a"], row["market_b"]):
+                markets.setdefault(str(market["market_id"]), market)
+        if not markets:
+            return accepted
+        books = fetch_orderbooks(list(markets.values()))
+        if not books:
+            return accepted
+        with_books = {mid: markets[mid].with_orderbook(book) for mid, book in books.items()}
+        self.log("scan", f"Fetched order books for {len(books)} matched markets.")
+        return [
             {
-                "provider": embedding_provider,
-                "model": self.settings.embedding_model
-                if embedding_provider == "openai"
-                else "local_deterministic_hash",
-                "count": len(embedded_records),
-                "records": embedded_records,
-            },
-            embeddings_path,
-        )
-        save_json(
-            {"threshold": self.config.embedding_threshold, "count": len(pairs), "pairs": pairs},
-            pairs_path,
+                **row,
+                "market_a": with_books.get(str(row["market_a"]["market_id"]), row["market_a"]),
+                "market_b": with_books.get(str(row["market_b"]["market_id"]), row["market_b"]),
+            }
+            for row in accepted
+        ]
+
+    def _publish_opportunities(self, accepted: list[dict[str, Any]] | None = None) -> dict[str, Any]:
+        """Rank and persist the opportunity book's current opportunities.
+
+        With accepted, the book is first reloaded with that match set (a full
+        cycle); reprice passes and streamed ticks have already re-scored only
+        the opportunities their markets touch.
+        """
+        with self._book_lock:
+            if accepted is not None:
+                self.book.load_matches(accepted)
+            input_matches = len(self.book.matches()) if accepted is None else len(accepted)
+            opportunities = self.book.ranked()
+            cluster_opps = self.book.clusters()
+        # Depth is summarized in depth_sizing; the raw ladders are not persisted.
+        strip_orderbooks(opportunities)
+        strip_orderbooks(cluster_opps)
+        safe_opps, time_value_spreads = split_time_value_spreads(opportunities)
+        selected = select_top_opportunity(safe_opps)
+        self.state.write_opportunities(
+            {"safe": safe_opps, "time_value": time_value_spreads, "cluster": cluster_opps}, selected
         )
+        log_extra: dict[str, Any] = {"cycle": self.state.cycle_id}
+        if self.config.json_exports:
+            opportunities_path = self.data_dir / "opportunities.json"
+            save_opportunities(
+                {
+                    "input_matches": input_matches,
+                    "opportunity_count_before_top1": len(opportunities),
+                    "safe_opportunity_count": len(safe_opps),
+                    "time_value_spread_count": len(time_value_spreads),
+                    "selected_count": len(selected),
+                    "top_opportunity": selected[0] if selected else None,
+                    "all_opportunities": safe_opps,
+                    "time_value_spreads": time_value_spreads,
+                    "cluster_opportunity_count": len(cluster_opps),
+                    "cluster_opportunities": cluster_opps,
+                },
+                opportunities_path,
+            )
+            log_extra["path"] = str(opportunities_path)
         self.log(
-            "match",
-            f"Generated {len(pairs)} cross-platform candidate pairs.",
-            {"provider": embedding_provider},
+            "opportunity",
+            (
+                f"Detected {len(opportunities)} opportunities "
+                f"({len(safe_opps)} safe, {len(time_value_spreads)} time-value, "
+                f"{len(cluster_opps)} event-level); "
+                f"selected {len(selected)} top candidate."
+            ),
+            log_extra,
         )
+        return {
+            "all": opportunities,
+            "safe": safe_opps,
+            "time_value": time_value_spreads,
+            "cluster": cluster_opps,
+            "selected": selected,
+        }
+
+    def _match_markets(self, markets: list[dict[str, Any]], delta: MarketDelta | None = None) -> list[dict[str, Any]]:
+        """Embed, pair and verify markets; return the accepted matches.
 
-        verified_rows, verify_provider = verify_candidate_pairs(pairs, settings=self.settings)
+        With a delta against the last matched cycle, only added and edited
+        markets are paired (against every market); pairs and verdicts between
+        unchanged markets are kept with current prices, and those touching
+        removed or edited markets are dropped.
+        """
+        gated: set[str] = set()
+        gate_stats: dict[str, Any] = {}
+        if self.config.quality_gate != "off":
+            gated = {
+                market_key(market)
+                for market in markets
+                if not passes_quality_gate(market, self.config.min_quality_grade, self.config.gate_spam)
+            }
+            gate_stats = {
+                "mode": self.config.quality_gate,
+                "min_grade": self.config.min_quality_grade,
+                "markets_gated": len(gated),
+            }
+        self._quality_gated = len(gated)
+        if self.config.quality_gate == "embed" and gated:
+            eligible = [market for market in markets if market_key(market) not in gated]
+            gate_stats["embeddings_avoided"] = len(markets) - len(eligible)
+            gate_stats["pair_comparisons_avoided"] = _pair_comparisons(markets) - _pair_comparisons(eligible)
+            markets = eligible
+
+        embedded_records, embedding_provider = embed_all_markets(
+            markets=markets, settings=self.settings, cache=self.embedding_cache
+        )
+        self.embedding_cache.save(self.data_dir / "embedding_cache.jsonl")
+        retained_pairs: list[dict[str, Any]] = []
+        retained_rows: list[dict[str, Any]] = []
+        requeued: list[dict[str, Any]] = []
+        if delta is None:
+            new_pairs = find_candidate_pairs(
+                embedded_records=embedded_records,
+                threshold=self.config.embedding_threshold,
+            )
+        else:
+            fresh = {market_key(market) for market in delta.added} | delta.rematch_ids
+            stale = fresh | set(delta.removed)
+            current = {market_key(market): market for market in markets}
+            retained_pairs = _refresh_rows(self._candidate_pairs, current, stale)
+            # Inferred verdicts rest on their cluster's other edges; re-verify them if the cluster changed.
+            touched = {
+                row.get("cluster_id")
+                for row in self._verified_rows or []
+                if market_key(row["market_a"]) in stale or market_key(row["market_b"]) in stale
+            }
+            retained_rows = _refresh_rows(
+                [
+                    row
+                    for row in self._verified_rows or []
+                    if not (row.get("inferred") and row.get("cluster_id") in touched)
+                ],
+                current,
+                stale,
+            )
+            verified_before = {_row_key(row) for row in self._verified_rows or []}
+            still_verified = {_row_key(row) for row in retained_rows}
+            requeued = [
+                pair
+                for pair in retained_pairs
+                if _row_key(pair) in verified_before and _row_key(pair) not in still_verified
+            ]
+            new_pairs = find_candidate_pairs(
+                embedded_records=embedded_records,
+                threshold=self.config.embedding_threshold,
+                only=[i for i, record in enumerate(embedded_records) if market_key(record["market"]) in fresh],
+            )
+        pairs = sorted(retained_pairs + new_pairs, key=lambda pair: pair["similarity_score"], reverse=True)
+        self.state.write_pairs(pairs)
+        self.state.update_cycle_meta(
+            embedding_provider=embedding_provider, embedding_threshold=self.config.embedding_threshold
+        )
+        if self.config.json_exports:
+            save_json(
+                {
+                    "provider": embedding_provider,
+                    "model": self.settings.embedding_model
+                    if embedding_provider == "openai"
+                    else LOCAL_EMBEDDING_MODEL,
+                    "count": len(embedded_records),
+                    "records": embedded_records,
+                },
+                self.data_dir / "embeddings.json",
+            )
+            save_json(
+                {"threshold": self.config.embedding_threshold, "count": len(pairs), "pairs": pairs},
+                self.data_dir / "candidate_pairs.json",
+            )
+        if delta is None:
+            self.log(
+                "match",
+                f"Generated {len(pairs)} cross-platform candidate pairs.",
+                {"provider": embedding_provider},
+            )
+        else:
+            self.log(
+                "match",
+                f"Paired {len(fresh)} new or edited markets: {len(new_pairs)} new candidate pairs, "
+                f"{len(retained_pairs)} kept.",
+                {"provider": embedding_provider, "kept_verdicts": len(retained_rows), **delta.to_dict()},
+            )
+
+        verify_pairs = requeued + new_pairs
+        if self.config.quality_gate == "verify" and gated:
+            before = len(verify_pairs)
+            verify_pairs = [
+                pair
+                for pair in verify_pairs
+                if market_key(pair["market_a"]) not in gated and market_key(pair["market_b"]) not in gated
+            ]
+            gate_stats["verification_candidates_avoided"] = before - len(verify_pairs)
+        if gate_stats:
+            self.state.update_cycle_meta(quality_gate=gate_stats)
+            self.log("match", f"Quality gate held back {len(gated)} low-grade markets.", gate_stats)
+
+        cluster_stats: dict[str, int] = {}
+        if self.config.use_event_clustering:
+            new_rows, verify_provider, cluster_stats = verify_clustered_pairs(
+                verify_pairs, settings=self.settings, match_threshold=self.config.match_threshold
+            )
+        else:
+            new_rows, verify_provider = verify_candidate_pairs(verify_pairs, settings=self.settings)
+        append_verdict_history(new_rows, self.data_dir / "verdict_history.jsonl")
+        verified_rows = sorted(
+            retained_rows + new_rows, key=lambda row: row["verification"]["confidence"], reverse=True
+        )
         accepted = [
             row
             for row in verified_rows
             if row["verification"]["is_match"]
             and float(row["verification"]["confidence"]) >= self.config.match_threshold
         ]
-        verified_path = self.data_dir / "verified_matches.json"
-        save_json(
-            {
-                "provider": verify_provider,
-                "input_candidates": len(pairs),
-                "verified_count": len(verified_rows),
-                "accepted_count": len(accepted),
-                "match_threshold": self.config.match_threshold,
-                "accepted_matches": accepted,
-                "all_verifications": verified_rows,
-            },
-            verified_path,
+        self.state.write_verdicts(verified_rows, self.config.match_threshold)
+        self.state.update_cycle_meta(
+            verify_provider=verify_provider, match_threshold=self.config.match_threshold, clustering=cluster_stats
         )
+        if self.config.json_exports:
+            save_json(
+                {
+                    "provider": verify_provider,
+                    "input_candidates": len(pairs),
+                    "verified_count": len(verified_rows),
+                    "accepted_count": len(accepted),
+                    "match_threshold": self.config.match_threshold,
+                    "clustering": cluster_stats,
+                    "accepted_matches": accepted,
+                    "all_verifications": verified_rows,
+                },
+                self.data_dir / "verified_matches.json",
+            )
         self.log(
             "match",
             f"Verified pairs: {len(verified_rows)} | accepted high-precision matches: {len(accepted)}.",
-            {"provider": verify_provider},
+            {"provider": verify_provider, **cluster_stats},
         )
+        self._pair_count = len(pairs)
+        self._candidate_pairs = pairs
+        self._verified_rows = verified_rows
+        return accepted
 
-        opportunities = detect_opportunities(
-            accepted_matches=accepted,
-            fee_rate=self.config.fee_rate,
-            slippage_rate=self.config.slippage_rate,
-            gas_cost_usd=self.config.gas_cost_usd,
-        )
-        safe_opps, time_value_spreads = split_time_value_spreads(opportunities)
-        selected = select_top_opportunity(safe_opps)
-        opportunities_path = self.data_dir / "opportunities.json"
-        save_opportunities(
+    def _reprice_accepted(self, markets: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Swap the latest market records into the last accepted matches."""
+        by_id = {str(market["market_id"]): market for market in markets}
+        return [
             {
-                "input_matches": len(accepted),
-                "opportunity_count_before_top1": len(opportunities),
-                "safe_opportunity_count": len(safe_opps),
-                "time_value_spread_count": len(time_value_spreads),
-                "selected_count": len(selected),
-                "top_opportunity": selected[0] if selected else None,
-                "all_opportunities": safe_opps,
-                "time_value_spreads": time_value_spreads,
-            },
-            opportunities_path,
-        )
-        self.log(
-            "opportunity",
-            (
-                f"Detected {len(opportunities)} opportunities "
-                f"({len(safe_opps)} safe, {len(time_value_spreads)} time-value); "
-                f"selected {len(selected)} top candidate."
-            ),
-            {"path": str(opportunities_path)},
+                **row,
+                "market_a": by_id.get(str(row["market_a"]["market_id"]), row["market_a"]),
+                "market_b": by_id.get(str(row["market_b"]["market_id"]), row["market_b"]),
+            }
+            for row in self._accepted_matches
+        ]
+
+    def run_single_cycle(self) -> dict[str, Any]:
+        """Run one full agent cycle and return summary output."""
+        self.state.start_cycle(self._utc_now())
+        self._in_cycle = True
+        try:
+            return self._run_cycle()
+        finally:
+            self._in_cycle = False
+            self.state.flush()
+
+    def _run_cycle(self) -> dict[str, Any]:
+        self.log("system", "Starting agent cycle.")
+
+        markets = collect_markets(
+            settings=self.settings,
+            use_live=self.config.use_live_data,
+            target_count=self.config.target_market_count,
         )
+        self.state.write_markets(markets)
+        scan_extra: dict[str, Any] = {"cycle": self.state.cycle_id}
+        if self.config.json_exports:
+            markets_path = self.data_dir / "markets.json"
+            save_markets(markets, markets_path)
+            scan_extra["path"] = str(markets_path)
+        if self.config.use_live_data:
+            from src.connectors.http import get_client
+
+            scan_extra["http"] = get_client().metrics()
+        delta = None
+        if self.sync_state is not None:
+            delta = self.sync_state.diff(markets)
+            scan_extra["delta"] = delta.to_dict()
+        self.log("scan", f"Collected {len(markets)} markets.", scan_extra)
+        if self.config.record_snapshots:
+            self._record_snapshot(markets)
+
+        if delta is not None and self._verified_rows is not None and not delta.requires_rematch:
+            accepted = self._reprice_accepted(markets)
+            self.log(
+                "match",
+                f"Only prices changed; reusing {len(accepted)} accepted matches.",
+                delta.to_dict(),
+            )
+        elif delta is not None and self._verified_rows is not None:
+            accepted = self._match_markets(markets, delta)
+        else:
+            accepted = self._match_markets(markets)
+
+        if self.config.depth_sizing and self.config.use_live_data:
+            accepted = self._attach_orderbooks(accepted)
+        result = self._publish_opportunities(accepted)
+        safe_opps = result["safe"]
+        time_value_spreads = result["time_value"]
+        cluster_opps = result["cluster"]
+        selected = result["selected"]
+        if delta is not None:
+            # Only now: if matching or publishing raised, the next cycle re-diffs against the old baseline.
+            self.sync_state.adopt(delta)
+            self.sync_state.save(self.data_dir / "sync_state.json")
+        self._accepted_matches = accepted
+        if self.config.stream_prices:
+            self._restart_price_stream()
 
         tx_hash = None
         if self.config.report_on_chain and selected:
@@ -213,16 +549,140 @@ class ArbSenseAgent:
 
         summary = {
             "markets": len(markets),
-            "pairs": len(pairs),
+            "pairs": self._pair_count,
             "accepted_matches": len(accepted),
             "opportunities": len(safe_opps),
             "time_value_spreads": len(time_value_spreads),
+            "cluster_opportunities": len(cluster_opps),
             "selected": len(selected),
+            "quality_gated": self._quality_gated,
             "on_chain_tx_hash": tx_hash,
         }
         self.log("system", "Agent cycle completed.", summary)
         return summary
 
+    def _on_book_event(self, event: dict[str, Any]) -> None:
+        """Log each opportunity the book adds, re-scores or removes."""
+        opportunity = event["opportunity"]
+        extra = {"kind": event["kind"], "key": event["key"], "score": opportunity["score"]}
+        if "previous_score" in event:
+            extra["previous_score"] = event["previous_score"]
+        self.log(
+            "book",
+            f"{event['kind'].capitalize()} opportunity {event['type']}: {opportunity.get('event_summary', '')}",
+            extra,
+        )
+
+    def _on_stream_price(self, market_id: str, yes_price: float, no_price: float) -> None:
+        """Push one streamed price into the opportunity book and persist what it re-scored.
+
+        Runs on the stream thread. During a cycle or reprice pass the book is
+        only updated, since that pass publishes the book itself.
+        """
+        with self._book_lock:
+            events = self.book.apply_price_update(market_id, yes_price, no_price)
+            self._stream_events += len(events)
+        if events and not self._in_cycle:
+            self._publish_opportunities()
+
+    def _restart_price_stream(self) -> None:
+        """Resubscribe the WebSocket feeds to the markets of the accepted-match set.
+
+        Only Polymarket is streamed: the Kalshi feed needs signed API-key
+        headers, which Settings does not carry, so Kalshi markets keep being
+        repriced over REST.
+        """
+        if self.price_stream is not None:
+            self.price_stream.stop()
+            self.price_stream = None
+        markets = {str(m["market_id"]): m for row in self._accepted_matches for m in (row["market_a"], row["market_b"])}
+        feeds = default_feeds(list(markets.values()))
+        if not feeds:
+            return
+        try:
+            self.price_stream = PriceStream(feeds, on_update=self._on_stream_price)
+            self.price_stream.start()
+        except RuntimeError as exc:
+            self.price_stream = None
+            self.log("stream", f"Price streaming unavailable: {exc}")
+            return
+        venues = {feed.name for feed in feeds}
+        streamed = sum(1 for market in markets.values() if market.get("platform") in venues)
+        self.log(
+            "stream",
+            f"Streaming prices for {streamed} of {len(markets)} matched markets; "
+            "Kalshi is not streamed (no WebSocket credentials) and is repriced over REST.",
+            {"feeds": sorted(venues), "rest_only": len(markets) - streamed},
+        )
+
+    def run_reprice_cycle(self) -> dict[str, Any]:
+        """Refresh prices for the last accepted match set and re-run detection only.
+
+        Skips collection, embedding and verification; markets without a live
+        price source keep their last known prices. Opportunities are rewritten
+        under the current cycle in the state store.
+        """
+        self._in_cycle = True
+        try:
+            return self._run_reprice()
+        finally:
+            self._in_cycle = False
+            self.state.flush()
+
+    def _run_reprice(self) -> dict[str, Any]:
+        started = time.perf_counter()
+        if not self._accepted_matches:
+            return {"repriced_markets": 0, "opportunities": 0, "skipped": "no accepted matches"}
+
+        markets: dict[str, Market] = {}
+        for row in self._accepted_matches:
+            for market in (row["market_a"], row["market_b"]):
+                markets.setdefault(str(market["market_id"]), market)
+
+        # Streamed markets are already current; only poll the rest over REST.
+        updates = self.price_stream.table.snapshot(list(markets)) if self.price_stream is not None else {}
+        polled = [market for market_id, market in markets.items() if market_id not in updates]
+        updates.update(refresh_live_prices(polled))
+        repriced = {market_id: with_prices(markets[market_id], yes, no) for market_id, (yes, no) in updates.items()}
+        if repriced and self.config.depth_sizing and self.config.use_live_data:
+            # Repricing dropped these markets' books; fetch depth at the new prices.
+            books = fetch_orderbooks(list(repriced.values()))
+            repriced.update({mid: repriced[mid].with_orderbook(book) for mid, book in books.items()})
+        with self._book_lock:
+            events = self.book.update_markets(repriced.values())
+            stream_events, self._stream_events = self._stream_events, 0
+
+        summary: dict[str, Any] = {
+            "repriced_markets": len(updates),
+            "tracked_markets": len(markets),
+            "book_events": len(events) + stream_events,
+            "book_opportunities": len(self.book),
+        }
+        if self.price_stream is not None:
+            summary["stream"] = dict(self.price_stream.stats)
+        self._accepted_matches = [
+            {
+                **row,
+                "market_a": repriced.get(str(row["market_a"]["market_id"]), row["market_a"]),
+                "market_b": repriced.get(str(row["market_b"]["market_id"]), row["market_b"]),
+            }
+            for row in self._accepted_matches
+        ]
+        if events or stream_events:
+            # Only persist when some opportunity was added, re-scored or removed; the book
+            # has already re-scored just the pairs and clusters of the repriced markets.
+            result = self._publish_opportunities()
+            summary.update(
+                {
+                    "opportunities": len(result["safe"]),
+                    "time_value_spreads": len(result["time_value"]),
+                    "cluster_opportunities": len(result["cluster"]),
+                }
+            )
+        summary["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        self.log("reprice", "Price refresh completed.", summary)
+        return summary
+
     def run_continuous(self) -> None:
         """Run the agent in a continuous loop."""
         self.log(
@@ -230,8 +690,22 @@ class ArbSenseAgent:
             f"Starting continuous loop, interval={self.config.loop_interval_seconds}s.",
         )
         while True:
+            cycle_started = time.monotonic()
             try:
                 self.run_single_cycle()
             except Exception as exc:
                 self.log("system", f"Cycle failed: {exc}")
-            time.sleep(self.config.loop_interval_seconds)
+
+            reprice_every = self.config.reprice_interval_seconds
+            while reprice_every > 0:
+                remaining = self.config.loop_interval_seconds - (time.monotonic() - cycle_started)
+                if remaining <= reprice_every:
+                    break
+                time.sleep(reprice_every)
+                try:
+                    self.run_reprice_cycle()
+                except Exception as exc:
+                    self.log("system", f"Reprice failed: {exc}")
+
+            remaining = self.config.loop_interval_seconds - (time.monotonic() - cycle_started)
+            time.sleep(max(0.0, remaining))
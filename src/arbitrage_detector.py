@@ -2,14 +2,27 @@
 
 from __future__ import annotations
 
-import json
-from datetime import date
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+from src import jsonio
+from src.event_clustering import UnionFind, _transitive_guard, market_key
+from src.market_features import date_ordinal
+from src.market_model import Market
+
+if TYPE_CHECKING:
+    from src.fee_schedules import FeeTable
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - fall back to the row-wise scorer
+    np = None  # type: ignore[assignment]
 
 
 def _extract_yes_no_prices(market: dict[str, Any]) -> tuple[float, float]:
     """Return (yes_price, no_price) from normalized outcomes."""
+    if isinstance(market, Market):
+        return market.yes_price, market.no_price
     yes_price = 0.0
     no_price = 0.0
     for outcome in market.get("outcomes", []):
@@ -23,6 +36,8 @@ def _extract_yes_no_prices(market: dict[str, Any]) -> tuple[float, float]:
 
 def _extract_min_liquidity(market: dict[str, Any]) -> float:
     """Get minimum side liquidity for conservative sizing."""
+    if isinstance(market, Market):
+        return market.min_liquidity
     liquidities = [float(o.get("liquidity", 0.0)) for o in market.get("outcomes", [])]
     return min(liquidities) if liquidities else 0.0
 
@@ -33,10 +48,16 @@ def _direction_metrics(
     fee_rate: float,
     slippage_rate: float,
     gas_cost_usd: float,
+    fee_cost: float | None = None,
 ) -> dict[str, float]:
-    """Compute arbitrage economics for one direction after frictions."""
+    """Compute arbitrage economics for one direction after frictions.
+
+    fee_cost, when given, replaces the flat `gross_cost * fee_rate` with
+    per-leg fees already resolved from a fee schedule.
+    """
     gross_cost = yes_price_buy + no_price_buy
-    fee_cost = gross_cost * fee_rate
+    if fee_cost is None:
+        fee_cost = gross_cost * fee_rate
     slippage_cost = gross_cost * slippage_rate
     net_cost = gross_cost + fee_cost + slippage_cost + gas_cost_usd
     gross_profit = 1.0 - gross_cost
@@ -55,28 +76,229 @@ def _direction_metrics(
     }
 
 
-def detect_opportunities(
-    accepted_matches: list[dict[str, Any]],
-    fee_rate: float = 0.01,
-    slippage_rate: float = 0.005,
-    gas_cost_usd: float = 0.004,
+def _is_tradeable_match(item: dict[str, Any]) -> bool:
+    """Apply the verifier gates: match, arbitrage-safe and SAFE resolution verdict."""
+    verification = item.get("verification", {})
+    if not verification.get("is_match", False):
+        return False
+    if not verification.get("arbitrage_safe", False):
+        return False
+    return str(verification.get("resolution_verdict", "CAUTION")).upper() == "SAFE"
+
+
+def _build_opportunity(
+    item: dict[str, Any],
+    d1: dict[str, float],
+    d2: dict[str, float],
+    yes_a: float,
+    yes_b: float,
+    min_liquidity: float,
+    confidence: float,
+) -> dict[str, Any] | None:
+    """Pick the better direction and materialize one opportunity row."""
+    verification = item.get("verification", {})
+    market_a = item["market_a"]
+    market_b = item["market_b"]
+
+    spread = abs(yes_a - yes_b)
+    spread_pct = spread * 100.0
+
+    best_direction = "A_yes_B_no" if d1["net_profit"] >= d2["net_profit"] else "B_yes_A_no"
+    best = d1 if best_direction == "A_yes_B_no" else d2
+
+    if best["net_profit"] <= 0:
+        return None
+
+    score = best["profit_pct"] * confidence * (min_liquidity / 10000.0)
+    time_decay_days = _time_decay_days(market_a, market_b)
+    is_time_value_spread = time_decay_days is not None and time_decay_days > 7
+    return {
+        "event_summary": verification.get("event_summary", market_a.get("title", "")),
+        "market_a": market_a,
+        "market_b": market_b,
+        "similarity_score": item.get("similarity_score", 0.0),
+        "ai_confidence": confidence,
+        "spread": round(spread, 6),
+        "spread_pct": round(spread_pct, 6),
+        "min_liquidity": round(min_liquidity, 2),
+        "direction": best_direction,
+        "economics": best,
+        "score": round(score, 6),
+        "recommended_action": (
+            f"Buy YES on {market_a['platform']} and NO on {market_b['platform']}"
+            if best_direction == "A_yes_B_no"
+            else f"Buy YES on {market_b['platform']} and NO on {market_a['platform']}"
+        ),
+        "verification": verification,
+        "time_decay_days": time_decay_days,
+        "is_time_value_spread": is_time_value_spread,
+    }
+
+
+def _pack_match_columns(items: list[dict[str, Any]], fee_table: FeeTable | None = None) -> dict[str, Any]:
+    """Pack per-pair prices, liquidity and confidence into float64 columns.
+
+    Outcome lists are scanned once per distinct market object, so markets that
+    appear in several pairs are not re-extracted. With a fee table, each
+    market's platform is resolved once to its table row ID as well.
+    """
+    cache: dict[int, tuple[float, float, float, int]] = {}
+
+    def market_row(market: dict[str, Any]) -> tuple[float, float, float, int]:
+        row = cache.get(id(market))
+        if row is None:
+            yes, no = _extract_yes_no_prices(market)
+            pid = fee_table.platform_id(market.get("platform", "")) if fee_table is not None else 0
+            row = (yes, no, _extract_min_liquidity(market), pid)
+            cache[id(market)] = row
+        return row
+
+    rows = []
+    pids = []
+    for item in items:
+        yes_a, no_a, liq_a, pid_a = market_row(item["market_a"])
+        yes_b, no_b, liq_b, pid_b = market_row(item["market_b"])
+        confidence = float(item.get("verification", {}).get("confidence", 0.0))
+        rows.append((yes_a, no_a, yes_b, no_b, min(liq_a, liq_b), confidence))
+        pids.append((pid_a, pid_b))
+    packed = np.array(rows, dtype=np.float64).reshape(len(rows), 6)
+    columns = dict(zip(("yes_a", "no_a", "yes_b", "no_b", "liq", "conf"), packed.T))
+    if fee_table is not None:
+        pid_columns = np.array(pids, dtype=np.intp).reshape(len(pids), 2)
+        columns["pid_a"], columns["pid_b"] = pid_columns.T
+    return columns
+
+
+def _direction_columns(
+    yes_price_buy: Any,
+    no_price_buy: Any,
+    fee_rate: float,
+    slippage_rate: float,
+    gas_cost_usd: Any,
+    fee_cost: Any = None,
+) -> dict[str, Any]:
+    """Vectorized `_direction_metrics` (unrounded, same operation order)."""
+    gross_cost = yes_price_buy + no_price_buy
+    if fee_cost is None:
+        fee_cost = gross_cost * fee_rate
+    slippage_cost = gross_cost * slippage_rate
+    net_cost = gross_cost + fee_cost + slippage_cost + gas_cost_usd
+    gross_profit = 1.0 - gross_cost
+    net_profit = 1.0 - net_cost
+    positive = (net_profit > 0) & (net_cost > 0)
+    ratio = np.divide(net_profit, net_cost, out=np.zeros_like(net_profit), where=positive)
+    profit_pct = np.where(positive, ratio * 100.0, 0.0)
+    return {
+        "gross_cost": gross_cost,
+        "fee_cost": fee_cost,
+        "slippage_cost": slippage_cost,
+        "gas_cost_usd": gas_cost_usd,
+        "net_cost": net_cost,
+        "gross_profit": gross_profit,
+        "net_profit": net_profit,
+        "profit_pct": profit_pct,
+    }
+
+
+def _direction_rows(columns: dict[str, Any], idx: Any) -> list[dict[str, float]]:
+    """Materialize selected rows of direction columns exactly like `_direction_metrics`."""
+    fields = ("gross_cost", "fee_cost", "slippage_cost", "net_cost", "gross_profit", "net_profit", "profit_pct")
+    values = {name: columns[name][idx].tolist() for name in fields}
+    gas_column = columns["gas_cost_usd"]
+    if np.ndim(gas_column) == 0:
+        gas = [round(float(gas_column), 6)] * len(idx)
+    else:
+        gas = [round(value, 6) for value in gas_column[idx].tolist()]
+    return [
+        {
+            "gross_cost": round(values["gross_cost"][k], 6),
+            "fee_cost": round(values["fee_cost"][k], 6),
+            "slippage_cost": round(values["slippage_cost"][k], 6),
+            "gas_cost_usd": gas[k],
+            "net_cost": round(values["net_cost"][k], 6),
+            "gross_profit": round(values["gross_profit"][k], 6),
+            "net_profit": round(values["net_profit"][k], 6),
+            "profit_pct": round(values["profit_pct"][k], 6),
+        }
+        for k in range(len(idx))
+    ]
+
+
+def _detect_columnar(
+    items: list[dict[str, Any]],
+    fee_rate: float,
+    slippage_rate: float,
+    gas_cost_usd: float,
+    fee_table: FeeTable | None = None,
 ) -> list[dict[str, Any]]:
-    """Detect and score arbitrage opportunities from verified matches."""
+    """Score both directions for all pairs in one NumPy pass; materialize survivors only."""
+    cols = _pack_match_columns(items, fee_table)
+    # Direction 1: Buy YES on A + NO on B; Direction 2: Buy YES on B + NO on A
+    if fee_table is None:
+        d1 = _direction_columns(cols["yes_a"], cols["no_b"], fee_rate, slippage_rate, gas_cost_usd)
+        d2 = _direction_columns(cols["yes_b"], cols["no_a"], fee_rate, slippage_rate, gas_cost_usd)
+    else:
+        pid_a, pid_b = cols["pid_a"], cols["pid_b"]
+        gas = fee_table.gas_usd[pid_a] + fee_table.gas_usd[pid_b]
+        fee_1 = fee_table.leg_fees(pid_a, cols["yes_a"]) + fee_table.leg_fees(pid_b, cols["no_b"])
+        fee_2 = fee_table.leg_fees(pid_b, cols["yes_b"]) + fee_table.leg_fees(pid_a, cols["no_a"])
+        d1 = _direction_columns(cols["yes_a"], cols["no_b"], fee_rate, slippage_rate, gas, fee_1)
+        d2 = _direction_columns(cols["yes_b"], cols["no_a"], fee_rate, slippage_rate, gas, fee_2)
+
+    # Unrounded net profit <= 0 can never round to a positive value, so this
+    # mask is a superset of the rows the exact per-row rules keep.
+    keep = np.maximum(d1["net_profit"], d2["net_profit"]) > 0
+    if fee_table is not None:
+        keep &= cols["liq"] >= np.maximum(fee_table.min_ticket_usd[pid_a], fee_table.min_ticket_usd[pid_b])
+    survivors = np.flatnonzero(keep)
+    rows_d1 = _direction_rows(d1, survivors)
+    rows_d2 = _direction_rows(d2, survivors)
+    yes_a = cols["yes_a"][survivors].tolist()
+    yes_b = cols["yes_b"][survivors].tolist()
+    liq = cols["liq"][survivors].tolist()
+    conf = cols["conf"][survivors].tolist()
+
     opportunities: list[dict[str, Any]] = []
+    for k, i in enumerate(survivors.tolist()):
+        row = _build_opportunity(
+            items[i],
+            rows_d1[k],
+            rows_d2[k],
+            yes_a=yes_a[k],
+            yes_b=yes_b[k],
+            min_liquidity=liq[k],
+            confidence=conf[k],
+        )
+        if row is not None:
+            opportunities.append(row)
+    return opportunities
 
-    for item in accepted_matches:
-        verification = item.get("verification", {})
-        if not verification.get("is_match", False):
-            continue
-        if not verification.get("arbitrage_safe", False):
-            continue
-        if str(verification.get("resolution_verdict", "CAUTION")).upper() != "SAFE":
-            continue
 
+def _detect_rowwise(
+    items: list[dict[str, Any]],
+    fee_rate: float,
+    slippage_rate: float,
+    gas_cost_usd: float,
+    fee_table: FeeTable | None = None,
+) -> list[dict[str, Any]]:
+    """Reference per-pair scoring path, used when NumPy is unavailable."""
+    opportunities: list[dict[str, Any]] = []
+    for item in items:
         market_a = item["market_a"]
         market_b = item["market_b"]
         yes_a, no_a = _extract_yes_no_prices(market_a)
         yes_b, no_b = _extract_yes_no_prices(market_b)
+        min_liquidity = min(_extract_min_liquidity(market_a), _extract_min_liquidity(market_b))
+
+        fee_1 = fee_2 = None
+        if fee_table is not None:
+            sched_a = fee_table.schedule(market_a.get("platform", ""))
+            sched_b = fee_table.schedule(market_b.get("platform", ""))
+            if min_liquidity < max(sched_a.min_ticket_usd, sched_b.min_ticket_usd):
+                continue
+            gas_cost_usd = sched_a.leg_gas_usd + sched_b.leg_gas_usd
+            fee_1 = sched_a.leg_fee(yes_a) + sched_b.leg_fee(no_b)
+            fee_2 = sched_b.leg_fee(yes_b) + sched_a.leg_fee(no_a)
 
         # Direction 1: Buy YES on A + NO on B
         d1 = _direction_metrics(
@@ -85,6 +307,7 @@ def detect_opportunities(
             fee_rate=fee_rate,
             slippage_rate=slippage_rate,
             gas_cost_usd=gas_cost_usd,
+            fee_cost=fee_1,
         )
         # Direction 2: Buy YES on B + NO on A
         d2 = _direction_metrics(
@@ -93,43 +316,287 @@ def detect_opportunities(
             fee_rate=fee_rate,
             slippage_rate=slippage_rate,
             gas_cost_usd=gas_cost_usd,
+            fee_cost=fee_2,
         )
+        row = _build_opportunity(
+            item,
+            d1,
+            d2,
+            yes_a=yes_a,
+            yes_b=yes_b,
+            min_liquidity=min_liquidity,
+            confidence=float(item.get("verification", {}).get("confidence", 0.0)),
+        )
+        if row is not None:
+            opportunities.append(row)
+    return opportunities
 
-        spread = abs(yes_a - yes_b)
-        spread_pct = spread * 100.0
-        min_liquidity = min(_extract_min_liquidity(market_a), _extract_min_liquidity(market_b))
-        confidence = float(verification.get("confidence", 0.0))
 
-        best_direction = "A_yes_B_no" if d1["net_profit"] >= d2["net_profit"] else "B_yes_A_no"
-        best = d1 if best_direction == "A_yes_B_no" else d2
+def detect_opportunities(
+    accepted_matches: list[dict[str, Any]],
+    fee_rate: float = 0.01,
+    slippage_rate: float = 0.005,
+    gas_cost_usd: float = 0.004,
+    fee_table: FeeTable | None = None,
+) -> list[dict[str, Any]]:
+    """Detect and score arbitrage opportunities from verified matches.
+
+    With a fee table, per-platform leg fees, per-chain gas and minimum ticket
+    sizes replace the global fee_rate and gas_cost_usd.
+    """
+    items = [item for item in accepted_matches if _is_tradeable_match(item)]
+    if not items:
+        return []
+    if np is not None:
+        opportunities = _detect_columnar(items, fee_rate, slippage_rate, gas_cost_usd, fee_table)
+    else:
+        opportunities = _detect_rowwise(items, fee_rate, slippage_rate, gas_cost_usd, fee_table)
+    opportunities.sort(key=lambda x: x["score"], reverse=True)
+    return opportunities
+
+
+def friction_grid(
+    fee_rates: list[float], slippage_rates: list[float], gas_costs: list[float]
+) -> list[tuple[float, float, float]]:
+    """Cartesian product of friction values as (fee_rate, slippage_rate, gas_cost_usd)."""
+    return [(fee, slip, gas) for fee in fee_rates for slip in slippage_rates for gas in gas_costs]
+
+
+def sweep_frictions(
+    accepted_matches: list[dict[str, Any]],
+    grid: list[tuple[float, float, float]],
+    chunk_size: int = 256,
+) -> list[dict[str, Any]]:
+    """Evaluate detection over a grid of (fee_rate, slippage_rate, gas_cost_usd) points.
+
+    Matches are gated and packed once; each chunk of grid points is then scored
+    against every pair as one broadcasted (points x pairs) array computation.
+    Returns per-point opportunity counts, total expected net profit per
+    contract pair and the best score. Values equal those summed from
+    `detect_opportunities` rows exactly: per-pair values are rounded like
+    Python's `round` and totals are accumulated in pair order.
+    """
+    items = [item for item in accepted_matches if _is_tradeable_match(item)]
+    if np is None or not items:
+        return [_sweep_point_rowwise(items, point) for point in grid]
+
+    cols = _pack_match_columns(items)
+    gross_1 = (cols["yes_a"] + cols["no_b"])[None, :]
+    gross_2 = (cols["yes_b"] + cols["no_a"])[None, :]
+    conf = cols["conf"][None, :]
+    liq_weight = (cols["liq"] / 10000.0)[None, :]
+    points = np.asarray(grid, dtype=np.float64).reshape(len(grid), 3)
+
+    results: list[dict[str, Any]] = []
+    for start in range(0, len(points), chunk_size):
+        chunk = points[start : start + chunk_size]
+        fee = chunk[:, 0:1]
+        slip = chunk[:, 1:2]
+        gas = chunk[:, 2:3]
+        # Same operation order as `_direction_metrics`.
+        cost_1 = gross_1 + gross_1 * fee + gross_1 * slip + gas
+        cost_2 = gross_2 + gross_2 * fee + gross_2 * slip + gas
+        raw_1 = 1.0 - cost_1
+        raw_2 = 1.0 - cost_2
+        net_1 = _round6(raw_1)
+        net_2 = _round6(raw_2)
+        pick_1 = net_1 >= net_2
+        net = np.where(pick_1, net_1, net_2)
+        raw = np.where(pick_1, raw_1, raw_2)
+        cost = np.where(pick_1, cost_1, cost_2)
+        kept = net > 0
+        ratio = np.divide(raw, cost, out=np.zeros_like(raw), where=kept & (cost > 0))
+        score = np.where(kept, _round6(_round6(ratio * 100.0) * conf * liq_weight), 0.0)
+
+        counts = kept.sum(axis=1).tolist()
+        # cumsum adds left to right like the row-wise sum(); .sum() is pairwise.
+        totals = np.cumsum(np.where(kept, net, 0.0), axis=1)[:, -1].tolist()
+        best = score.max(axis=1).tolist()
+        for k, (f, s, g) in enumerate(chunk.tolist()):
+            results.append(
+                {
+                    "fee_rate": f,
+                    "slippage_rate": s,
+                    "gas_cost_usd": g,
+                    "opportunity_count": int(counts[k]),
+                    "total_net_profit": round(totals[k], 6),
+                    "best_score": best[k],
+                }
+            )
+    return results
+
+
+def _round6(values: Any) -> Any:
+    """Element-wise `round(x, 6)` as Python rounds floats.
+
+    `np.round` scales by 1e6 and rounds half to even, which can disagree with
+    Python at near-ties; those few elements are re-rounded individually.
+    """
+    rounded = np.round(values, 6)
+    scaled = values * 1e6
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(value, 6) for value in values[near_tie].tolist()]
+    return rounded
+
 
-        if best["net_profit"] <= 0:
+def _sweep_point_rowwise(items: list[dict[str, Any]], point: tuple[float, float, float]) -> dict[str, Any]:
+    """One sweep grid point scored with the per-pair reference path."""
+    fee, slip, gas = point
+    rows = _detect_rowwise(items, fee, slip, gas)
+    return {
+        "fee_rate": fee,
+        "slippage_rate": slip,
+        "gas_cost_usd": gas,
+        "opportunity_count": len(rows),
+        "total_net_profit": round(sum(row["economics"]["net_profit"] for row in rows), 6),
+        "best_score": max((row["score"] for row in rows), default=0.0),
+    }
+
+
+def _edge_key(a: str, b: str) -> tuple[str, str]:
+    return (a, b) if a <= b else (b, a)
+
+
+def _cluster_links(
+    members: list[str],
+    markets: dict[str, dict[str, Any]],
+    edge_rows: dict[tuple[str, str], dict[str, Any]],
+) -> dict[tuple[int, int], list[dict[str, Any]]]:
+    """Member index pairs that may be traded against each other, with the verified edges linking them.
+
+    A pair qualifies through its own accepted edge, or through a shared
+    neighbour when `_transitive_guard` allows inferring x~y from x~r and r~y.
+    """
+    index = {key: i for i, key in enumerate(members)}
+    neighbours: dict[str, list[str]] = {key: [] for key in members}
+    links: dict[tuple[int, int], list[dict[str, Any]]] = {}
+    for (ka, kb), row in edge_rows.items():
+        if ka in index and kb in index:
+            neighbours[ka].append(kb)
+            neighbours[kb].append(ka)
+            links[(min(index[ka], index[kb]), max(index[ka], index[kb]))] = [row]
+    for rep, around in neighbours.items():
+        for i, kx in enumerate(around):
+            for ky in around[i + 1 :]:
+                pair = (min(index[kx], index[ky]), max(index[kx], index[ky]))
+                if pair in links:
+                    continue
+                edge_x = edge_rows[_edge_key(kx, rep)]
+                edge_y = edge_rows[_edge_key(ky, rep)]
+                if _transitive_guard(
+                    markets[kx], markets[ky], edge_x.get("verification", {}), edge_y.get("verification", {})
+                ) is None:
+                    links[pair] = [edge_x, edge_y]
+    return links
+
+
+def detect_cluster_opportunities(
+    accepted_matches: list[dict[str, Any]],
+    fee_rate: float = 0.01,
+    slippage_rate: float = 0.005,
+    gas_cost_usd: float = 0.004,
+    fee_table: FeeTable | None = None,
+) -> list[dict[str, Any]]:
+    """Find the best YES/NO leg combination per cluster of verified-equivalent markets.
+
+    Tradeable matches are merged into equivalence clusters; within each
+    cluster only legs joined by an accepted edge, or by two edges through a
+    shared market that pass the transitive-inference guards, are combined.
+    The cheapest such combination is priced with the same fee, slippage and
+    gas model as pairwise detection. Returns one opportunity per event,
+    ranked by score.
+    """
+    uf = UnionFind()
+    markets: dict[str, dict[str, Any]] = {}
+    edge_rows: dict[tuple[str, str], dict[str, Any]] = {}
+    for item in accepted_matches:
+        if not _is_tradeable_match(item):
+            continue
+        ka, kb = market_key(item["market_a"]), market_key(item["market_b"])
+        if ka == kb:
+            continue
+        markets.setdefault(ka, item["market_a"])
+        markets.setdefault(kb, item["market_b"])
+        uf.union(ka, kb)
+        edge_rows.setdefault(_edge_key(ka, kb), item)
+
+    opportunities: list[dict[str, Any]] = []
+    for root, members in uf.groups().items():
+        members_rows = [markets[k] for k in members]
+        prices = [_extract_yes_no_prices(m) for m in members_rows]
+        combos = []
+        for (i, j), link in _cluster_links(members, markets, edge_rows).items():
+            for yes_idx, no_idx in ((i, j), (j, i)):
+                if prices[yes_idx][0] > 0 and prices[no_idx][1] > 0:
+                    combos.append((prices[yes_idx][0] + prices[no_idx][1], yes_idx, no_idx, link))
+        if not combos:
+            continue
+        _, yes_idx, no_idx, link = min(combos, key=lambda row: row[:3])
+        yes_market = members_rows[yes_idx]
+        no_market = members_rows[no_idx]
+        yes_price = prices[yes_idx][0]
+        no_price = prices[no_idx][1]
+        min_liquidity = min(_extract_min_liquidity(yes_market), _extract_min_liquidity(no_market))
+
+        leg_fees = None
+        leg_gas = gas_cost_usd
+        if fee_table is not None:
+            yes_sched = fee_table.schedule(yes_market.get("platform", ""))
+            no_sched = fee_table.schedule(no_market.get("platform", ""))
+            if min_liquidity < max(yes_sched.min_ticket_usd, no_sched.min_ticket_usd):
+                continue
+            leg_fees = yes_sched.leg_fee(yes_price) + no_sched.leg_fee(no_price)
+            leg_gas = yes_sched.leg_gas_usd + no_sched.leg_gas_usd
+        economics = _direction_metrics(
+            yes_price_buy=yes_price,
+            no_price_buy=no_price,
+            fee_rate=fee_rate,
+            slippage_rate=slippage_rate,
+            gas_cost_usd=leg_gas,
+            fee_cost=leg_fees,
+        )
+        if economics["net_profit"] <= 0:
             continue
 
-        score = best["profit_pct"] * confidence * (min_liquidity / 10000.0)
-        time_decay_days = _time_decay_days(market_a, market_b)
-        is_time_value_spread = time_decay_days is not None and time_decay_days > 7
+        # A transitive link is only as strong as its weakest verified edge.
+        weakest = min(link, key=lambda row: float(row.get("verification", {}).get("confidence", 0.0)))
+        verification = weakest.get("verification", {})
+        confidence = float(verification.get("confidence", 0.0))
+        spread = abs(yes_price - prices[no_idx][0])
+        score = economics["profit_pct"] * confidence * (min_liquidity / 10000.0)
+        time_decay_days = _time_decay_days(yes_market, no_market)
         opportunities.append(
             {
-                "event_summary": verification.get("event_summary", market_a.get("title", "")),
-                "market_a": market_a,
-                "market_b": market_b,
-                "similarity_score": item.get("similarity_score", 0.0),
+                "event_summary": verification.get("event_summary", yes_market.get("title", "")),
+                "cluster_id": root,
+                "cluster_size": len(members_rows),
+                "cluster_markets": [
+                    {
+                        "platform": m.get("platform", ""),
+                        "market_id": m.get("market_id", ""),
+                        "yes_price": yes,
+                        "no_price": no,
+                    }
+                    for m, (yes, no) in zip(members_rows, prices)
+                ],
+                "market_a": yes_market,
+                "market_b": no_market,
+                "similarity_score": min(float(row.get("similarity_score", 0.0)) for row in link),
                 "ai_confidence": confidence,
                 "spread": round(spread, 6),
-                "spread_pct": round(spread_pct, 6),
+                "spread_pct": round(spread * 100.0, 6),
                 "min_liquidity": round(min_liquidity, 2),
-                "direction": best_direction,
-                "economics": best,
+                "direction": "A_yes_B_no",
+                "economics": economics,
                 "score": round(score, 6),
                 "recommended_action": (
-                    f"Buy YES on {market_a['platform']} and NO on {market_b['platform']}"
-                    if best_direction == "A_yes_B_no"
-                    else f"Buy YES on {market_b['platform']} and NO on {market_a['platform']}"
+                    f"Buy YES on {yes_market['platform']} and NO on {no_market['platform']}"
                 ),
                 "verification": verification,
+                "inferred_link": len(link) > 1,
                 "time_decay_days": time_decay_days,
-                "is_time_value_spread": is_time_value_spread,
+                "is_time_value_spread": time_decay_days is not None and time_decay_days > 7,
             }
         )
 
@@ -155,16 +622,19 @@ def split_time_value_spreads(
     return safe, time_value
 
 
+def _resolution_ordinal(market: dict[str, Any]) -> int | None:
+    if isinstance(market, Market):
+        return market.resolution_ordinal
+    return date_ordinal(market.get("resolution_date", ""))
+
+
 def _time_decay_days(market_a: dict[str, Any], market_b: dict[str, Any]) -> int | None:
     """Return absolute date gap in days between market resolutions."""
-    da = str(market_a.get("resolution_date", ""))
-    db = str(market_b.get("resolution_date", ""))
-    try:
-        d1 = date.fromisoformat(da)
-        d2 = date.fromisoformat(db)
-    except ValueError:
+    d1 = _resolution_ordinal(market_a)
+    d2 = _resolution_ordinal(market_b)
+    if d1 is None or d2 is None:
         return None
-    return abs((d1 - d2).days)
+    return abs(d1 - d2)
 
 
 def select_top_opportunity(opportunities: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -174,5 +644,4 @@ def select_top_opportunity(opportunities: list[dict[str, Any]]) -> list[dict[str
 
 def save_opportunities(payload: dict[str, Any], output_path: Path) -> None:
     """Persist opportunities JSON for dashboard and agent execution."""
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    jsonio.write_json(payload, output_path)
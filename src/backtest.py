@@ -0,0 +1,395 @@
+"""Historical replay of stored market snapshots through the detection pipeline.
+
+Snapshots are JSONL records `{"timestamp": ..., "markets": [...]}` (optionally
+gzip-compressed) or cycles of a Parquet snapshot store (`src.snapshot_store`),
+streamed one at a time in time order. Each snapshot passes
+through collection, embedding, matching, verification, detection and
+reporting using the agent's own stage functions (`find_candidate_pairs`,
+`verify_clustered_pairs`, pairwise and cluster detection). Replays make no
+API calls. Embeddings come from the agent's `EmbeddingCache` file, keyed by
+model and price-free market text, so price ticks do not invalidate them.
+Verdicts are served from the LLM verdict history, then the learned verifier,
+then the hand-tuned fallback, and are cached by pair content.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+from src import jsonio
+from src.arbitrage_detector import (
+    detect_cluster_opportunities,
+    detect_opportunities,
+    select_top_opportunity,
+    split_time_value_spreads,
+)
+from src.config import Settings, load_settings
+from src.embeddings import LOCAL_EMBEDDING_MODEL, EmbeddingCache, embedding_text, find_candidate_pairs, local_vectors
+from src.event_clustering import market_key, verify_clustered_pairs
+from src.local_verifier import LearnedVerifier, load_labelled_verdicts
+from src.market_features import MarketFeatureIndex
+from src.semantic_matcher import _local_precision_fallback, verify_candidate_pairs
+from src.snapshot_store import ParquetSnapshotStore, is_snapshot_store, range_bound
+
+if TYPE_CHECKING:
+    from src.fee_schedules import FeeTable
+
+STEPS = ("collect", "embed", "match", "verify", "detect", "report")
+
+
+def append_snapshot(markets: list[dict[str, Any]], path: Path, timestamp: str | None = None) -> None:
+    """Append one collected-market snapshot to a JSONL snapshot file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    record = {"timestamp": timestamp or datetime.now(timezone.utc).isoformat(), "markets": markets}
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "at", encoding="utf-8") as handle:
+        handle.write(jsonio.dumps(record) + "\n")
+
+
+def _snapshot_files(path: Path) -> list[Path]:
+    if path.is_file():
+        return [path]
+    files = [p for p in path.iterdir() if p.name.endswith(".jsonl") or p.name.endswith(".jsonl.gz")]
+    return sorted(files)
+
+
+def iter_snapshots(
+    path: Path,
+    platforms: Iterable[str] | None = None,
+    start: str | None = None,
+    end: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield snapshots from a Parquet snapshot store, a JSONL file or a directory of files.
+
+    JSONL files are read in name order (e.g. one file per day) and are
+    expected to be time-ordered internally. Platform and time-range filters
+    are pushed down into a Parquet store; JSONL snapshots are filtered as
+    they are parsed.
+    """
+    if is_snapshot_store(path):
+        yield from ParquetSnapshotStore(path).iter_snapshots(platforms=platforms, start=start, end=end)
+        return
+    wanted = set(platforms) if platforms is not None else None
+    lower = range_bound(start, end=False)
+    upper = range_bound(end, end=True)
+    for file_path in _snapshot_files(path):
+        opener = gzip.open if file_path.suffix == ".gz" else open
+        with opener(file_path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                snapshot = jsonio.loads(line)
+                if lower is not None or upper is not None:
+                    # A snapshot whose timestamp is missing or unparseable cannot be placed in the range.
+                    try:
+                        moment = range_bound(str(snapshot.get("timestamp", "")), end=False)
+                    except ValueError:
+                        continue
+                    if (lower is not None and moment < lower) or (upper is not None and moment > upper):
+                        continue
+                if wanted is not None:
+                    markets = [m for m in snapshot.get("markets", []) if m.get("platform") in wanted]
+                    snapshot = {**snapshot, "markets": markets}
+                yield snapshot
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:24]
+
+
+def _pair_content_key(market_a: dict[str, Any], market_b: dict[str, Any]) -> str:
+    parts = []
+    for market in (market_a, market_b):
+        parts.append(
+            "\x1f".join(
+                str(market.get(field, ""))
+                for field in ("market_id", "title", "description", "resolution_date", "category")
+            )
+        )
+    parts.sort()
+    return _content_hash("\x1e".join(parts))
+
+
+class VerdictCache:
+    """Price-independent verdicts keyed by the content of both markets."""
+
+    def __init__(self, learned: LearnedVerifier | None = None, min_confidence: float = 0.95) -> None:
+        self._verdicts: dict[str, tuple[dict[str, Any], str]] = {}
+        self.learned = learned
+        self.min_confidence = min_confidence
+        self.index = MarketFeatureIndex()
+        self.hits = 0
+        self.misses = 0
+
+    def seed(self, paths: list[Path]) -> int:
+        """Load recorded LLM verdicts (verified_matches.json / verdict_history.jsonl)."""
+        rows = load_labelled_verdicts(paths)
+        for row in rows:
+            key = _pair_content_key(row["market_a"], row["market_b"])
+            self._verdicts[key] = (row["verification"], str(row.get("provider", "")))
+        return len(rows)
+
+    def verify(
+        self, market_a: dict[str, Any], market_b: dict[str, Any], similarity_score: float
+    ) -> tuple[dict[str, Any], str]:
+        """Return (verification, provider) for a pair without any API call."""
+        key = _pair_content_key(market_a, market_b)
+        cached = self._verdicts.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        if self.learned is not None:
+            result, provider = self.learned.verify(market_a, market_b, similarity_score, self.index), "local_model"
+            # No LLM is consulted in a replay, so treat indecisive results like verify_pair's offline fallback.
+            if not self.learned.is_decisive(result, self.min_confidence):
+                result = self.learned.capped(result)
+        else:
+            result = _local_precision_fallback(market_a, market_b, similarity_score, self.index)
+            provider = "local_fallback"
+        self._verdicts[key] = (result, provider)
+        return result, provider
+
+
+@dataclass
+class BacktestConfig:
+    """Pipeline parameters applied to every replayed snapshot."""
+
+    embedding_threshold: float = 0.70
+    match_threshold: float = 0.78
+    fee_rate: float = 0.01
+    slippage_rate: float = 0.005
+    gas_cost_usd: float = 0.004
+    max_verifications: int = 120
+    embedding_model: str = LOCAL_EMBEDDING_MODEL
+    use_event_clustering: bool = True
+
+
+class Backtester:
+    """Replays snapshots and accumulates per-step latency and opportunity outcomes."""
+
+    def __init__(
+        self,
+        config: BacktestConfig | None = None,
+        embeddings: EmbeddingCache | None = None,
+        verdicts: VerdictCache | None = None,
+        fee_table: FeeTable | None = None,
+        settings: Settings | None = None,
+    ):
+        self.config = config or BacktestConfig()
+        self.embeddings = embeddings if embeddings is not None else EmbeddingCache()
+        self.verdicts = verdicts if verdicts is not None else VerdictCache()
+        self.fee_table = fee_table
+        self.settings = replace(
+            settings or load_settings(), max_verification_calls_per_run=self.config.max_verifications
+        )
+        self.latencies: dict[str, list[float]] = {step: [] for step in STEPS}
+        self.outcomes: dict[str, dict[str, Any]] = {}
+        self.snapshots = 0
+        self._open: set[str] = set()
+        self._last_signature: tuple[tuple[str, str], ...] | None = None
+        self._last_pairs: list[tuple[int, int, float]] = []
+
+    def _vectors(self, texts: list[str]) -> list[list[float]]:
+        """Vectors the agent stored for config.embedding_model, else local embeddings for the whole snapshot."""
+        if self.config.embedding_model != LOCAL_EMBEDDING_MODEL:
+
+            def offline(missing: list[str]) -> list[list[float]]:
+                raise LookupError(f"{len(missing)} markets have no stored {self.config.embedding_model} vector")
+
+            try:
+                return self.embeddings.lookup(self.config.embedding_model, texts, offline)
+            except LookupError:
+                # Replays make no API calls, and vectors from two models cannot be compared.
+                pass
+        return self.embeddings.lookup(LOCAL_EMBEDDING_MODEL, texts, local_vectors)
+
+    def _candidate_pairs(self, texts: list[str], records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """`find_candidate_pairs` output, reused while the set of market texts is unchanged."""
+        signature = tuple((str(record["platform"]), text) for record, text in zip(records, texts))
+        if signature != self._last_signature:
+            pairs = find_candidate_pairs(records, threshold=self.config.embedding_threshold)
+            position = {id(record["market"]): i for i, record in enumerate(records)}
+            self._last_signature = signature
+            self._last_pairs = [
+                (position[id(pair["market_a"])], position[id(pair["market_b"])], pair["similarity_score"])
+                for pair in pairs
+            ]
+            return pairs
+        return [
+            {"similarity_score": score, "market_a": records[i]["market"], "market_b": records[j]["market"]}
+            for i, j, score in self._last_pairs
+        ]
+
+    def replay_snapshot(self, snapshot: dict[str, Any], load_seconds: float = 0.0) -> dict[str, Any]:
+        """Run one snapshot through every stage and return its step record.
+
+        load_seconds is the time spent reading and parsing the snapshot from
+        disk, which is counted as part of collection.
+        """
+        timings: dict[str, float] = {}
+        timestamp = str(snapshot.get("timestamp", ""))
+
+        started = time.perf_counter()
+        markets = [m for m in snapshot.get("markets", []) if isinstance(m, dict)]
+        timings["collect"] = load_seconds + time.perf_counter() - started
+
+        started = time.perf_counter()
+        texts = [embedding_text(market) for market in markets]
+        records = [
+            {"platform": market.get("platform"), "vector": vector, "market": market}
+            for market, vector in zip(markets, self._vectors(texts))
+        ]
+        timings["embed"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        pairs = self._candidate_pairs(texts, records)
+        timings["match"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if self.config.use_event_clustering:
+            verified, _, _ = verify_clustered_pairs(
+                pairs, self.settings, match_threshold=self.config.match_threshold, verifier=self.verdicts.verify
+            )
+        else:
+            verified, _ = verify_candidate_pairs(pairs, self.settings, verifier=self.verdicts.verify)
+        accepted = [
+            row
+            for row in verified
+            if row["verification"].get("is_match")
+            and float(row["verification"].get("confidence", 0.0)) >= self.config.match_threshold
+        ]
+        timings["verify"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        frictions = {
+            "fee_rate": self.config.fee_rate,
+            "slippage_rate": self.config.slippage_rate,
+            "gas_cost_usd": self.config.gas_cost_usd,
+            "fee_table": self.fee_table,
+        }
+        opportunities = detect_opportunities(accepted, **frictions)
+        cluster_opps = detect_cluster_opportunities(accepted, **frictions)
+        safe, time_value = split_time_value_spreads(opportunities)
+        timings["detect"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        selected = select_top_opportunity(safe)
+        self._track_outcomes(timestamp, safe)
+        timings["report"] = time.perf_counter() - started
+
+        for step, seconds in timings.items():
+            self.latencies[step].append(seconds)
+        self.snapshots += 1
+        top = selected[0] if selected else None
+        return {
+            "timestamp": timestamp,
+            "markets": len(markets),
+            "candidate_pairs": len(pairs),
+            "accepted_matches": len(accepted),
+            "opportunities": len(safe),
+            "time_value_spreads": len(time_value),
+            "cluster_opportunities": len(cluster_opps),
+            "reported": (
+                {
+                    "key": _opportunity_key(top),
+                    "score": top["score"],
+                    "net_profit": top["economics"]["net_profit"],
+                    "direction": top["direction"],
+                }
+                if top
+                else None
+            ),
+            "latency_ms": {step: round(seconds * 1000.0, 3) for step, seconds in timings.items()},
+        }
+
+    def _track_outcomes(self, timestamp: str, opportunities: list[dict[str, Any]]) -> None:
+        """Update opportunity lifetimes: first/last seen, persistence and peak economics."""
+        seen: set[str] = set()
+        for opp in opportunities:
+            key = _opportunity_key(opp)
+            seen.add(key)
+            outcome = self.outcomes.get(key)
+            if outcome is None:
+                outcome = {
+                    "key": key,
+                    "event_summary": opp.get("event_summary", ""),
+                    "first_seen": timestamp,
+                    "last_seen": timestamp,
+                    "snapshots": 0,
+                    "episodes": 0,
+                    "max_net_profit": opp["economics"]["net_profit"],
+                    "max_score": opp["score"],
+                }
+                self.outcomes[key] = outcome
+            if key not in self._open:
+                outcome["episodes"] += 1
+            outcome["last_seen"] = timestamp
+            outcome["snapshots"] += 1
+            outcome["max_net_profit"] = max(outcome["max_net_profit"], opp["economics"]["net_profit"])
+            outcome["max_score"] = max(outcome["max_score"], opp["score"])
+        self._open = seen
+
+    def run(
+        self, snapshots: Iterable[dict[str, Any]], steps_path: Path | None = None, limit: int | None = None
+    ) -> dict[str, Any]:
+        """Replay snapshots in order, optionally streaming step records to JSONL."""
+        started = time.perf_counter()
+        handle = None
+        if steps_path is not None:
+            steps_path.parent.mkdir(parents=True, exist_ok=True)
+            handle = steps_path.open("w", encoding="utf-8")
+        try:
+            iterator = iter(snapshots)
+            while limit is None or self.snapshots < limit:
+                load_started = time.perf_counter()
+                snapshot = next(iterator, None)
+                if snapshot is None:
+                    break
+                record = self.replay_snapshot(snapshot, time.perf_counter() - load_started)
+                if handle is not None:
+                    handle.write(jsonio.dumps(record) + "\n")
+        finally:
+            if handle is not None:
+                handle.close()
+        return self.summary(time.perf_counter() - started)
+
+    def summary(self, wall_seconds: float = 0.0) -> dict[str, Any]:
+        """Latency percentiles per step, cache effectiveness and opportunity outcomes."""
+        outcomes = sorted(self.outcomes.values(), key=lambda o: (o["snapshots"], o["max_score"]), reverse=True)
+        return {
+            "snapshots": self.snapshots,
+            "wall_seconds": round(wall_seconds, 3),
+            "latency_ms": {step: _latency_stats(values) for step, values in self.latencies.items()},
+            "embedding_cache": {"hits": self.embeddings.hits, "misses": self.embeddings.misses},
+            "verdict_cache": {"hits": self.verdicts.hits, "misses": self.verdicts.misses},
+            "distinct_opportunities": len(outcomes),
+            "opportunity_outcomes": outcomes,
+        }
+
+
+def _opportunity_key(opp: dict[str, Any]) -> str:
+    return f"{market_key(opp['market_a'])}|{market_key(opp['market_b'])}"
+
+
+def _latency_stats(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0, "total": 0.0}
+    ordered = sorted(values)
+
+    def pct(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "mean": round(sum(ordered) / len(ordered) * 1000.0, 3),
+        "p50": round(pct(0.50) * 1000.0, 3),
+        "p95": round(pct(0.95) * 1000.0, 3),
+        "max": round(ordered[-1] * 1000.0, 3),
+        "total": round(sum(ordered) * 1000.0, 3),
+    }
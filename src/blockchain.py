@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from src import jsonio
 from src.config import Settings
 
 
@@ -39,7 +39,7 @@ class NetworkConfig:
 
 def load_contract_artifact(artifact_path: Path) -> dict[str, Any]:
     """Load compiled contract artifact JSON containing ABI/bytecode."""
-    return json.loads(artifact_path.read_text(encoding="utf-8"))
+    return jsonio.read_json(artifact_path)
 
 
 class ArbSenseChainClient:
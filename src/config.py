@@ -31,7 +31,15 @@ class Settings:
     max_embedding_inputs_per_run: int
     max_verification_calls_per_run: int
     max_usd_budget_per_run: float
+    learned_verifier_confidence: float
     data_dir: Path
+    # Connector push-down filters; empty / 0 disables them.
+    market_categories: tuple[str, ...] = ()
+    max_resolution_days: int = 0
+    # Shared connector HTTP client (src/connectors/http.py).
+    connector_timeout_seconds: float = 10.0
+    connector_max_retries: int = 3
+    connector_backoff_seconds: float = 0.25
 
 
 def load_settings() -> Settings:
@@ -62,5 +70,11 @@ def load_settings() -> Settings:
             os.getenv("MAX_VERIFICATION_CALLS_PER_RUN", "120")
         ),
         max_usd_budget_per_run=float(os.getenv("MAX_USD_BUDGET_PER_RUN", "3.0")),
+        learned_verifier_confidence=float(os.getenv("LEARNED_VERIFIER_CONFIDENCE", "0.95")),
         data_dir=data_dir,
+        market_categories=tuple(c.strip().lower() for c in os.getenv("MARKET_CATEGORIES", "").split(",") if c.strip()),
+        max_resolution_days=int(os.getenv("MAX_RESOLUTION_DAYS", "0")),
+        connector_timeout_seconds=float(os.getenv("CONNECTOR_TIMEOUT_SECONDS", "10")),
+        connector_max_retries=int(os.getenv("CONNECTOR_MAX_RETRIES", "3")),
+        connector_backoff_seconds=float(os.getenv("CONNECTOR_BACKOFF_SECONDS", "0.25")),
     )
@@ -1 +1 @@
-"""Live market data connectors for Polymarket and Kalshi."""
+"""Live market data connectors (Polymarket, Kalshi, declarative listings) and their registry."""
@@ -0,0 +1,65 @@
+"""Market filter predicates that connectors apply to raw items before normalization.
+
+Connectors read the few raw fields a `MarketFilter` needs (per-side
+liquidity, category, resolution date, outcome count) and skip rejected items
+before JSON-decoding outcome lists, building titles or allocating the
+normalized dict. Bounded fetches count only qualifying markets, so pagination
+stops as soon as enough are found.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Iterable
+
+
+@dataclass(frozen=True)
+class MarketFilter:
+    """Predicates on normalized-equivalent fields; None/empty disables a predicate."""
+
+    # Minimum liquidity on each side, as in `filter_by_min_liquidity`.
+    min_liquidity: float = 0.0
+    # Normalized (lower-case ArbSense) category names to keep.
+    categories: frozenset[str] | None = None
+    # Latest accepted resolution date, ISO YYYY-MM-DD.
+    resolves_by: str | None = None
+    # Drop multi-outcome and scalar markets on their raw outcome fields.
+    binary_only: bool = True
+
+    @classmethod
+    def build(
+        cls,
+        min_liquidity: float = 0.0,
+        categories: Iterable[str] | None = None,
+        horizon_days: int | None = None,
+        binary_only: bool = True,
+        today: date | None = None,
+    ) -> MarketFilter:
+        """Build from settings-style values; horizon_days counts from today."""
+        wanted = frozenset(c.strip().lower() for c in categories or () if c.strip()) or None
+        resolves_by = None
+        if horizon_days:
+            resolves_by = ((today or date.today()) + timedelta(days=horizon_days)).isoformat()
+        return cls(min_liquidity=min_liquidity, categories=wanted, resolves_by=resolves_by, binary_only=binary_only)
+
+    def accepts(self, side_liquidity: float, category: str, resolution_date: str) -> bool:
+        """Check raw-derived fields; resolution_date is compared as an ISO string."""
+        if side_liquidity < self.min_liquidity:
+            return False
+        if self.categories is not None and category not in self.categories:
+            return False
+        if self.resolves_by is not None and resolution_date[:10] > self.resolves_by:
+            return False
+        return True
+
+    def accepts_category(self, category: str) -> bool:
+        return self.categories is None or category in self.categories
+
+    def accepts_market(self, market: dict[str, Any]) -> bool:
+        """Same predicates on an already-normalized market."""
+        outcomes = market.get("outcomes", [])
+        if len(outcomes) < 2 or (self.binary_only and len(outcomes) != 2):
+            return False
+        side_liquidity = min(float(outcomes[0]["liquidity"]), float(outcomes[1]["liquidity"]))
+        return self.accepts(side_liquidity, str(market.get("category", "")), str(market.get("resolution_date", "")))
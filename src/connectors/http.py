@@ -0,0 +1,371 @@
+"""Shared HTTP layer for connectors: pooled sessions, retries and per-host metrics.
+
+Each host gets its own keep-alive `requests.Session`, so repeated calls reuse
+TCP/TLS connections. Connection errors, timeouts, 429 and 5xx responses are
+retried with jittered exponential backoff. The retry budget is shared by all
+hosts and caps retries at a fraction of recent requests, so an outage does
+not multiply load. Latency, status and retry counts are tracked per host.
+
+Hosts can be given a token-bucket rate and a concurrency cap; every attempt,
+retries included, waits for a token and a free slot before it is sent.
+
+Conditional GETs remember each response's ETag / Last-Modified validators and
+parsed body; a 304 reply returns the cached body without re-downloading it.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Any
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from src import jsonio
+from src.config import Settings, load_settings
+from src.fixtures import FixtureMiss, active_fixtures, through_fixtures
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Response headers kept in recorded fixtures.
+_FIXTURE_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After")
+
+
+def _response_to_fixture(response: requests.Response) -> dict[str, Any]:
+    return {
+        "status": response.status_code,
+        "headers": {name: response.headers[name] for name in _FIXTURE_HEADERS if name in response.headers},
+        "body": response.text,
+        "url": response.url,
+    }
+
+
+def _response_from_fixture(recorded: dict[str, Any]) -> requests.Response:
+    response = requests.Response()
+    response.status_code = int(recorded["status"])
+    response.headers = CaseInsensitiveDict(recorded.get("headers", {}))
+    response._content = str(recorded.get("body", "")).encode("utf-8")
+    response.encoding = "utf-8"
+    response.url = str(recorded.get("url", ""))
+    return response
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` tokens per second."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available; return the time waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+                delay = (1.0 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class HostLimits:
+    """Rate and concurrency limits applied to one host."""
+
+    def __init__(self, rate_per_second: float, burst: int, max_concurrency: int):
+        self.settings = (rate_per_second, burst, max_concurrency)
+        self.bucket = TokenBucket(rate_per_second, burst) if rate_per_second > 0 else None
+        self.slots = threading.BoundedSemaphore(max(1, max_concurrency))
+
+
+class HostMetrics:
+    """Counters for one host; guarded by the owning client's lock."""
+
+    __slots__ = (
+        "requests",
+        "errors",
+        "retries",
+        "status_counts",
+        "latency_total",
+        "latency_max",
+        "throttled_seconds",
+    )
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.status_counts: dict[str, int] = {}
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.throttled_seconds = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize counters with mean/max latency in milliseconds."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "status_counts": dict(self.status_counts),
+            "latency_mean_ms": round(self.latency_total / self.requests * 1000.0, 3) if self.requests else 0.0,
+            "latency_max_ms": round(self.latency_max * 1000.0, 3),
+            "throttled_seconds": round(self.throttled_seconds, 3),
+        }
+
+
+class ConnectorHTTP:
+    """Pooled, retrying HTTP client shared by all connectors."""
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.25,
+        backoff_max: float = 4.0,
+        retry_budget_ratio: float = 0.2,
+        min_retry_budget: int = 10,
+        budget_window_seconds: float = 60.0,
+        pool_maxsize: int = 16,
+    ):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_budget_ratio = retry_budget_ratio
+        self.min_retry_budget = min_retry_budget
+        self.budget_window_seconds = budget_window_seconds
+        self.pool_maxsize = pool_maxsize
+        self._sessions: dict[str, requests.Session] = {}
+        self._metrics: dict[str, HostMetrics] = {}
+        self._lock = threading.Lock()
+        self._budget_requests = 0
+        self._budget_retries = 0
+        self._budget_started = time.monotonic()
+        self._validators: dict[str, tuple[dict[str, str], Any]] = {}
+        self._limits: dict[str, HostLimits] = {}
+
+    def _session(self, host: str) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+                self._metrics[host] = HostMetrics()
+            return session
+
+    def set_host_limits(self, host: str, rate_per_second: float, burst: int = 1, max_concurrency: int = 8) -> None:
+        """Pace requests to host; a rate of 0 only caps concurrency. Re-applying the same limits is a no-op."""
+        with self._lock:
+            current = self._limits.get(host)
+            if current is None or current.settings != (rate_per_second, burst, max_concurrency):
+                self._limits[host] = HostLimits(rate_per_second, burst, max_concurrency)
+
+    def _take_retry(self) -> bool:
+        """Spend one retry from the shared budget, if any is left."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._budget_started > self.budget_window_seconds:
+                self._budget_requests = 0
+                self._budget_retries = 0
+                self._budget_started = now
+            allowed = max(self.min_retry_budget, int(self._budget_requests * self.retry_budget_ratio))
+            if self._budget_retries >= allowed:
+                return False
+            self._budget_retries += 1
+            return True
+
+    def _backoff(self, attempt: int, response: requests.Response | None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(self.backoff_max, float(retry_after))
+        # Full jitter keeps concurrent retries from synchronizing.
+        return random.uniform(0.0, min(self.backoff_max, self.backoff_base * (2**attempt)))
+
+    def _record(self, host: str, elapsed: float, status: str, error: bool, retried: bool) -> None:
+        with self._lock:
+            metrics = self._metrics[host]
+            metrics.requests += 1
+            metrics.latency_total += elapsed
+            metrics.latency_max = max(metrics.latency_max, elapsed)
+            metrics.status_counts[status] = metrics.status_counts.get(status, 0) + 1
+            if error:
+                metrics.errors += 1
+            if retried:
+                metrics.retries += 1
+            self._budget_requests += 1
+
+    def get(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> requests.Response:
+        """GET with pooling and retries; returns the final response or raises the last error.
+
+        With an active fixture store, responses are recorded, or replayed
+        without touching the network (a missing recording raises ConnectionError).
+        """
+        if active_fixtures() is None:
+            return self._get_live(url, params, headers, timeout)
+        request = {"url": url, "params": params or {}}
+        try:
+            recorded = through_fixtures(
+                "http", request, lambda: _response_to_fixture(self._get_live(url, params, headers, timeout))
+            )
+        except FixtureMiss as exc:
+            raise requests.ConnectionError(str(exc)) from exc
+        return _response_from_fixture(recorded)
+
+    def _get_live(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        headers: dict[str, str] | None,
+        timeout: float | None,
+    ) -> requests.Response:
+        host = urlparse(url).netloc
+        session = self._session(host)
+        limits = self._limits.get(host)
+        attempt = 0
+        while True:
+            response: requests.Response | None = None
+            failure: Exception | None = None
+            if limits is not None:
+                limits.slots.acquire()
+            try:
+                if limits is not None and limits.bucket is not None:
+                    waited = limits.bucket.acquire()
+                    if waited:
+                        with self._lock:
+                            self._metrics[host].throttled_seconds += waited
+                started = time.perf_counter()
+                try:
+                    response = session.get(url, params=params, headers=headers, timeout=timeout or self.timeout)
+                except (requests.ConnectionError, requests.Timeout) as exc:
+                    failure = exc
+                    status = type(exc).__name__
+                else:
+                    status = str(response.status_code)
+                elapsed = time.perf_counter() - started
+            finally:
+                if limits is not None:
+                    limits.slots.release()
+            retryable = failure is not None or (response is not None and response.status_code in RETRY_STATUSES)
+            will_retry = retryable and attempt < self.max_retries and self._take_retry()
+            self._record(host, elapsed, status, error=retryable, retried=will_retry)
+            if not will_retry:
+                if failure is not None:
+                    raise failure
+                return response  # type: ignore[return-value]
+            delay = self._backoff(attempt, response)
+            if response is not None:
+                # Release the pooled connection before sleeping; nobody reads a retried body.
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def get_json_conditional(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> tuple[Any, bool]:
+        """GET and parse JSON, revalidating against the last response for this request.
+
+        Returns (payload, modified); modified is False when the server answered
+        304 and the cached payload was reused.
+        """
+        key = requests.Request("GET", url, params=params).prepare().url or url
+        with self._lock:
+            cached = self._validators.get(key)
+        request_headers = dict(headers or {})
+        if cached is not None:
+            request_headers.update(cached[0])
+        response = self.get(url, params=params, headers=request_headers, timeout=timeout)
+        if response.status_code == 304 and cached is not None:
+            return cached[1], False
+        response.raise_for_status()
+        payload = jsonio.response_json(response)
+        validators: dict[str, str] = {}
+        if response.headers.get("ETag"):
+            validators["If-None-Match"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = response.headers["Last-Modified"]
+        with self._lock:
+            if validators:
+                self._validators[key] = (validators, payload)
+            else:
+                self._validators.pop(key, None)
+        return payload, True
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """Per-host latency, status, error and retry counters."""
+        with self._lock:
+            return {host: metrics.to_dict() for host, metrics in self._metrics.items()}
+
+    def reset_metrics(self) -> None:
+        """Clear per-host counters and the retry budget window."""
+        with self._lock:
+            for host in self._metrics:
+                self._metrics[host] = HostMetrics()
+            self._budget_requests = 0
+            self._budget_retries = 0
+            self._budget_started = time.monotonic()
+
+
+_CLIENT: ConnectorHTTP | None = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_client(settings: Settings | None = None) -> ConnectorHTTP:
+    """Return the process-wide connector client.
+
+    It is built on first use from settings (or `load_settings()`); later
+    calls return the same client.
+    """
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            settings = settings or load_settings()
+            _CLIENT = ConnectorHTTP(
+                timeout=settings.connector_timeout_seconds,
+                max_retries=settings.connector_max_retries,
+                backoff_base=settings.connector_backoff_seconds,
+            )
+        return _CLIENT
+
+
+def http_get(
+    url: str,
+    params: dict[str, Any] | None = None,
+    headers: dict[str, str] | None = None,
+    timeout: float | None = None,
+) -> requests.Response:
+    """GET through the shared connector client."""
+    return get_client().get(url, params=params, headers=headers, timeout=timeout)
+
+
+def http_get_json_conditional(
+    url: str,
+    params: dict[str, Any] | None = None,
+    headers: dict[str, str] | None = None,
+    timeout: float | None = None,
+) -> tuple[Any, bool]:
+    """Conditional JSON GET through the shared connector client."""
+    return get_client().get_json_conditional(url, params=params, headers=headers, timeout=timeout)
@@ -11,9 +11,12 @@ Endpoints used:
 from __future__ import annotations
 
 import logging
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator
 
-import requests
+from src import jsonio
+from src.connectors.filters import MarketFilter
+from src.connectors.http import http_get, http_get_json_conditional
 
 logger = logging.getLogger(__name__)
 
@@ -46,14 +49,8 @@ def _category_map(raw: str) -> str:
     return "general"
 
 
-def _normalize_market(m: dict[str, Any], event_title: str, event_category: str) -> dict[str, Any] | None:
-    """Normalize a single Kalshi market to ArbSense schema."""
-    ticker = m.get("ticker", "")
-
-    # Skip parlay/combo markets
-    if ticker.startswith("KXMVE"):
-        return None
-
+def _extract_prices(m: dict[str, Any]) -> tuple[float, float]:
+    """Return (yes_price, no_price) in dollars from a raw Kalshi market."""
     # Kalshi prices are in cents (0-100)
     yes_bid = _safe_float(m.get("yes_bid", 0)) / 100.0
     yes_ask = _safe_float(m.get("yes_ask", 0)) / 100.0
@@ -61,22 +58,50 @@ def _normalize_market(m: dict[str, Any], event_title: str, event_category: str)
 
     yes_price = last_price if last_price > 0 else (yes_bid + yes_ask) / 2.0 if (yes_bid + yes_ask) > 0 else 0.0
     no_price = 1.0 - yes_price if yes_price > 0 else 0.0
+    return yes_price, no_price
 
-    if yes_price <= 0 and no_price <= 0:
-        return None
 
+def _liquidity(m: dict[str, Any]) -> float:
     volume = _safe_float(m.get("volume", 0))
     open_interest = _safe_float(m.get("open_interest", 0))
-    liquidity_est = max(volume * 0.5, open_interest * 5, 3000)
+    return max(volume * 0.5, open_interest * 5, 3000)
 
-    title = str(m.get("title", event_title))
-    subtitle = str(m.get("subtitle", ""))
-    if subtitle and subtitle != title:
-        title = f"{title} — {subtitle}" if len(title) < 40 else title
 
+def _resolution_date(m: dict[str, Any]) -> str:
     end_date = str(m.get("close_time", m.get("expiration_time", "")))
     if end_date and "T" in end_date:
         end_date = end_date.split("T")[0]
+    return end_date or "2026-12-31"
+
+
+def normalize_market(
+    m: dict[str, Any], event_title: str, event_category: str, market_filter: MarketFilter | None = None
+) -> dict[str, Any] | None:
+    """Normalize a single Kalshi market to ArbSense schema; None if unusable or filtered out."""
+    ticker = m.get("ticker", "")
+
+    # Skip parlay/combo markets
+    if ticker.startswith("KXMVE"):
+        return None
+
+    liquidity_est = _liquidity(m)
+    if market_filter is not None:
+        if market_filter.binary_only and m.get("market_type", "binary") != "binary":
+            return None
+        if not market_filter.accepts(
+            round(liquidity_est / 2), _category_map(event_category), _resolution_date(m)
+        ):
+            return None
+
+    yes_price, no_price = _extract_prices(m)
+
+    if yes_price <= 0 and no_price <= 0:
+        return None
+
+    title = str(m.get("title", event_title))
+    subtitle = str(m.get("subtitle", ""))
+    if subtitle and subtitle != title:
+        title = f"{title} — {subtitle}" if len(title) < 40 else title
 
     if not title:
         return None
@@ -84,20 +109,42 @@ def _normalize_market(m: dict[str, Any], event_title: str, event_category: str)
     return {
         "platform": "Kalshi",
         "market_id": f"kalshi-{ticker[:24]}",
+        "source_id": ticker,
         "title": title,
         "description": str(m.get("rules_primary", title))[:300],
         "outcomes": [
             {"name": "Yes", "price": round(yes_price, 4), "liquidity": round(liquidity_est / 2)},
             {"name": "No", "price": round(no_price, 4), "liquidity": round(liquidity_est / 2)},
         ],
-        "resolution_date": end_date or "2026-12-31",
+        "resolution_date": _resolution_date(m),
         "category": _category_map(event_category),
     }
 
 
-def fetch_kalshi_markets(limit: int = 30) -> list[dict[str, Any]]:
+def _fetch_series_markets(series_ticker: str) -> list[dict[str, Any]]:
+    """Fetch open raw markets for one series; returns [] on failure."""
+    try:
+        payload, _ = http_get_json_conditional(
+            f"{KALSHI_API}/markets",
+            params={"limit": 10, "series_ticker": series_ticker, "status": "open"},
+            headers=_HEADERS,
+        )
+        return payload.get("markets", [])
+    except Exception:
+        return []
+
+
+def fetch_kalshi_markets(
+    limit: int = 30, series_concurrency: int = 8, market_filter: MarketFilter | None = None
+) -> list[dict[str, Any]]:
     """Fetch active markets from Kalshi via the events discovery endpoint.
 
+    Per-series fallback requests are fanned out in waves of at most
+    series_concurrency parallel requests; results are merged in event order,
+    so the output matches a sequential fetch. Events outside market_filter's
+    categories are skipped whole, including their series requests, and only
+    qualifying markets count towards limit.
+
     Returns normalized ArbSense market dicts.
     """
     markets: list[dict[str, Any]] = []
@@ -105,17 +152,18 @@ def fetch_kalshi_markets(limit: int = 30) -> list[dict[str, Any]]:
 
     # Step 1: Fetch events (which contain series tickers)
     try:
-        resp = requests.get(
+        payload, _ = http_get_json_conditional(
             f"{KALSHI_API}/events",
             params={"limit": 100, "status": "open", "with_nested_markets": "true"},
             headers=_HEADERS,
             timeout=15,
         )
-        resp.raise_for_status()
-        events = resp.json().get("events", [])
+        events = payload.get("events", [])
     except Exception as exc:
         logger.warning("Kalshi events API failed: %s", exc)
         return []
+    if market_filter is not None:
+        events = [e for e in events if market_filter.accepts_category(_category_map(e.get("category", "")))]
 
     # Step 2: Collect nested markets from events
     for event in events:
@@ -128,7 +176,7 @@ def fetch_kalshi_markets(limit: int = 30) -> list[dict[str, Any]]:
                 continue
             seen_tickers.add(ticker)
 
-            normalized = _normalize_market(raw_market, event_title, event_category)
+            normalized = normalize_market(raw_market, event_title, event_category, market_filter)
             if normalized:
                 markets.append(normalized)
 
@@ -136,33 +184,116 @@ def fetch_kalshi_markets(limit: int = 30) -> list[dict[str, Any]]:
             break
 
     # Step 3: Fetch more markets by series if we need more
-    if len(markets) < limit:
-        for event in events:
-            series_ticker = event.get("series_ticker", "")
-            if not series_ticker:
-                continue
-            try:
-                resp2 = requests.get(
-                    f"{KALSHI_API}/markets",
-                    params={"limit": 10, "series_ticker": series_ticker, "status": "open"},
-                    headers=_HEADERS,
-                    timeout=10,
-                )
-                for raw_market in resp2.json().get("markets", []):
-                    ticker = raw_market.get("ticker", "")
-                    if ticker in seen_tickers:
-                        continue
-                    seen_tickers.add(ticker)
-
-                    normalized = _normalize_market(raw_market, event.get("title", ""), event.get("category", ""))
-                    if normalized:
-                        markets.append(normalized)
-            except Exception:
-                continue
-
-            if len(markets) >= limit:
-                break
+    series_events = [event for event in events if event.get("series_ticker", "")]
+    wave = max(1, series_concurrency)
+    if len(markets) < limit and series_events:
+        with ThreadPoolExecutor(max_workers=min(wave, len(series_events))) as pool:
+            for start in range(0, len(series_events), wave):
+                batch = series_events[start : start + wave]
+                results = pool.map(_fetch_series_markets, [event["series_ticker"] for event in batch])
+                for event, raw_markets in zip(batch, results):
+                    for raw_market in raw_markets:
+                        ticker = raw_market.get("ticker", "")
+                        if ticker in seen_tickers:
+                            continue
+                        seen_tickers.add(ticker)
+
+                        normalized = normalize_market(
+                            raw_market, event.get("title", ""), event.get("category", ""), market_filter
+                        )
+                        if normalized:
+                            markets.append(normalized)
+                    if len(markets) >= limit:
+                        break
+                if len(markets) >= limit:
+                    break
 
     markets = markets[:limit]
     logger.info("Kalshi: fetched %d markets", len(markets))
     return markets
+
+
+def iter_kalshi_markets(
+    page_size: int = 200, max_pages: int | None = None, market_filter: MarketFilter | None = None
+) -> Iterator[dict[str, Any]]:
+    """Stream normalized markets across every open Kalshi event.
+
+    Follows the events endpoint `cursor` until it comes back empty, fetching
+    each page only when the consumer has drained the previous one. Events and
+    markets rejected by market_filter are skipped before normalization.
+    """
+    cursor = ""
+    pages = 0
+    seen_tickers: set[str] = set()
+    while True:
+        params: dict[str, Any] = {"limit": page_size, "status": "open", "with_nested_markets": "true"}
+        if cursor:
+            params["cursor"] = cursor
+        try:
+            resp = http_get(f"{KALSHI_API}/events", params=params, headers=_HEADERS, timeout=15)
+            resp.raise_for_status()
+            payload = jsonio.response_json(resp)
+        except Exception as exc:
+            logger.warning("Kalshi events pagination stopped after %d pages: %s", pages, exc)
+            return
+
+        for event in payload.get("events", []):
+            if market_filter is not None and not market_filter.accepts_category(
+                _category_map(event.get("category", ""))
+            ):
+                continue
+            for raw_market in event.get("markets", []) or []:
+                ticker = raw_market.get("ticker", "")
+                if ticker in seen_tickers:
+                    continue
+                seen_tickers.add(ticker)
+                normalized = normalize_market(
+                    raw_market, event.get("title", ""), event.get("category", ""), market_filter
+                )
+                if normalized:
+                    yield normalized
+
+        pages += 1
+        cursor = str(payload.get("cursor", "") or "")
+        if not cursor or (max_pages is not None and pages >= max_pages):
+            return
+
+
+def fetch_kalshi_prices(tickers: list[str]) -> dict[str, tuple[float, float]]:
+    """Fetch current (yes, no) prices for known tickers in batches."""
+    prices: dict[str, tuple[float, float]] = {}
+    for start in range(0, len(tickers), 50):
+        chunk = tickers[start : start + 50]
+        try:
+            resp = http_get(
+                f"{KALSHI_API}/markets",
+                params={"tickers": ",".join(chunk), "limit": len(chunk)},
+                headers=_HEADERS,
+            )
+            resp.raise_for_status()
+            rows = jsonio.response_json(resp).get("markets", [])
+        except Exception as exc:
+            logger.warning("Kalshi price refresh failed: %s", exc)
+            continue
+        for raw_market in rows:
+            ticker = str(raw_market.get("ticker", ""))
+            if ticker in chunk:
+                prices[ticker] = _extract_prices(raw_market)
+    return prices
+
+
+def fetch_kalshi_orderbook(ticker: str) -> dict[str, list[list[float]]]:
+    """Fetch a market's order book as YES/NO ask ladders in dollars.
+
+    Kalshi publishes resting bids only; a NO bid at p cents is a YES ask at
+    (100 - p) cents and vice versa.
+    """
+    resp = http_get(f"{KALSHI_API}/markets/{ticker}/orderbook", headers=_HEADERS)
+    resp.raise_for_status()
+    raw = jsonio.response_json(resp).get("orderbook", {}) or {}
+    yes_bids = raw.get("yes") or []
+    no_bids = raw.get("no") or []
+    return {
+        "yes": sorted([(100.0 - _safe_float(price)) / 100.0, _safe_float(qty)] for price, qty in no_bids),
+        "no": sorted([(100.0 - _safe_float(price)) / 100.0, _safe_float(qty)] for price, qty in yes_bids),
+    }
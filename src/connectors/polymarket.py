@@ -11,9 +11,11 @@ Endpoints used:
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import Any, Iterator
 
-import requests
+from src import jsonio
+from src.connectors.filters import MarketFilter
+from src.connectors.http import http_get, http_get_json_conditional
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,9 @@ _GAMMA_PARAMS: dict[str, Any] = {
     "ascending": False,
 }
 
+# Gamma pages a filtered cycle fetch may read while looking for qualifying markets.
+_MAX_FILTERED_PAGES = 10
+
 # Tags / categories likely to overlap with Kalshi
 _PRIORITY_KEYWORDS = [
     "iran", "fed", "interest rate", "trump", "pope", "mars",
@@ -46,32 +51,144 @@ def _safe_float(val: Any, default: float = 0.0) -> float:
         return default
 
 
-def fetch_polymarket_markets(limit: int = 30) -> list[dict[str, Any]]:
+def _extract_prices(item: dict[str, Any]) -> tuple[float, float]:
+    """Return (yes_price, no_price) from CLOB tokens or Gamma outcomePrices."""
+    tokens = item.get("tokens", [])
+    outcome_prices = item.get("outcomePrices", item.get("outcome_prices", []))
+    if isinstance(outcome_prices, str):
+        try:
+            outcome_prices = jsonio.loads(outcome_prices)
+        except Exception:
+            outcome_prices = []
+
+    yes_price = 0.5
+    no_price = 0.5
+
+    if tokens and len(tokens) >= 2:
+        yes_price = _safe_float(tokens[0].get("price", 0.5), 0.5)
+        no_price = _safe_float(tokens[1].get("price", 0.5), 0.5)
+    elif outcome_prices and len(outcome_prices) >= 2:
+        yes_price = _safe_float(outcome_prices[0], 0.5)
+        no_price = _safe_float(outcome_prices[1], 0.5)
+    return yes_price, no_price
+
+
+def _extract_token_ids(item: dict[str, Any]) -> list[str]:
+    """Return [yes_token_id, no_token_id] for CLOB order-book lookups, when known."""
+    tokens = item.get("tokens", [])
+    if tokens and len(tokens) >= 2:
+        return [str(tokens[0].get("token_id", "")), str(tokens[1].get("token_id", ""))]
+    token_ids = item.get("clobTokenIds", [])
+    if isinstance(token_ids, str):
+        try:
+            token_ids = jsonio.loads(token_ids)
+        except Exception:
+            token_ids = []
+    return [str(t) for t in token_ids[:2]] if len(token_ids) >= 2 else []
+
+
+def _liquidity(item: dict[str, Any]) -> float:
+    volume = _safe_float(item.get("volume", item.get("volume24hr", 0)))
+    return _safe_float(item.get("liquidity", volume / 2 if volume else 5000))
+
+
+def _resolution_date(item: dict[str, Any]) -> str:
+    end_date = str(item.get("end_date_iso", item.get("endDate", item.get("resolution_date", ""))))
+    # Normalize date to YYYY-MM-DD
+    if end_date and "T" in end_date:
+        end_date = end_date.split("T")[0]
+    return end_date or "2025-12-31"
+
+
+def _category(item: dict[str, Any]) -> str:
+    category = str(item.get("category", item.get("groupItemTitle", "general"))).lower()
+    return category if category else "general"
+
+
+def normalize_market(item: Any, market_filter: MarketFilter | None = None) -> dict[str, Any] | None:
+    """Normalize one Gamma or CLOB market to ArbSense schema; None if unusable or filtered out.
+
+    The filter runs on raw liquidity, category and end date before outcome
+    strings are decoded.
+    """
+    if not isinstance(item, dict):
+        return None
+    if market_filter is not None and not market_filter.accepts(
+        round(_liquidity(item) / 2), _category(item), _resolution_date(item)
+    ):
+        return None
+
+    # Skip non-binary or inactive markets; CLOB rows carry outcomes on their tokens
+    outcomes = item.get("outcomes") or [t.get("outcome", "") for t in item.get("tokens", []) if isinstance(t, dict)]
+    if isinstance(outcomes, str):
+        # Gamma API returns outcomes as JSON string sometimes
+        try:
+            outcomes = jsonio.loads(outcomes)
+        except Exception:
+            outcomes = ["Yes", "No"]
+
+    if len(outcomes) != 2:
+        return None
+
+    yes_price, no_price = _extract_prices(item)
+
+    # Skip markets with no real price data
+    if yes_price == 0 and no_price == 0:
+        return None
+
+    liquidity = _liquidity(item)
+
+    title = str(item.get("question", item.get("title", "")))
+    description = str(item.get("description", title))
+    market_id = str(item.get("condition_id", item.get("id", item.get("slug", ""))))
+
+    if not title:
+        return None
+
+    return {
+        "platform": "Polymarket",
+        "market_id": f"poly-{market_id[:20]}",
+        "source_id": market_id,
+        "token_ids": _extract_token_ids(item),
+        "title": title,
+        "description": description[:300],
+        "outcomes": [
+            {"name": "Yes", "price": round(yes_price, 4), "liquidity": round(liquidity / 2)},
+            {"name": "No", "price": round(no_price, 4), "liquidity": round(liquidity / 2)},
+        ],
+        "resolution_date": _resolution_date(item),
+        "category": _category(item),
+    }
+
+
+def fetch_polymarket_markets(limit: int = 30, market_filter: MarketFilter | None = None) -> list[dict[str, Any]]:
     """Fetch active binary markets from Polymarket Gamma API.
 
+    With a market_filter, rejected items are skipped before normalization and
+    further Gamma pages are requested until enough markets qualify.
+
     Returns normalized ArbSense market dicts.
     """
     markets: list[dict[str, Any]] = []
+    page_size = min(limit * 2, 100)
 
     try:
-        resp = requests.get(
+        raw_markets, _ = http_get_json_conditional(
             f"{GAMMA_API}/markets",
-            params={**_GAMMA_PARAMS, "limit": min(limit * 2, 100)},
+            params={**_GAMMA_PARAMS, "limit": page_size},
             timeout=15,
         )
-        resp.raise_for_status()
-        raw_markets = resp.json()
     except Exception as exc:
         logger.warning("Polymarket Gamma API fetch failed: %s", exc)
         # Fallback to CLOB API
         try:
-            resp = requests.get(
+            resp = http_get(
                 f"{CLOB_API}/markets",
                 params={"next_cursor": "MA=="},
                 timeout=15,
             )
             resp.raise_for_status()
-            data = resp.json()
+            data = jsonio.response_json(resp)
             raw_markets = data.get("data", data) if isinstance(data, dict) else data
         except Exception as exc2:
             logger.error("Polymarket CLOB API also failed: %s", exc2)
@@ -80,79 +197,38 @@ def fetch_polymarket_markets(limit: int = 30) -> list[dict[str, Any]]:
     if not isinstance(raw_markets, list):
         raw_markets = raw_markets.get("data", []) if isinstance(raw_markets, dict) else []
 
-    for item in raw_markets:
-        if not isinstance(item, dict):
-            continue
-
-        # Skip non-binary or inactive markets
-        outcomes = item.get("outcomes", [])
-        if isinstance(outcomes, str):
-            # Gamma API returns outcomes as JSON string sometimes
-            import json
-            try:
-                outcomes = json.loads(outcomes)
-            except Exception:
-                outcomes = ["Yes", "No"]
-
-        if len(outcomes) != 2:
-            continue
-
-        # Extract prices from tokens or outcome_prices
-        tokens = item.get("tokens", [])
-        outcome_prices = item.get("outcomePrices", item.get("outcome_prices", []))
-        if isinstance(outcome_prices, str):
-            import json
-            try:
-                outcome_prices = json.loads(outcome_prices)
-            except Exception:
-                outcome_prices = []
-
-        yes_price = 0.5
-        no_price = 0.5
-
-        if tokens and len(tokens) >= 2:
-            yes_price = _safe_float(tokens[0].get("price", 0.5), 0.5)
-            no_price = _safe_float(tokens[1].get("price", 0.5), 0.5)
-        elif outcome_prices and len(outcome_prices) >= 2:
-            yes_price = _safe_float(outcome_prices[0], 0.5)
-            no_price = _safe_float(outcome_prices[1], 0.5)
-
-        # Skip markets with no real price data
-        if yes_price == 0 and no_price == 0:
-            continue
-
-        volume = _safe_float(item.get("volume", item.get("volume24hr", 0)))
-        liquidity = _safe_float(item.get("liquidity", volume / 2 if volume else 5000))
-
-        title = str(item.get("question", item.get("title", "")))
-        description = str(item.get("description", title))
-        end_date = str(item.get("end_date_iso", item.get("endDate", item.get("resolution_date", ""))))
-
-        # Normalize date to YYYY-MM-DD
-        if end_date and "T" in end_date:
-            end_date = end_date.split("T")[0]
-
-        category = str(item.get("category", item.get("groupItemTitle", "general"))).lower()
-        market_id = str(item.get("condition_id", item.get("id", item.get("slug", ""))))
-
-        if not title:
-            continue
-
-        markets.append({
-            "platform": "Polymarket",
-            "market_id": f"poly-{market_id[:20]}",
-            "title": title,
-            "description": description[:300],
-            "outcomes": [
-                {"name": "Yes", "price": round(yes_price, 4), "liquidity": round(liquidity / 2)},
-                {"name": "No", "price": round(no_price, 4), "liquidity": round(liquidity / 2)},
-            ],
-            "resolution_date": end_date or "2025-12-31",
-            "category": category if category else "general",
-        })
-
-        if len(markets) >= limit * 2:
+    pages = 1
+    offset = len(raw_markets)
+    while True:
+        for item in raw_markets:
+            normalized = normalize_market(item, market_filter)
+            if normalized is None:
+                continue
+            markets.append(normalized)
+
+            if len(markets) >= limit * 2:
+                break
+        # Unfiltered fetches keep to one page; filtered ones page on until enough qualify.
+        if (
+            market_filter is None
+            or len(markets) >= limit * 2
+            or len(raw_markets) < page_size
+            or pages >= _MAX_FILTERED_PAGES
+        ):
             break
+        try:
+            raw_markets, _ = http_get_json_conditional(
+                f"{GAMMA_API}/markets",
+                params={**_GAMMA_PARAMS, "limit": page_size, "offset": offset},
+                timeout=15,
+            )
+        except Exception as exc:
+            logger.warning("Polymarket Gamma pagination stopped after %d pages: %s", pages, exc)
+            break
+        if not isinstance(raw_markets, list) or not raw_markets:
+            break
+        pages += 1
+        offset += len(raw_markets)
 
     # Sort: priority keywords first, then by price variance from 0.5 (more interesting)
     def _priority(m: dict[str, Any]) -> tuple[int, float]:
@@ -167,3 +243,136 @@ def fetch_polymarket_markets(limit: int = 30) -> list[dict[str, Any]]:
 
     logger.info("Polymarket: fetched %d markets", len(markets))
     return markets
+
+
+# CLOB cursor pagination: first page cursor and end-of-catalog sentinel.
+_CLOB_FIRST_CURSOR = "MA=="
+_CLOB_END_CURSOR = "LTE="
+
+
+def _iter_gamma_pages(page_size: int) -> Iterator[list[Any]]:
+    """Yield raw Gamma market pages, following offsets until a short page."""
+    offset = 0
+    while True:
+        resp = http_get(
+            f"{GAMMA_API}/markets",
+            params={**_GAMMA_PARAMS, "limit": page_size, "offset": offset},
+            timeout=15,
+        )
+        resp.raise_for_status()
+        page = jsonio.response_json(resp)
+        if not isinstance(page, list) or not page:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        offset += len(page)
+
+
+def _iter_clob_pages() -> Iterator[list[Any]]:
+    """Yield raw CLOB market pages, following next_cursor to the end sentinel."""
+    cursor = _CLOB_FIRST_CURSOR
+    while cursor and cursor != _CLOB_END_CURSOR:
+        resp = http_get(f"{CLOB_API}/markets", params={"next_cursor": cursor}, timeout=15)
+        resp.raise_for_status()
+        data = jsonio.response_json(resp)
+        page = data.get("data", []) if isinstance(data, dict) else data
+        if not isinstance(page, list) or not page:
+            return
+        yield page
+        cursor = str(data.get("next_cursor", "")) if isinstance(data, dict) else ""
+
+
+def iter_polymarket_markets(
+    page_size: int = 100, max_pages: int | None = None, market_filter: MarketFilter | None = None
+) -> Iterator[dict[str, Any]]:
+    """Stream normalized markets across the full open Gamma catalog.
+
+    Pages are fetched lazily as the consumer advances, so memory stays at one
+    page and closing the generator stops pagination. Items rejected by
+    market_filter are skipped before normalization. If Gamma fails before
+    yielding anything, the CLOB cursor catalog is used instead.
+    """
+    pages = 0
+    try:
+        for page in _iter_gamma_pages(page_size):
+            for item in page:
+                normalized = normalize_market(item, market_filter)
+                if normalized is not None:
+                    yield normalized
+            pages += 1
+            if max_pages is not None and pages >= max_pages:
+                return
+        return
+    except Exception as exc:
+        if pages:
+            logger.warning("Polymarket Gamma pagination stopped after %d pages: %s", pages, exc)
+            return
+        logger.warning("Polymarket Gamma pagination failed, using CLOB cursor: %s", exc)
+
+    try:
+        for page in _iter_clob_pages():
+            for item in page:
+                normalized = normalize_market(item, market_filter)
+                if normalized is not None and item.get("active", True) and not item.get("closed", False):
+                    yield normalized
+            pages += 1
+            if max_pages is not None and pages >= max_pages:
+                return
+    except Exception as exc:
+        logger.error("Polymarket CLOB pagination failed: %s", exc)
+
+
+def fetch_polymarket_prices(source_ids: list[str]) -> dict[str, tuple[float, float]]:
+    """Fetch current (yes, no) prices for known markets by their source ids.
+
+    Gamma numeric ids are queried with `id`, CLOB condition ids with
+    `condition_ids`, and slugs (the source id of markets that had neither)
+    with `slug`. Returns a mapping from source id to prices.
+    """
+    prices: dict[str, tuple[float, float]] = {}
+    conditions = [sid for sid in source_ids if sid.startswith("0x")]
+    numeric = [sid for sid in source_ids if sid.isdigit()]
+    slugs = [sid for sid in source_ids if sid and not sid.startswith("0x") and not sid.isdigit()]
+    for key, ids in (("id", numeric), ("condition_ids", conditions), ("slug", slugs)):
+        for start in range(0, len(ids), 50):
+            chunk = ids[start : start + 50]
+            try:
+                resp = http_get(
+                    f"{GAMMA_API}/markets",
+                    params={key: chunk, "limit": len(chunk)},
+                )
+                resp.raise_for_status()
+                rows = jsonio.response_json(resp)
+            except Exception as exc:
+                logger.warning("Polymarket price refresh failed: %s", exc)
+                continue
+            for item in rows if isinstance(rows, list) else []:
+                if not isinstance(item, dict):
+                    continue
+                for sid in (
+                    str(item.get("id", "")),
+                    str(item.get("conditionId", item.get("condition_id", ""))),
+                    str(item.get("slug", "")),
+                ):
+                    if sid in chunk:
+                        prices[sid] = _extract_prices(item)
+    return prices
+
+
+def fetch_polymarket_orderbook(token_ids: list[str]) -> dict[str, list[list[float]]]:
+    """Fetch CLOB ask ladders for a market's YES and NO tokens.
+
+    Returns {"yes": [[price, size], ...], "no": [...]} sorted by ascending price.
+    """
+    book: dict[str, list[list[float]]] = {}
+    for side, token_id in zip(("yes", "no"), token_ids):
+        resp = http_get(f"{CLOB_API}/book", params={"token_id": token_id})
+        resp.raise_for_status()
+        asks = jsonio.response_json(resp).get("asks", [])
+        book[side] = sorted(
+            [_safe_float(level.get("price")), _safe_float(level.get("size"))]
+            for level in asks
+            if isinstance(level, dict)
+        )
+    return book
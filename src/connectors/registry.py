@@ -0,0 +1,270 @@
+"""Registry of live market connectors with per-venue rate and concurrency limits.
+
+Each venue is a `ConnectorSpec`: a name (the normalized `platform`), a bounded
+per-cycle fetch, an optional full-catalog generator and price refresher, the
+base URLs it calls, and its request budget. Specs apply their budget to the
+shared HTTP client as a token bucket plus a concurrency cap per host, so a
+venue is collected as fast as its limits allow and no faster.
+
+Venues without a hand-written connector can be added declaratively through
+`data/connectors.json`, which maps platform names to partial spec fields:
+
+    {
+      "Kalshi": {"rate_per_second": 10},
+      "Opinion": {
+        "markets_url": "https://example.invalid/markets",
+        "items_key": "data",
+        "cursor_param": "cursor",
+        "cursor_key": "next",
+        "fields": {"market_id": "id", "title": "question", "yes_price": "yesPrice"}
+      }
+    }
+
+Entries for registered platforms override their limits; entries with a
+`markets_url` register a `ListingSource` connector for a JSON listing API.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field, fields, replace
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterator
+from urllib.parse import urlparse
+
+from src import jsonio
+from src.connectors import kalshi, polymarket
+from src.connectors.filters import MarketFilter
+from src.connectors.http import ConnectorHTTP, get_client, http_get
+
+logger = logging.getLogger(__name__)
+
+MarketFetch = Callable[[int, int, "MarketFilter | None"], list[dict[str, Any]]]
+MarketStream = Callable[[int | None, "MarketFilter | None"], Iterator[dict[str, Any]]]
+PriceFetch = Callable[[list[str]], dict[str, tuple[float, float]]]
+
+
+@dataclass(frozen=True)
+class ConnectorSpec:
+    """One live venue: how to fetch it and how hard it may be hit."""
+
+    name: str
+    # fetch(limit, max_concurrency, market_filter) -> qualifying normalized markets for one agent cycle
+    fetch: MarketFetch
+    # iterate(max_pages, market_filter) -> qualifying normalized markets across the full catalog
+    iterate: MarketStream | None = None
+    normalize: Callable[..., dict[str, Any] | None] | None = None
+    fetch_prices: PriceFetch | None = None
+    base_urls: Callable[[], tuple[str, ...]] = lambda: ()
+    rate_per_second: float = 5.0
+    burst: int = 5
+    max_concurrency: int = 4
+    cycle_limit: int = 40
+    enabled: bool = True
+
+    def apply_limits(self, client: ConnectorHTTP | None = None) -> None:
+        """Install this venue's token bucket and concurrency cap on its hosts."""
+        client = client or get_client()
+        for url in self.base_urls():
+            client.set_host_limits(urlparse(url).netloc, self.rate_per_second, self.burst, self.max_concurrency)
+
+
+def _get_path(item: dict[str, Any], path: str) -> Any:
+    value: Any = item
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _to_float(value: Any, default: float) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(frozen=True)
+class ListingSource:
+    """A paginated JSON market listing described by field mappings."""
+
+    platform: str
+    markets_url: str
+    items_key: str = ""
+    fields: dict[str, str] = field(default_factory=dict)
+    params: dict[str, Any] = field(default_factory=dict)
+    headers: dict[str, str] = field(default_factory=dict)
+    page_size: int = 100
+    page_size_param: str = "limit"
+    cursor_param: str = ""
+    cursor_key: str = ""
+    offset_param: str = ""
+    price_scale: float = 1.0
+    id_prefix: str = ""
+
+    def normalize(self, item: Any, market_filter: MarketFilter | None = None) -> dict[str, Any] | None:
+        """Map one raw listing item to the ArbSense market schema; None if unusable or filtered out."""
+        if not isinstance(item, dict):
+            return None
+
+        def raw(name: str, default: Any = None) -> Any:
+            value = _get_path(item, self.fields.get(name, name))
+            return default if value in (None, "") else value
+
+        liquidity = _to_float(raw("liquidity"), 0.0)
+        category = str(raw("category", "general")).lower()
+        resolution_date = str(raw("resolution_date", "2026-12-31")).split("T")[0]
+        if market_filter is not None and not market_filter.accepts(round(liquidity / 2), category, resolution_date):
+            return None
+
+        market_id = raw("market_id", raw("id"))
+        title = str(raw("title", raw("question", "")))
+        if market_id is None or not title:
+            return None
+        yes_price = _to_float(raw("yes_price"), -1.0) / self.price_scale
+        if not 0.0 < yes_price < 1.0:
+            return None
+        no_raw = raw("no_price")
+        no_price = _to_float(no_raw, 0.0) / self.price_scale if no_raw is not None else 1.0 - yes_price
+        prefix = self.id_prefix or re.sub(r"[^a-z0-9]+", "", self.platform.lower())
+        return {
+            "platform": self.platform,
+            "market_id": f"{prefix}-{market_id}",
+            "source_id": str(market_id),
+            "title": title,
+            "description": str(raw("description", title))[:300],
+            "outcomes": [
+                {"name": "Yes", "price": round(yes_price, 4), "liquidity": round(liquidity / 2)},
+                {"name": "No", "price": round(no_price, 4), "liquidity": round(liquidity / 2)},
+            ],
+            "resolution_date": resolution_date,
+            "category": category,
+        }
+
+    def iter_markets(
+        self, max_pages: int | None = None, market_filter: MarketFilter | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Stream qualifying normalized markets, following a cursor or offset when configured."""
+        cursor: Any = None
+        offset = 0
+        pages = 0
+        while True:
+            params = {**self.params, self.page_size_param: self.page_size}
+            if self.cursor_param and cursor:
+                params[self.cursor_param] = cursor
+            if self.offset_param:
+                params[self.offset_param] = offset
+            try:
+                resp = http_get(self.markets_url, params=params, headers=self.headers or None)
+                resp.raise_for_status()
+                payload = jsonio.response_json(resp)
+            except Exception as exc:
+                logger.warning("%s listing stopped after %d pages: %s", self.platform, pages, exc)
+                return
+            items = _get_path(payload, self.items_key) if self.items_key else payload
+            items = items if isinstance(items, list) else []
+            for item in items:
+                normalized = self.normalize(item, market_filter)
+                if normalized is not None:
+                    yield normalized
+            pages += 1
+            if max_pages is not None and pages >= max_pages:
+                return
+            if self.cursor_param:
+                cursor = _get_path(payload, self.cursor_key) if isinstance(payload, dict) else None
+                if not cursor:
+                    return
+            elif self.offset_param and len(items) >= self.page_size:
+                offset += len(items)
+            else:
+                return
+
+    def to_spec(self, **limits: Any) -> ConnectorSpec:
+        return ConnectorSpec(
+            name=self.platform,
+            fetch=lambda limit, _concurrency, market_filter: list(
+                islice(self.iter_markets(market_filter=market_filter), limit)
+            ),
+            iterate=self.iter_markets,
+            normalize=self.normalize,
+            base_urls=lambda: (self.markets_url,),
+            **limits,
+        )
+
+
+_REGISTRY: dict[str, ConnectorSpec] = {}
+
+
+def register_connector(spec: ConnectorSpec) -> None:
+    """Add or replace the connector for spec.name."""
+    _REGISTRY[spec.name] = spec
+
+
+def get_connector(name: str) -> ConnectorSpec | None:
+    return _REGISTRY.get(name)
+
+
+def registered_connectors(enabled_only: bool = True) -> list[ConnectorSpec]:
+    """Connectors in registration order."""
+    return [spec for spec in _REGISTRY.values() if spec.enabled or not enabled_only]
+
+
+_SPEC_LIMIT_FIELDS = {"rate_per_second", "burst", "max_concurrency", "cycle_limit", "enabled"}
+_LISTING_FIELDS = {f.name for f in fields(ListingSource)}
+
+
+def load_connector_registry(path: Path | None = None) -> list[ConnectorSpec]:
+    """Apply JSON overrides and declarative listing sources; return enabled connectors."""
+    if path is not None and path.exists():
+        entries = jsonio.read_json(path)
+        for name, entry in entries.items():
+            limits = {k: v for k, v in entry.items() if k in _SPEC_LIMIT_FIELDS}
+            if "markets_url" in entry:
+                source = ListingSource(
+                    platform=str(name), **{k: v for k, v in entry.items() if k in _LISTING_FIELDS and k != "platform"}
+                )
+                register_connector(source.to_spec(**limits))
+            elif name in _REGISTRY:
+                register_connector(replace(_REGISTRY[name], **limits))
+            else:
+                logger.warning("Connector override for unknown platform %s ignored", name)
+    return registered_connectors()
+
+
+register_connector(
+    ConnectorSpec(
+        name="Polymarket",
+        fetch=lambda limit, _concurrency, market_filter: polymarket.fetch_polymarket_markets(
+            limit=limit, market_filter=market_filter
+        ),
+        iterate=lambda max_pages, market_filter: polymarket.iter_polymarket_markets(
+            max_pages=max_pages, market_filter=market_filter
+        ),
+        normalize=polymarket.normalize_market,
+        fetch_prices=polymarket.fetch_polymarket_prices,
+        base_urls=lambda: (polymarket.GAMMA_API, polymarket.CLOB_API),
+        rate_per_second=30.0,
+        burst=30,
+        max_concurrency=8,
+    )
+)
+register_connector(
+    ConnectorSpec(
+        name="Kalshi",
+        fetch=lambda limit, concurrency, market_filter: kalshi.fetch_kalshi_markets(
+            limit=limit, series_concurrency=concurrency, market_filter=market_filter
+        ),
+        iterate=lambda max_pages, market_filter: kalshi.iter_kalshi_markets(
+            max_pages=max_pages, market_filter=market_filter
+        ),
+        normalize=kalshi.normalize_market,
+        fetch_prices=kalshi.fetch_kalshi_prices,
+        base_urls=lambda: (kalshi.KALSHI_API,),
+        rate_per_second=20.0,
+        burst=20,
+        max_concurrency=8,
+    )
+)
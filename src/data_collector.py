@@ -6,13 +6,19 @@ live connectors as explicit extension points for hackathon iteration.
 
 from __future__ import annotations
 
-import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
+from src import jsonio
 from src.config import Settings
-from src.quality_scorer import enrich_with_quality_scores
+from src.connectors.filters import MarketFilter
+from src.market_model import Market
+from src.quality_scorer import enrich_with_quality_scores, load_quality_scorer
 
 YES_NO_OUTCOMES = ("Yes", "No")
 
@@ -416,6 +422,10 @@ def filter_by_min_liquidity(
     """Drop markets where either side has very low liquidity."""
     filtered: list[dict[str, Any]] = []
     for market in markets:
+        if isinstance(market, Market) and market.has_standard_outcomes:
+            if market.min_liquidity >= min_liquidity_usd:
+                filtered.append(market)
+            continue
         outcomes = market.get("outcomes", [])
         if len(outcomes) < 2:
             continue
@@ -425,54 +435,239 @@ def filter_by_min_liquidity(
     return filtered
 
 
-def maybe_collect_live_markets() -> list[dict[str, Any]]:
-    """Fetch live markets from Polymarket + Kalshi APIs."""
-    from src.connectors.polymarket import fetch_polymarket_markets
-    from src.connectors.kalshi import fetch_kalshi_markets
+def maybe_collect_live_markets(
+    series_concurrency: int | None = None,
+    market_filter: MarketFilter | None = None,
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    """Fetch live markets from every registered connector concurrently.
 
+    Each venue fans out up to its own concurrency cap (or series_concurrency
+    when given) under its rate limit. Collection takes as long as the slowest
+    venue; a failing venue contributes no markets. Results keep registry order.
+    market_filter is pushed down into the connectors, and each venue stops
+    once it has min(cycle_limit, limit) qualifying markets.
+    """
+    from src.connectors.registry import registered_connectors
+
+    specs = registered_connectors()
+    if not specs:
+        return []
+    for spec in specs:
+        spec.apply_limits()
     markets: list[dict[str, Any]] = []
+    with ThreadPoolExecutor(max_workers=len(specs)) as pool:
+        futures = [
+            pool.submit(
+                spec.fetch,
+                min(spec.cycle_limit, limit) if limit else spec.cycle_limit,
+                series_concurrency or spec.max_concurrency,
+                market_filter,
+            )
+            for spec in specs
+        ]
+        for future in futures:
+            try:
+                markets.extend(future.result())
+            except Exception:
+                pass
+    return markets
 
-    try:
-        poly = fetch_polymarket_markets(limit=40)
-        markets.extend(poly)
-    except Exception:
-        pass
 
+def stream_live_markets(
+    max_pages_per_source: int | None = None,
+    market_filter: MarketFilter | None = None,
+    limit_per_source: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Stream normalized markets from the full catalog of every registered connector.
+
+    Each source paginates on its own thread into a bounded queue, so markets
+    are yielded as soon as any page arrives and a slow consumer applies
+    backpressure instead of buffering whole catalogs. Sources skip markets
+    rejected by market_filter before normalizing them and stop paginating
+    after limit_per_source qualifying markets.
+
+    Only catalog export (collect_data.py --full-catalog) consumes this stream;
+    agent cycles collect through collect_markets, which fetches one bounded
+    page set per venue and returns before embedding and pairing start.
+    """
+    from src.connectors.registry import registered_connectors
+
+    specs = [spec for spec in registered_connectors() if spec.iterate is not None]
+    for spec in specs:
+        spec.apply_limits()
+    sources = [
+        lambda spec=spec: islice(spec.iterate(max_pages_per_source, market_filter), limit_per_source)
+        for spec in specs
+    ]
+    done = object()
+    buffer: queue.Queue[Any] = queue.Queue(maxsize=500)
+    stop = threading.Event()
+
+    def pump(source: Any) -> None:
+        try:
+            for market in source():
+                if stop.is_set():
+                    return
+                buffer.put(market)
+        except Exception:
+            pass
+        finally:
+            buffer.put(done)
+
+    threads = [threading.Thread(target=pump, args=(source,), daemon=True) for source in sources]
+    for thread in threads:
+        thread.start()
+    remaining = len(threads)
     try:
-        kalshi = fetch_kalshi_markets(limit=40)
-        markets.extend(kalshi)
-    except Exception:
-        pass
+        while remaining:
+            item = buffer.get()
+            if item is done:
+                remaining -= 1
+                continue
+            yield item
+    finally:
+        stop.set()
+        # Unblock producers waiting on a full queue so their threads can exit.
+        while remaining:
+            try:
+                if buffer.get(timeout=1.0) is done:
+                    remaining -= 1
+            except queue.Empty:
+                break
 
-    return markets
+
+def refresh_live_prices(markets: list[dict[str, Any]]) -> dict[str, tuple[float, float]]:
+    """Fetch fresh (yes, no) prices for live-sourced markets, keyed by market_id.
+
+    Markets whose connector has no price refresher (or no connector at all,
+    like the BNB Chain sample venues) are omitted and keep their last known
+    prices.
+    """
+    from src.connectors.registry import registered_connectors
+
+    fetchers = {spec.name: spec.fetch_prices for spec in registered_connectors() if spec.fetch_prices is not None}
+    by_platform: dict[str, dict[str, str]] = {}
+    for market in markets:
+        platform = str(market.get("platform", ""))
+        source_id = str(market.get("source_id", ""))
+        if platform in fetchers and source_id:
+            by_platform.setdefault(platform, {})[source_id] = str(market["market_id"])
+
+    updates: dict[str, tuple[float, float]] = {}
+    if not by_platform:
+        return updates
+    with ThreadPoolExecutor(max_workers=len(by_platform)) as pool:
+        futures = {platform: pool.submit(fetchers[platform], list(ids)) for platform, ids in by_platform.items()}
+    for platform, future in futures.items():
+        ids = by_platform[platform]
+        try:
+            prices = future.result()
+        except Exception:
+            continue
+        for source_id, yes_no in prices.items():
+            if source_id in ids:
+                updates[ids[source_id]] = yes_no
+    return updates
+
+
+def with_prices(market: dict[str, Any], yes_price: float, no_price: float) -> dict[str, Any]:
+    """Return a copy of market with its Yes/No outcome prices replaced.
+
+    An attached `orderbook` is dropped: the ladder was fetched at the old
+    prices and would size trades against depth that has since moved.
+    """
+    if isinstance(market, Market):
+        return market.with_prices(yes_price, no_price)
+    outcomes = []
+    for outcome in market.get("outcomes", []):
+        name = str(outcome.get("name", "")).strip().lower()
+        if name == "yes":
+            outcome = {**outcome, "price": round(yes_price, 4)}
+        elif name == "no":
+            outcome = {**outcome, "price": round(no_price, 4)}
+        outcomes.append(outcome)
+    repriced = {**market, "outcomes": outcomes}
+    repriced.pop("orderbook", None)
+    return repriced
+
+
+def fetch_orderbooks(
+    markets: list[dict[str, Any]], max_workers: int = 8
+) -> dict[str, dict[str, list[list[float]]]]:
+    """Fetch depth ladders for live-sourced markets in parallel, keyed by market_id."""
+    from src.connectors.kalshi import fetch_kalshi_orderbook
+    from src.connectors.polymarket import fetch_polymarket_orderbook
+
+    requests_by_id: dict[str, Any] = {}
+    for market in markets:
+        platform = str(market.get("platform", ""))
+        if platform == "Kalshi" and market.get("source_id"):
+            requests_by_id[str(market["market_id"])] = (fetch_kalshi_orderbook, str(market["source_id"]))
+        elif platform == "Polymarket" and len(market.get("token_ids", [])) >= 2:
+            requests_by_id[str(market["market_id"])] = (fetch_polymarket_orderbook, list(market["token_ids"]))
+
+    books: dict[str, dict[str, list[list[float]]]] = {}
+    if not requests_by_id:
+        return books
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(requests_by_id)))) as pool:
+        futures = {mid: pool.submit(fetch, arg) for mid, (fetch, arg) in requests_by_id.items()}
+    for mid, future in futures.items():
+        try:
+            books[mid] = future.result()
+        except Exception:
+            continue
+    return books
+
+
+def market_filter_from_settings(settings: Settings) -> MarketFilter:
+    """Connector push-down filter for MIN_LIQUIDITY_USD, MARKET_CATEGORIES and MAX_RESOLUTION_DAYS."""
+    return MarketFilter.build(
+        min_liquidity=settings.min_liquidity_usd,
+        categories=settings.market_categories,
+        horizon_days=settings.max_resolution_days or None,
+    )
 
 
 def collect_markets(
     settings: Settings, use_live: bool = False, target_count: int = 30
-) -> list[dict[str, Any]]:
+) -> list[Market]:
     """Collect markets from live sources + BNB Chain platforms.
 
-    When use_live=True, fetches from Polymarket + Kalshi and merges with
-    BNB Chain native platforms for comprehensive cross-platform coverage.
+    When use_live=True, fetches from every registered connector (Polymarket,
+    Kalshi and any declared in data/connectors.json) and merges with BNB Chain
+    native platforms for comprehensive cross-platform coverage. Live
+    connectors apply the settings filter to raw items and fetch at most
+    target_count qualifying markets each; sample markets are filtered after.
+    Collection completes before it returns; it does not stream the full
+    catalog (see stream_live_markets). Quality-scored markets are returned
+    as `Market` records, which later stages pass along unchanged.
     """
+    market_filter = market_filter_from_settings(settings)
     # Always include BNB Chain platforms (predict.fun, probable, etc.)
-    markets = build_sample_markets()
+    markets = [market for market in build_sample_markets() if market_filter.accepts_market(market)]
 
     if use_live:
-        live = maybe_collect_live_markets()
-        markets = live + markets  # live markets first
+        from src.connectors.http import get_client
+        from src.connectors.registry import load_connector_registry
+
+        get_client(settings)
+        load_connector_registry(settings.data_dir / "connectors.json")
+        live = maybe_collect_live_markets(market_filter=market_filter, limit=target_count)
+        # Venues with live data replace their sample markets; live markets first.
+        live_platforms = {market["platform"] for market in live}
+        markets = live + [market for market in markets if market["platform"] not in live_platforms]
 
-    markets = filter_by_min_liquidity(markets, settings.min_liquidity_usd)
     markets = markets[: max(1, min(target_count, len(markets)))]
-    return enrich_with_quality_scores(markets)
+    scorer = load_quality_scorer(settings.data_dir / "quality_terms.json")
+    return [Market.from_dict(market) for market in enrich_with_quality_scores(markets, scorer=scorer, in_place=True)]
 
 
-def save_markets(markets: list[dict[str, Any]], output_path: Path) -> None:
+def save_markets(markets: list[Market | dict[str, Any]], output_path: Path) -> None:
     """Persist normalized markets JSON for downstream embedding pipeline."""
-    output_path.parent.mkdir(parents=True, exist_ok=True)
     payload = {
         "generated_at": date.today().isoformat(),
         "count": len(markets),
         "markets": markets,
     }
-    output_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    jsonio.write_json(payload, output_path)
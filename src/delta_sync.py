@@ -0,0 +1,128 @@
+"""Per-source market sync state and cycle-to-cycle change detection.
+
+Each market is fingerprinted twice: a content hash over the whole normalized
+record and an identity hash that ignores outcome prices and liquidity. A
+cycle's markets are diffed against the previous cycle per source (platform)
+into added, changed and removed sets; when every change is price-only,
+downstream stages can keep their embeddings and verified matches, and
+otherwise only the added and edited markets need pairing again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from src import jsonio
+from src.market_model import as_market_dict
+
+
+def market_content_hash(market: dict[str, Any]) -> str:
+    """Hash the full normalized market, prices included."""
+    # Stdlib encoding on purpose: these hashes are persisted in the sync state.
+    return hashlib.sha256(json.dumps(as_market_dict(market), sort_keys=True).encode("utf-8")).hexdigest()[:24]
+
+
+def market_identity_hash(market: dict[str, Any]) -> str:
+    """Hash the market without outcome prices and liquidity."""
+    outcomes = [{"name": o.get("name", "")} for o in market.get("outcomes", []) if isinstance(o, dict)]
+    return market_content_hash({**market, "outcomes": outcomes})
+
+
+@dataclass
+class MarketDelta:
+    """Markets added, changed and removed since the previous sync."""
+
+    added: list[dict[str, Any]] = field(default_factory=list)
+    changed: list[dict[str, Any]] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    # Changed market ids whose text, dates or category changed, not just prices.
+    rematch_ids: set[str] = field(default_factory=set)
+    # source -> market_id -> [content_hash, identity_hash] for the diffed cycle; see `SyncState.adopt`.
+    hashes: dict[str, dict[str, list[str]]] = field(default_factory=dict, repr=False)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+    @property
+    def requires_rematch(self) -> bool:
+        """True when some candidate pairs or match verdicts may be stale (markets added, removed or edited)."""
+        return bool(self.added or self.removed or self.rematch_ids)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "added": len(self.added),
+            "changed": len(self.changed),
+            "price_only": len(self.changed) - len(self.rematch_ids),
+            "removed": len(self.removed),
+            "unchanged": self.unchanged,
+        }
+
+
+class SyncState:
+    """Content hashes of the last synced markets, grouped by source."""
+
+    def __init__(self) -> None:
+        # source -> market_id -> [content_hash, identity_hash]
+        self.sources: dict[str, dict[str, list[str]]] = {}
+        self.last_synced: dict[str, str] = {}
+
+    @classmethod
+    def load(cls, path: Path) -> SyncState:
+        """Load state from JSON; a missing or unreadable file starts empty."""
+        state = cls()
+        if not path.exists():
+            return state
+        try:
+            payload = jsonio.read_json(path)
+        except (OSError, jsonio.JSONDecodeError):
+            return state
+        state.sources = {str(k): dict(v) for k, v in payload.get("sources", {}).items()}
+        state.last_synced = dict(payload.get("last_synced", {}))
+        return state
+
+    def save(self, path: Path) -> None:
+        jsonio.write_json({"last_synced": self.last_synced, "sources": self.sources}, path)
+
+    def diff(self, markets: list[dict[str, Any]]) -> MarketDelta:
+        """Diff a full cycle's markets against the stored state.
+
+        Sources absent from this cycle have all their markets reported removed.
+        The state is unchanged until `adopt` is called with the delta, so a
+        cycle that fails after diffing is diffed again from the same baseline.
+        """
+        delta = MarketDelta()
+        current: dict[str, dict[str, list[str]]] = {}
+        for market in markets:
+            source = str(market.get("platform", ""))
+            market_id = str(market.get("market_id", ""))
+            hashes = [market_content_hash(market), market_identity_hash(market)]
+            current.setdefault(source, {})[market_id] = hashes
+            previous = self.sources.get(source, {}).get(market_id)
+            if previous is None:
+                delta.added.append(market)
+            elif previous[0] != hashes[0]:
+                delta.changed.append(market)
+                if previous[1] != hashes[1]:
+                    delta.rematch_ids.add(market_id)
+            else:
+                delta.unchanged += 1
+
+        for source, known in self.sources.items():
+            seen = current.get(source, {})
+            delta.removed.extend(market_id for market_id in known if market_id not in seen)
+
+        delta.hashes = current
+        return delta
+
+    def adopt(self, delta: MarketDelta) -> None:
+        """Make the markets diffed into delta the new baseline."""
+        now = datetime.now(timezone.utc).isoformat()
+        self.sources = delta.hashes
+        self.last_synced.update({source: now for source in delta.hashes})
@@ -1,21 +1,35 @@
-"""Embedding generation and cosine-similarity candidate matching."""
+"""Embedding generation and cosine-similarity candidate matching.
+
+Markets are embedded from price-free text (`embedding_text`), so a price
+tick never changes a vector. Vectors can be kept in an `EmbeddingCache`
+keyed by model and text; the agent appends to data/embedding_cache.jsonl
+and backtest replays read the same file.
+"""
 
 from __future__ import annotations
 
 import hashlib
-import json
 import math
 import re
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable
 
+from src import jsonio
 from src.config import Settings
+from src.fixtures import through_fixtures
 
 try:
     from openai import OpenAI
 except ModuleNotFoundError:  # pragma: no cover - dependency may be unavailable in setup
     OpenAI = None  # type: ignore[assignment]
 
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - fall back to pairwise cosine loops
+    np = None  # type: ignore[assignment]
+
+LOCAL_EMBEDDING_MODEL = "local_deterministic_hash"
+
 
 def create_market_text(market: dict[str, Any]) -> str:
     """Create a rich market text for semantic embedding."""
@@ -32,6 +46,12 @@ def create_market_text(market: dict[str, Any]) -> str:
     )
 
 
+def embedding_text(market: dict[str, Any]) -> str:
+    """Market text for embedding: `create_market_text` with outcome names but no prices."""
+    outcomes = [{"name": o.get("name", "")} for o in market.get("outcomes", []) if isinstance(o, dict)]
+    return create_market_text({**market, "outcomes": outcomes})
+
+
 def _normalize(vector: list[float]) -> list[float]:
     """Return L2-normalized vector."""
     norm = math.sqrt(sum(x * x for x in vector))
@@ -59,35 +79,97 @@ def _embed_with_openai(
     settings: Settings, inputs: list[str], max_items: int
 ) -> tuple[list[list[float]], str]:
     """Call OpenAI embeddings API with simple per-run guardrails."""
-    if OpenAI is None:
-        raise RuntimeError("openai package is unavailable")
-    if not settings.openai_api_key:
-        raise RuntimeError("OPENAI_API_KEY is missing")
     if len(inputs) > max_items:
         raise RuntimeError(
             f"Embedding limit exceeded: {len(inputs)} > {max_items} for this run."
         )
 
-    client = OpenAI(api_key=settings.openai_api_key)
-    response = client.embeddings.create(model=settings.embedding_model, input=inputs)
-    vectors = [list(item.embedding) for item in response.data]
-    return vectors, "openai"
+    def live() -> list[list[float]]:
+        if OpenAI is None:
+            raise RuntimeError("openai package is unavailable")
+        if not settings.openai_api_key:
+            raise RuntimeError("OPENAI_API_KEY is missing")
+        client = OpenAI(api_key=settings.openai_api_key)
+        response = client.embeddings.create(model=settings.embedding_model, input=inputs)
+        return [list(item.embedding) for item in response.data]
+
+    request = {"model": settings.embedding_model, "input": inputs}
+    return through_fixtures("openai.embeddings", request, live), "openai"
+
+
+class EmbeddingCache:
+    """Vectors keyed by a hash of embedding model and price-free market text."""
+
+    def __init__(self) -> None:
+        self._vectors: dict[str, list[float]] = {}
+        self._unsaved: list[str] = []
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\x1f{text}".encode("utf-8")).hexdigest()[:24]
+
+    def load(self, path: Path) -> int:
+        """Seed from a JSONL file of {"key", "vector"} rows; returns rows loaded."""
+        if not path.exists():
+            return 0
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    row = jsonio.loads(line)
+                    self._vectors[str(row["key"])] = list(row["vector"])
+        return len(self._vectors)
+
+    def save(self, path: Path) -> int:
+        """Append vectors added since the last load or save; returns rows written."""
+        if not self._unsaved:
+            return 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as handle:
+            for key in self._unsaved:
+                handle.write(jsonio.dumps({"key": key, "vector": self._vectors[key]}) + "\n")
+        written, self._unsaved = len(self._unsaved), []
+        return written
+
+    def lookup(
+        self, model: str, texts: list[str], embed: Callable[[list[str]], list[list[float]]]
+    ) -> list[list[float]]:
+        """Vectors for texts under model, calling embed once for the distinct misses."""
+        keys = [self.key(model, text) for text in texts]
+        missing = {key: text for key, text in zip(keys, texts) if key not in self._vectors}
+        if missing:
+            for key, vector in zip(missing, embed(list(missing.values()))):
+                self._vectors[key] = vector
+                self._unsaved.append(key)
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        return [self._vectors[key] for key in keys]
+
+
+def local_vectors(texts: list[str]) -> list[list[float]]:
+    """Deterministic local embeddings (`LOCAL_EMBEDDING_MODEL`) for texts."""
+    return [_deterministic_local_embedding(text) for text in texts]
 
 
 def embed_all_markets(
-    markets: list[dict[str, Any]], settings: Settings
+    markets: list[dict[str, Any]], settings: Settings, cache: EmbeddingCache | None = None
 ) -> tuple[list[dict[str, Any]], str]:
-    """Embed all markets and return records containing vector + market metadata."""
-    texts = [create_market_text(m) for m in markets]
+    """Embed all markets and return records containing vector + market metadata.
+
+    With a cache, only texts it has no vector for under the model in use are
+    sent to the embedding API.
+    """
+    texts = [embedding_text(m) for m in markets]
+
+    def remote(inputs: list[str]) -> list[list[float]]:
+        return _embed_with_openai(settings=settings, inputs=inputs, max_items=settings.max_embedding_inputs_per_run)[0]
 
     try:
-        vectors, provider = _embed_with_openai(
-            settings=settings,
-            inputs=texts,
-            max_items=settings.max_embedding_inputs_per_run,
-        )
+        vectors = remote(texts) if cache is None else cache.lookup(settings.embedding_model, texts, remote)
+        provider = "openai"
     except Exception:
-        vectors = [_deterministic_local_embedding(text) for text in texts]
+        vectors = local_vectors(texts) if cache is None else cache.lookup(LOCAL_EMBEDDING_MODEL, texts, local_vectors)
         provider = "local_fallback"
 
     records: list[dict[str, Any]] = []
@@ -119,32 +201,65 @@ def cosine_similarity(a: list[float], b: list[float]) -> float:
     return dot / (norm_a * norm_b)
 
 
+def _candidate_indices_numpy(
+    embedded_records: list[dict[str, Any]], threshold: float, rows: list[int]
+) -> list[tuple[int, int, float]]:
+    matrix = np.asarray([record["vector"] for record in embedded_records], dtype=np.float64)
+    norms = np.linalg.norm(matrix, axis=1)
+    norms[norms == 0] = 1.0
+    unit = matrix / norms[:, None]
+    row_ids = np.asarray(rows, dtype=np.int64)
+    sims = unit[row_ids] @ unit.T
+    platforms = np.asarray([str(record.get("platform")) for record in embedded_records], dtype=object)
+    mask = (sims >= threshold) & (platforms[row_ids][:, None] != platforms[None, :])
+    in_rows = np.zeros(len(embedded_records), dtype=bool)
+    in_rows[row_ids] = True
+    # A pair between two listed records is kept once, from its lower index.
+    mask &= ~(in_rows[None, :] & (np.arange(len(embedded_records))[None, :] <= row_ids[:, None]))
+    hits, cols = np.nonzero(mask)
+    return [
+        (min(rows[r], j), max(rows[r], j), float(sims[r, j])) for r, j in zip(hits.tolist(), cols.tolist())
+    ]
+
+
 def find_candidate_pairs(
-    embedded_records: list[dict[str, Any]], threshold: float = 0.70
+    embedded_records: list[dict[str, Any]], threshold: float = 0.70, only: Iterable[int] | None = None
 ) -> list[dict[str, Any]]:
-    """Find candidate cross-platform pairs above cosine similarity threshold."""
-    candidates: list[dict[str, Any]] = []
+    """Find candidate cross-platform pairs above cosine similarity threshold.
+
+    With only (record indices), just the pairs involving at least one of
+    those records are scored, e.g. newly added markets against the rest.
+    """
     total = len(embedded_records)
-    for i in range(total):
-        a = embedded_records[i]
-        for j in range(i + 1, total):
-            b = embedded_records[j]
-            if a.get("platform") == b.get("platform"):
-                continue
-            score = cosine_similarity(a["vector"], b["vector"])
-            if score >= threshold:
-                candidates.append(
-                    {
-                        "similarity_score": round(score, 6),
-                        "market_a": a["market"],
-                        "market_b": b["market"],
-                    }
-                )
-    candidates.sort(key=lambda x: x["similarity_score"], reverse=True)
-    return candidates
+    rows = sorted(set(only)) if only is not None else list(range(total))
+    dims = {len(record["vector"]) for record in embedded_records}
+    indices: list[tuple[int, int, float]] = []
+    if np is not None and rows and len(dims) == 1 and 0 not in dims:
+        indices = _candidate_indices_numpy(embedded_records, threshold, rows)
+    else:
+        listed = set(rows)
+        for i in rows:
+            a = embedded_records[i]
+            for j in range(total):
+                if j == i or (j in listed and j < i):
+                    continue
+                b = embedded_records[j]
+                if a.get("platform") == b.get("platform"):
+                    continue
+                score = cosine_similarity(a["vector"], b["vector"])
+                if score >= threshold:
+                    indices.append((min(i, j), max(i, j), score))
+    ranked = sorted((-round(score, 6), i, j) for i, j, score in indices)
+    return [
+        {
+            "similarity_score": -neg_score,
+            "market_a": embedded_records[i]["market"],
+            "market_b": embedded_records[j]["market"],
+        }
+        for neg_score, i, j in ranked
+    ]
 
 
 def save_json(payload: dict[str, Any], output_path: Path) -> None:
-    """Write JSON payload to file."""
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    """Write JSON payload to file (compact)."""
+    jsonio.write_json(payload, output_path)
@@ -0,0 +1,316 @@
+"""Union-find event clustering to keep LLM verification linear per event.
+
+Candidate pairs form a graph whose connected components are candidate event
+clusters. Each new member is verified once against its cluster representative
+(or the closest already-accepted member), and the remaining equivalences are
+inferred transitively when the guards below say that is safe.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from src.config import Settings
+from src.market_features import MarketFeatureIndex
+from src.semantic_matcher import PairVerifier, _resolution_day_gap, load_learned_verifier, verify_pair
+
+_VERDICT_RANK = {"SAFE": 0, "CAUTION": 1, "DANGER": 2}
+
+# Neutral edge standing in for a representative's relation to itself.
+_SELF_EDGE: dict[str, Any] = {
+    "confidence": 1.0,
+    "arbitrage_safe": True,
+    "resolution_conflict_score": 0,
+    "resolution_verdict": "SAFE",
+    "outcome_mapping": [],
+    "key_differences": [],
+    "risk_factors": [],
+    "resolution_analysis": "",
+}
+
+
+class UnionFind:
+    """Disjoint-set forest with path halving and union by size."""
+
+    def __init__(self) -> None:
+        self.parent: dict[str, str] = {}
+        self.size: dict[str, int] = {}
+
+    def add(self, key: str) -> None:
+        """Register a singleton set for key if unseen."""
+        if key not in self.parent:
+            self.parent[key] = key
+            self.size[key] = 1
+
+    def find(self, key: str) -> str:
+        """Return the root of key's set."""
+        self.add(key)
+        parent = self.parent
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    def union(self, a: str, b: str) -> str:
+        """Merge the sets containing a and b and return the new root."""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return ra
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        return ra
+
+    def groups(self) -> dict[str, list[str]]:
+        """Return members grouped by root, in insertion order."""
+        out: dict[str, list[str]] = {}
+        for key in self.parent:
+            out.setdefault(self.find(key), []).append(key)
+        return out
+
+
+def market_key(market: dict[str, Any]) -> str:
+    """Stable key identifying a market across pipeline stages."""
+    return str(market.get("market_id", ""))
+
+
+def _pair_key(a: str, b: str) -> tuple[str, str]:
+    return (a, b) if a <= b else (b, a)
+
+
+def cluster_candidate_pairs(candidate_pairs: list[dict[str, Any]]) -> list[list[str]]:
+    """Group markets into candidate event clusters (connected components)."""
+    uf = UnionFind()
+    for pair in candidate_pairs:
+        uf.union(market_key(pair["market_a"]), market_key(pair["market_b"]))
+    clusters = [members for members in uf.groups().values() if len(members) > 1]
+    clusters.sort(key=len, reverse=True)
+    return clusters
+
+
+def _is_equivalent_mapping(verification: dict[str, Any]) -> bool:
+    """True when the verifier mapped outcomes one-to-one without inversions."""
+    mapping = verification.get("outcome_mapping", [])
+    if not isinstance(mapping, list):
+        return False
+    return all(
+        str(row.get("relation", "equivalent")).lower() == "equivalent"
+        for row in mapping
+        if isinstance(row, dict)
+    )
+
+
+def _transitive_guard(
+    market_x: dict[str, Any],
+    market_y: dict[str, Any],
+    edge_x: dict[str, Any],
+    edge_y: dict[str, Any],
+    index: MarketFeatureIndex | None = None,
+) -> str | None:
+    """Return a reason why x~rep~y must not imply x~y, or None when inference is safe."""
+    if market_x.get("platform") == market_y.get("platform"):
+        return "same_platform"
+    if _resolution_day_gap(market_x, market_y, index) != 0:
+        return "resolution_date_mismatch"
+    cat_x = str(market_x.get("category", "")).strip().lower()
+    cat_y = str(market_y.get("category", "")).strip().lower()
+    if cat_x != cat_y:
+        return "category_mismatch"
+    if not (_is_equivalent_mapping(edge_x) and _is_equivalent_mapping(edge_y)):
+        return "non_equivalent_outcome_mapping"
+    return None
+
+
+def _inferred_verification(
+    market_x: dict[str, Any], edge_x: dict[str, Any], edge_y: dict[str, Any], rep_title: str
+) -> dict[str, Any]:
+    """Combine two verified edges into a conservative inferred verdict."""
+    verdict = max(
+        (str(edge_x.get("resolution_verdict", "CAUTION")), str(edge_y.get("resolution_verdict", "CAUTION"))),
+        key=lambda v: _VERDICT_RANK.get(v, 1),
+    )
+    return {
+        "is_match": True,
+        "confidence": round(min(float(edge_x["confidence"]), float(edge_y["confidence"])), 4),
+        "reasoning": f"Inferred transitively: both markets verified against '{rep_title}'.",
+        "event_summary": edge_x.get("event_summary", market_x.get("title", "")),
+        "outcome_mapping": [
+            {"a_outcome": "Yes", "b_outcome": "Yes", "relation": "equivalent"},
+            {"a_outcome": "No", "b_outcome": "No", "relation": "equivalent"},
+        ],
+        "key_differences": list(edge_x.get("key_differences", [])) + list(edge_y.get("key_differences", [])),
+        "risk_factors": list(edge_x.get("risk_factors", [])) + list(edge_y.get("risk_factors", [])),
+        "arbitrage_safe": bool(edge_x.get("arbitrage_safe")) and bool(edge_y.get("arbitrage_safe")),
+        "resolution_conflict_score": max(
+            int(edge_x.get("resolution_conflict_score", 50)),
+            int(edge_y.get("resolution_conflict_score", 50)),
+        ),
+        "resolution_verdict": verdict,
+        "resolution_analysis": (
+            "Inferred from shared representative; "
+            f"{edge_x.get('resolution_analysis', '')} / {edge_y.get('resolution_analysis', '')}"
+        ),
+    }
+
+
+def verify_clustered_pairs(
+    candidate_pairs: list[dict[str, Any]],
+    settings: Settings,
+    match_threshold: float = 0.78,
+    verifier: PairVerifier | None = None,
+) -> tuple[list[dict[str, Any]], str, dict[str, int]]:
+    """Verify candidate pairs cluster-by-cluster, inferring equivalences transitively.
+
+    Returns rows shaped like `verify_candidate_pairs` output (plus `cluster_id`
+    and `inferred`), the last provider used, and per-run call statistics.
+    verifier replaces `verify_pair` (e.g. with recorded verdicts in backtests).
+    """
+    limit = settings.max_verification_calls_per_run
+    learned = load_learned_verifier(settings) if verifier is None else None
+    index = MarketFeatureIndex()
+    markets: dict[str, dict[str, Any]] = {}
+    edges: dict[tuple[str, str], dict[str, Any]] = {}
+    adjacency: dict[str, dict[str, float]] = {}
+    for pair in candidate_pairs:
+        ka, kb = market_key(pair["market_a"]), market_key(pair["market_b"])
+        markets.setdefault(ka, pair["market_a"])
+        markets.setdefault(kb, pair["market_b"])
+        edges.setdefault(_pair_key(ka, kb), pair)
+        score = float(pair["similarity_score"])
+        adjacency.setdefault(ka, {})[kb] = score
+        adjacency.setdefault(kb, {})[ka] = score
+
+    rows: list[dict[str, Any]] = []
+    verified_keys: set[tuple[str, str]] = set()
+    provider_used = "local_fallback"
+    stats = {
+        "clusters": 0,
+        "verification_calls": 0,
+        "inferred_pairs": 0,
+        "guard_fallback_calls": 0,
+        "pairwise_calls_avoided": 0,
+    }
+
+    def _verify(ka: str, kb: str, cluster_id: str) -> dict[str, Any] | None:
+        nonlocal provider_used
+        if stats["verification_calls"] >= limit:
+            return None
+        pair = edges[_pair_key(ka, kb)]
+        if verifier is not None:
+            result, provider = verifier(pair["market_a"], pair["market_b"], float(pair["similarity_score"]))
+        else:
+            result, provider = verify_pair(
+                market_a=pair["market_a"],
+                market_b=pair["market_b"],
+                similarity_score=float(pair["similarity_score"]),
+                settings=settings,
+                learned=learned,
+                index=index,
+            )
+        provider_used = provider
+        stats["verification_calls"] += 1
+        verified_keys.add(_pair_key(ka, kb))
+        rows.append(
+            {
+                "similarity_score": pair["similarity_score"],
+                "market_a": pair["market_a"],
+                "market_b": pair["market_b"],
+                "verification": result,
+                "provider": provider,
+                "time_decay_days": _resolution_day_gap(pair["market_a"], pair["market_b"], index),
+                "cluster_id": cluster_id,
+                "inferred": False,
+            }
+        )
+        return result
+
+    def _accepts(result: dict[str, Any] | None) -> bool:
+        return bool(
+            result
+            and result.get("is_match")
+            and float(result.get("confidence", 0.0)) >= match_threshold
+        )
+
+    for members in cluster_candidate_pairs(candidate_pairs):
+        stats["clusters"] += 1
+        rep = max(members, key=lambda k: (sum(adjacency[k].values()), len(adjacency[k])))
+        order = sorted(
+            (k for k in members if k != rep),
+            key=lambda k: adjacency[k].get(rep, 0.0),
+            reverse=True,
+        )
+        # Each sub-cluster: representative key -> {member key: edge verification to the cluster}.
+        subclusters: list[tuple[str, dict[str, dict[str, Any]]]] = [(rep, {})]
+        for member in order:
+            joined = False
+            links = adjacency[member]
+            # Try the most similar sub-cluster first so rejections rarely cost extra calls.
+            attempts = sorted(
+                (
+                    (max(links[k] for k in anchors), sub_rep, joined_edges, anchors)
+                    for sub_rep, joined_edges in subclusters
+                    for anchors in [[k for k in (sub_rep, *joined_edges) if k in links]]
+                    if anchors
+                ),
+                key=lambda row: row[0],
+                reverse=True,
+            )
+            for _, sub_rep, joined_edges, anchors in attempts:
+                anchor = sub_rep if sub_rep in links else max(anchors, key=lambda k: links[k])
+                result = _verify(member, anchor, rep)
+                if _accepts(result):
+                    # Chain through the anchor's own edge so inference stays conservative.
+                    if anchor != sub_rep:
+                        anchor_edge = joined_edges[anchor]
+                        result = dict(result)
+                        result["confidence"] = min(
+                            float(result["confidence"]), float(anchor_edge["confidence"])
+                        )
+                    joined_edges[member] = result
+                    joined = True
+                    break
+            if not joined:
+                subclusters.append((member, {}))
+
+        for sub_rep, joined_edges in subclusters:
+            if not joined_edges:
+                continue
+            joined_edges = {sub_rep: _SELF_EDGE, **joined_edges}
+            keys = list(joined_edges)
+            rep_title = str(markets[sub_rep].get("title", ""))
+            for i, kx in enumerate(keys):
+                for ky in keys[i + 1 :]:
+                    pkey = _pair_key(kx, ky)
+                    if pkey in verified_keys:
+                        continue
+                    if pkey not in edges:
+                        # Below the embedding threshold: A~R and R~B but A !~ B is the
+                        # classic non-transitive case, so never infer it.
+                        continue
+                    mx, my = markets[kx], markets[ky]
+                    ex, ey = joined_edges[kx], joined_edges[ky]
+                    if _transitive_guard(mx, my, ex, ey, index) is not None:
+                        if _verify(kx, ky, rep) is not None:
+                            stats["guard_fallback_calls"] += 1
+                        continue
+                    pair = edges[pkey]
+                    rows.append(
+                        {
+                            "similarity_score": pair["similarity_score"],
+                            "market_a": pair["market_a"],
+                            "market_b": pair["market_b"],
+                            "verification": _inferred_verification(
+                                pair["market_a"], ex, ey, rep_title
+                            ),
+                            "provider": "inferred",
+                            "time_decay_days": _resolution_day_gap(pair["market_a"], pair["market_b"], index),
+                            "cluster_id": rep,
+                            "inferred": True,
+                        }
+                    )
+                    stats["inferred_pairs"] += 1
+
+    stats["pairwise_calls_avoided"] = max(0, len(edges) - stats["verification_calls"])
+    rows.sort(key=lambda x: x["verification"]["confidence"], reverse=True)
+    return rows, provider_used, stats
@@ -0,0 +1,122 @@
+"""Per-platform fee schedules compiled into an array-indexed lookup table.
+
+Each platform has a taker fee curve (a flat rate on notional plus an optional
+probability-weighted term, as in Kalshi's `rate * p * (1 - p)` per contract),
+a settlement chain with its gas cost per leg, and a minimum ticket size. The
+schedules are compiled once into a `FeeTable` whose NumPy columns the
+vectorized scorer indexes with per-pair platform IDs.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any
+
+from src import jsonio
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - FeeTable falls back to per-leg Python
+    np = None  # type: ignore[assignment]
+
+# Estimated USD gas per leg on each settlement chain.
+CHAIN_GAS_USD = {
+    "offchain": 0.0,
+    "polygon": 0.0,
+    "bsc": 0.004,
+    "opbnb": 0.0005,
+}
+
+
+@dataclass(frozen=True)
+class FeeSchedule:
+    """Taker frictions for one platform."""
+
+    platform: str
+    chain: str = "bsc"
+    flat_fee_rate: float = 0.01
+    probability_fee_rate: float = 0.0
+    gas_cost_usd: float | None = None
+    min_ticket_usd: float = 1.0
+
+    @property
+    def leg_gas_usd(self) -> float:
+        """Gas per leg, from the override or the chain default."""
+        if self.gas_cost_usd is not None:
+            return self.gas_cost_usd
+        return CHAIN_GAS_USD.get(self.chain, CHAIN_GAS_USD["bsc"])
+
+    def leg_fee(self, price: float) -> float:
+        """Taker fee in USD for buying one contract at price."""
+        return price * self.flat_fee_rate + self.probability_fee_rate * price * (1.0 - price)
+
+
+DEFAULT_FEE_SCHEDULES: dict[str, FeeSchedule] = {
+    "kalshi": FeeSchedule("Kalshi", chain="offchain", flat_fee_rate=0.0, probability_fee_rate=0.07),
+    "polymarket": FeeSchedule("Polymarket", chain="polygon", flat_fee_rate=0.0),
+    "predict.fun": FeeSchedule("predict.fun", chain="bsc", flat_fee_rate=0.01),
+    "probable": FeeSchedule("probable", chain="bsc", flat_fee_rate=0.01),
+    "opinion": FeeSchedule("Opinion", chain="bsc", flat_fee_rate=0.01),
+    "xo market": FeeSchedule("XO Market", chain="bsc", flat_fee_rate=0.01),
+    "bento": FeeSchedule("Bento", chain="bsc", flat_fee_rate=0.01),
+}
+
+
+def _platform_key(platform: Any) -> str:
+    return str(platform).strip().lower()
+
+
+class FeeTable:
+    """Fee schedules resolved once into columns indexed by platform ID.
+
+    ID 0 is the fallback schedule for platforms without an entry.
+    """
+
+    def __init__(self, schedules: dict[str, FeeSchedule], fallback: FeeSchedule):
+        self.schedules = [fallback, *schedules.values()]
+        self._ids = {_platform_key(key): i + 1 for i, key in enumerate(schedules)}
+        columns = [
+            (s.flat_fee_rate, s.probability_fee_rate, s.leg_gas_usd, s.min_ticket_usd) for s in self.schedules
+        ]
+        if np is not None:
+            packed = np.array(columns, dtype=np.float64)
+            self.flat_rate, self.probability_rate, self.gas_usd, self.min_ticket_usd = packed.T
+
+    def platform_id(self, platform: Any) -> int:
+        """Return the row index for platform (0 when unknown)."""
+        return self._ids.get(_platform_key(platform), 0)
+
+    def schedule(self, platform: Any) -> FeeSchedule:
+        """Return the schedule that applies to platform."""
+        return self.schedules[self.platform_id(platform)]
+
+    def leg_fees(self, platform_ids: Any, prices: Any) -> Any:
+        """Vectorized `FeeSchedule.leg_fee` over arrays of platform IDs and prices."""
+        return prices * self.flat_rate[platform_ids] + self.probability_rate[platform_ids] * prices * (1.0 - prices)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the resolved schedules for reports."""
+        return {"fallback": asdict(self.schedules[0]), "schedules": [asdict(s) for s in self.schedules[1:]]}
+
+
+def load_fee_table(
+    path: Path | None = None, fee_rate: float = 0.01, gas_cost_usd: float = 0.004
+) -> FeeTable:
+    """Compile the default schedules, overridden by a JSON file when present.
+
+    The file maps platform names to partial `FeeSchedule` fields, e.g.
+    `{"Kalshi": {"probability_fee_rate": 0.035}, "Newvenue": {"chain": "opbnb"}}`.
+    Platforms with no schedule fall back to the global fee_rate, with
+    gas_cost_usd split across the two legs so an unknown pair costs the same
+    as under the global model.
+    """
+    schedules = dict(DEFAULT_FEE_SCHEDULES)
+    if path is not None and path.exists():
+        overrides = jsonio.read_json(path)
+        for platform, fields in overrides.items():
+            key = _platform_key(platform)
+            base = schedules.get(key, FeeSchedule(str(platform)))
+            schedules[key] = replace(base, **{k: v for k, v in fields.items() if k != "platform"})
+    fallback = FeeSchedule("default", flat_fee_rate=fee_rate, gas_cost_usd=gas_cost_usd / 2.0, min_ticket_usd=0.0)
+    return FeeTable(schedules, fallback)
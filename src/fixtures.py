@@ -0,0 +1,129 @@
+"""Record/replay store for connector HTTP and LLM traffic.
+
+In record mode every connector response and every LLM request/response pair
+is appended to a gzip-compressed JSONL store together with its latency. In
+replay mode the same requests are answered from the store, in recorded order
+per request, after a simulated delay (the recorded latency, or a fixed one),
+so full agent cycles can be re-run offline and deterministically. A request
+with no recording raises `FixtureMiss`, which callers treat like a failed
+call, exactly as a live failure would have been handled while recording.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from src import jsonio
+
+T = TypeVar("T")
+
+MODES = ("off", "record", "replay")
+
+
+class FixtureMiss(RuntimeError):
+    """No recorded response for a replayed request."""
+
+
+def fixture_key(kind: str, request: Any) -> str:
+    # Stdlib encoding on purpose: keys must stay stable across JSON backends.
+    payload = json.dumps({"kind": kind, "request": request}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class FixtureStore:
+    """One compressed traffic recording, opened for record or replay."""
+
+    def __init__(self, path: Path, mode: str = "replay", latency_ms: float | None = None):
+        if mode not in MODES or mode == "off":
+            raise ValueError(f"FixtureStore mode must be 'record' or 'replay', got {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.latency_ms = latency_ms
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._responses: dict[str, list[dict[str, Any]]] = {}
+        self._cursor: dict[str, int] = {}
+        if mode == "record":
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"")
+        else:
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    entry = jsonio.loads(line)
+                    self._responses.setdefault(entry["key"], []).append(entry)
+
+    def record(self, kind: str, request: Any, response: Any, elapsed: float) -> None:
+        entry = {
+            "key": fixture_key(kind, request),
+            "kind": kind,
+            "request": request,
+            "response": response,
+            "elapsed": round(elapsed, 6),
+        }
+        line = jsonio.dumps(entry, default=str) + "\n"
+        with self._lock:
+            # One gzip member per append keeps the file readable after a crash.
+            with gzip.open(self.path, "at", encoding="utf-8") as handle:
+                handle.write(line)
+            self.stats["recorded"] += 1
+
+    def replay(self, kind: str, request: Any) -> Any:
+        """Return the next recorded response for request, repeating the last once exhausted."""
+        key = fixture_key(kind, request)
+        with self._lock:
+            entries = self._responses.get(key)
+            if not entries:
+                self.stats["misses"] += 1
+                raise FixtureMiss(f"No recorded {kind} response for request {key}")
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            entry = entries[min(index, len(entries) - 1)]
+            self.stats["replayed"] += 1
+        delay = float(entry.get("elapsed", 0.0)) if self.latency_ms is None else self.latency_ms / 1000.0
+        if delay > 0:
+            time.sleep(delay)
+        return entry["response"]
+
+
+_ACTIVE: FixtureStore | None = None
+
+
+def activate_fixtures(store: FixtureStore | None) -> None:
+    """Route connector and LLM calls through store (None turns fixtures off)."""
+    global _ACTIVE
+    _ACTIVE = store
+
+
+def active_fixtures() -> FixtureStore | None:
+    return _ACTIVE
+
+
+def through_fixtures(kind: str, request: Any, live: Callable[[], T]) -> T:
+    """Call live() unless replaying; record its result when recording.
+
+    Results must be JSON-serializable. Exceptions from live() are not
+    recorded, so replay raises FixtureMiss at the same point.
+    """
+    store = _ACTIVE
+    if store is None:
+        return live()
+    if store.replaying:
+        return store.replay(kind, request)
+    started = time.perf_counter()
+    result = live()
+    store.record(kind, request, result, time.perf_counter() - started)
+    return result
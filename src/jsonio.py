@@ -0,0 +1,104 @@
+"""JSON encoding and decoding for every pipeline artifact, API read and connector payload.
+
+Uses orjson when it is installed and the stdlib `json` module otherwise; both
+backends produce the same documents. Output is compact by default (machine
+artifacts, JSONL lines, SSE frames); pass `pretty=True` for files people read
+or commit, which are indented by two spaces either way. Non-ASCII text is
+written as UTF-8 rather than escaped. Read-only mappings such as
+`market_model.Market` encode as the dict they present.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - stdlib fallback
+    orjson = None  # type: ignore[assignment]
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both backends.
+JSONDecodeError = json.JSONDecodeError
+
+
+def backend() -> str:
+    return "orjson" if orjson is not None else "json"
+
+
+def _orjson_options(pretty: bool, sort_keys: bool) -> int:
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    if pretty:
+        options |= orjson.OPT_INDENT_2
+    if sort_keys:
+        options |= orjson.OPT_SORT_KEYS
+    return options
+
+
+def _with_mappings(default: Callable[[Any], Any] | None) -> Callable[[Any], Any]:
+    """Wrap default so non-dict Mappings encode as dicts before default sees anything else."""
+
+    def encode(obj: Any) -> Any:
+        if isinstance(obj, Mapping):
+            return dict(obj)
+        if default is None:
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+        return default(obj)
+
+    return encode
+
+
+def _stdlib_dumps(obj: Any, pretty: bool, sort_keys: bool, default: Callable[[Any], Any] | None) -> str:
+    if pretty:
+        return json.dumps(obj, indent=2, sort_keys=sort_keys, default=default, ensure_ascii=False)
+    return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys, default=default, ensure_ascii=False)
+
+
+def dumpb(
+    obj: Any, pretty: bool = False, sort_keys: bool = False, default: Callable[[Any], Any] | None = None
+) -> bytes:
+    """Encode obj to UTF-8 JSON bytes."""
+    default = _with_mappings(default)
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default, option=_orjson_options(pretty, sort_keys))
+        except TypeError:
+            # Types orjson rejects (float subclasses, >64-bit ints) still encode via the stdlib.
+            pass
+    return _stdlib_dumps(obj, pretty, sort_keys, default).encode("utf-8")
+
+
+def dumps(
+    obj: Any, pretty: bool = False, sort_keys: bool = False, default: Callable[[Any], Any] | None = None
+) -> str:
+    """Encode obj to a JSON string."""
+    if orjson is not None:
+        return dumpb(obj, pretty=pretty, sort_keys=sort_keys, default=default).decode("utf-8")
+    return _stdlib_dumps(obj, pretty, sort_keys, _with_mappings(default))
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> Any:
+    """Decode a JSON document; raises JSONDecodeError on malformed input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: Path) -> Any:
+    """Decode a JSON file, tolerating a UTF-8 byte-order mark."""
+    data = path.read_bytes()
+    return loads(data[3:] if data.startswith(codecs.BOM_UTF8) else data)
+
+
+def write_json(payload: Any, path: Path, pretty: bool = False) -> None:
+    """Write payload to path, creating parent directories."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(dumpb(payload, pretty=pretty))
+
+
+def response_json(response: Any) -> Any:
+    """Decode an HTTP response body straight from its bytes (`requests`' `.json()` decodes text first)."""
+    return loads(response.content)
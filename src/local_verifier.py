@@ -0,0 +1,357 @@
+"""Learned local verifier trained from cached LLM verdicts.
+
+Every Anthropic/OpenAI verdict is a labelled example. This module turns pairs
+into a small numeric feature vector, fits logistic-regression heads for
+`is_match` and `arbitrage_safe`, and serves them as a sub-millisecond verifier
+tier ahead of the LLM chain.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from src import jsonio
+from src.market_features import MarketFeatureIndex, day_gap, jaccard
+
+LLM_PROVIDERS = {"anthropic", "openai"}
+FEATURE_NAMES = (
+    "similarity",
+    "text_overlap",
+    "title_overlap",
+    "same_date",
+    "log_date_gap",
+    "date_unknown",
+    "same_category",
+    "numeric_overlap",
+    "numeric_conflict",
+)
+
+
+def pair_features(
+    market_a: dict[str, Any],
+    market_b: dict[str, Any],
+    similarity_score: float,
+    index: MarketFeatureIndex | None = None,
+) -> list[float]:
+    """Return the feature vector (ordered as FEATURE_NAMES) for one pair."""
+    if index is None:
+        index = MarketFeatureIndex()
+    fa = index.features(market_a)
+    fb = index.features(market_b)
+    gap = day_gap(fa, fb)
+    return [
+        float(similarity_score),
+        jaccard(fa.text_tokens, fb.text_tokens),
+        jaccard(fa.title_tokens, fb.title_tokens),
+        1.0 if gap == 0 else 0.0,
+        math.log1p(gap) if gap is not None else 0.0,
+        1.0 if gap is None else 0.0,
+        1.0 if fa.category and fa.category == fb.category else 0.0,
+        jaccard(fa.numbers, fb.numbers),
+        1.0 if fa.numbers and fb.numbers and not (fa.numbers & fb.numbers) else 0.0,
+    ]
+
+
+def _sigmoid(z: float) -> float:
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    ez = math.exp(z)
+    return ez / (1.0 + ez)
+
+
+class LogisticHead:
+    """Standardized L2-regularized logistic regression over FEATURE_NAMES."""
+
+    def __init__(self, weights: list[float], bias: float, means: list[float], scales: list[float]):
+        self.weights = weights
+        self.bias = bias
+        self.means = means
+        self.scales = scales
+
+    def predict_proba(self, features: list[float]) -> float:
+        z = self.bias
+        for x, w, mu, sd in zip(features, self.weights, self.means, self.scales):
+            z += w * ((x - mu) / sd)
+        return _sigmoid(z)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"weights": self.weights, "bias": self.bias, "means": self.means, "scales": self.scales}
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "LogisticHead":
+        return cls(
+            weights=[float(x) for x in payload["weights"]],
+            bias=float(payload["bias"]),
+            means=[float(x) for x in payload["means"]],
+            scales=[float(x) for x in payload["scales"]],
+        )
+
+    @classmethod
+    def fit(
+        cls,
+        rows: list[list[float]],
+        labels: list[int],
+        l2: float = 0.01,
+        learning_rate: float = 0.5,
+        epochs: int = 400,
+    ) -> "LogisticHead":
+        """Fit by full-batch gradient descent; datasets here are thousands of rows at most."""
+        dims = len(FEATURE_NAMES)
+        n = len(rows)
+        means = [sum(r[i] for r in rows) / n for i in range(dims)]
+        scales = []
+        for i in range(dims):
+            var = sum((r[i] - means[i]) ** 2 for r in rows) / n
+            scales.append(math.sqrt(var) or 1.0)
+        xs = [[(r[i] - means[i]) / scales[i] for i in range(dims)] for r in rows]
+
+        weights = [0.0] * dims
+        positives = sum(labels)
+        prior = min(max(positives / n, 1e-3), 1 - 1e-3)
+        bias = math.log(prior / (1 - prior))
+        for _ in range(epochs):
+            grad_w = [0.0] * dims
+            grad_b = 0.0
+            for x, y in zip(xs, labels):
+                err = _sigmoid(bias + sum(w * v for w, v in zip(weights, x))) - y
+                grad_b += err
+                for i in range(dims):
+                    grad_w[i] += err * x[i]
+            bias -= learning_rate * grad_b / n
+            weights = [w - learning_rate * (g / n + l2 * w) for w, g in zip(weights, grad_w)]
+        return cls(weights=weights, bias=bias, means=means, scales=scales)
+
+
+def calibration_report(probs: list[float], labels: list[int], bins: int = 10) -> dict[str, Any]:
+    """Accuracy, precision/recall, Brier, log-loss and ECE against held-out labels."""
+    n = len(probs)
+    if n == 0:
+        return {"count": 0}
+    tp = sum(1 for p, y in zip(probs, labels) if p >= 0.5 and y == 1)
+    fp = sum(1 for p, y in zip(probs, labels) if p >= 0.5 and y == 0)
+    fn = sum(1 for p, y in zip(probs, labels) if p < 0.5 and y == 1)
+    correct = sum(1 for p, y in zip(probs, labels) if (p >= 0.5) == bool(y))
+    eps = 1e-12
+    log_loss = -sum(
+        y * math.log(max(p, eps)) + (1 - y) * math.log(max(1 - p, eps)) for p, y in zip(probs, labels)
+    ) / n
+
+    reliability: list[dict[str, Any]] = []
+    ece = 0.0
+    for b in range(bins):
+        lo, hi = b / bins, (b + 1) / bins
+        idx = [i for i, p in enumerate(probs) if lo <= p < hi or (b == bins - 1 and p == 1.0)]
+        if not idx:
+            continue
+        mean_p = sum(probs[i] for i in idx) / len(idx)
+        frac_pos = sum(labels[i] for i in idx) / len(idx)
+        ece += len(idx) / n * abs(mean_p - frac_pos)
+        reliability.append(
+            {"bin": f"{lo:.1f}-{hi:.1f}", "count": len(idx), "mean_prob": round(mean_p, 4), "positive_rate": round(frac_pos, 4)}
+        )
+
+    return {
+        "count": n,
+        "accuracy": round(correct / n, 4),
+        "precision": round(tp / (tp + fp), 4) if tp + fp else 0.0,
+        "recall": round(tp / (tp + fn), 4) if tp + fn else 0.0,
+        "brier": round(sum((p - y) ** 2 for p, y in zip(probs, labels)) / n, 4),
+        "log_loss": round(log_loss, 4),
+        "ece": round(ece, 4),
+        "reliability": reliability,
+    }
+
+
+def _pair_id(row: dict[str, Any]) -> str:
+    ids = sorted([str(row["market_a"].get("market_id", "")), str(row["market_b"].get("market_id", ""))])
+    return "|".join(ids)
+
+
+def _is_holdout(pair_id: str, holdout_fraction: float) -> bool:
+    """Deterministic split so retraining keeps the same evaluation set."""
+    bucket = int.from_bytes(hashlib.sha256(pair_id.encode("utf-8")).digest()[:4], "big") / 2**32
+    return bucket < holdout_fraction
+
+
+def load_labelled_verdicts(paths: list[Path]) -> list[dict[str, Any]]:
+    """Load LLM-labelled rows from verified_matches.json and verdict-history JSONL files.
+
+    Later files win when the same pair appears more than once.
+    """
+    latest: dict[str, dict[str, Any]] = {}
+    for path in paths:
+        if not path.exists():
+            continue
+        if path.suffix == ".jsonl":
+            rows = [jsonio.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+        else:
+            payload = jsonio.read_json(path)
+            rows = payload.get("all_verifications", [])
+            default_provider = payload.get("provider", "")
+            rows = [{"provider": default_provider, **row} for row in rows]
+        for row in rows:
+            if str(row.get("provider", "")) not in LLM_PROVIDERS:
+                continue
+            if row.get("inferred"):
+                continue
+            latest[_pair_id(row)] = row
+    return list(latest.values())
+
+
+def append_verdict_history(rows: list[dict[str, Any]], path: Path) -> int:
+    """Append LLM-labelled verification rows to the training history file."""
+    labelled = [row for row in rows if str(row.get("provider", "")) in LLM_PROVIDERS and not row.get("inferred")]
+    if not labelled:
+        return 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as handle:
+        for row in labelled:
+            handle.write(
+                jsonio.dumps(
+                    {
+                        "provider": row["provider"],
+                        "similarity_score": row["similarity_score"],
+                        "market_a": row["market_a"],
+                        "market_b": row["market_b"],
+                        "verification": row["verification"],
+                    }
+                )
+                + "\n"
+            )
+    return len(labelled)
+
+
+def train_local_verifier(
+    rows: list[dict[str, Any]], holdout_fraction: float = 0.2, min_examples: int = 20
+) -> dict[str, Any]:
+    """Fit match/safety heads and return a serializable model with calibration stats."""
+    if len(rows) < min_examples:
+        raise ValueError(f"Need at least {min_examples} LLM-labelled pairs, got {len(rows)}.")
+
+    index = MarketFeatureIndex()
+    train_x: list[list[float]] = []
+    test_x: list[list[float]] = []
+    labels: dict[str, tuple[list[int], list[int]]] = {"match": ([], []), "safe": ([], [])}
+    for row in rows:
+        feats = pair_features(row["market_a"], row["market_b"], float(row["similarity_score"]), index)
+        ver = row.get("verification", {})
+        is_match = int(bool(ver.get("is_match", False)))
+        is_safe = int(
+            bool(ver.get("arbitrage_safe", False))
+            and str(ver.get("resolution_verdict", "CAUTION")).upper() == "SAFE"
+        )
+        split = 1 if _is_holdout(_pair_id(row), holdout_fraction) else 0
+        (test_x if split else train_x).append(feats)
+        labels["match"][split].append(is_match)
+        labels["safe"][split].append(is_safe)
+
+    if not train_x:
+        raise ValueError("Holdout split left no training rows.")
+
+    heads: dict[str, Any] = {}
+    calibration: dict[str, Any] = {}
+    for name, (train_y, test_y) in labels.items():
+        head = LogisticHead.fit(train_x, train_y)
+        heads[name] = head.to_dict()
+        calibration[name] = calibration_report([head.predict_proba(x) for x in test_x], test_y)
+
+    return {
+        "version": 1,
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+        "feature_names": list(FEATURE_NAMES),
+        "train_count": len(train_x),
+        "holdout_count": len(test_x),
+        "heads": heads,
+        "calibration": calibration,
+    }
+
+
+class LearnedVerifier:
+    """Runtime wrapper producing verifier-shaped results from a trained model."""
+
+    def __init__(self, model: dict[str, Any]):
+        if list(model.get("feature_names", [])) != list(FEATURE_NAMES):
+            raise ValueError("Model feature layout does not match this build.")
+        self.match_head = LogisticHead.from_dict(model["heads"]["match"])
+        self.safe_head = LogisticHead.from_dict(model["heads"]["safe"])
+        self.calibration = model.get("calibration", {})
+
+    def verify(
+        self,
+        market_a: dict[str, Any],
+        market_b: dict[str, Any],
+        similarity_score: float,
+        index: MarketFeatureIndex | None = None,
+    ) -> dict[str, Any]:
+        """Score one pair and return a result in the `_validate_result` shape."""
+        feats = pair_features(market_a, market_b, similarity_score, index)
+        p_match = self.match_head.predict_proba(feats)
+        p_safe = self.safe_head.predict_proba(feats)
+        is_match = p_match >= 0.5
+        risk_score = max(0, min(100, int(round((1.0 - p_safe) * 100))))
+        resolution_verdict = "SAFE" if risk_score < 30 else ("DANGER" if risk_score > 70 else "CAUTION")
+        arbitrage_safe = bool(is_match and resolution_verdict == "SAFE")
+        return {
+            "is_match": is_match,
+            "confidence": round(p_match, 4),
+            "reasoning": (
+                f"Learned verifier: match probability {p_match:.3f} from similarity, overlap, date and entity features."
+            ),
+            "event_summary": market_a.get("title", ""),
+            "outcome_mapping": [
+                {"a_outcome": "Yes", "b_outcome": "Yes", "relation": "equivalent"},
+                {"a_outcome": "No", "b_outcome": "No", "relation": "equivalent"},
+            ],
+            "key_differences": [] if is_match else ["Learned verifier predicts different underlying events."],
+            "risk_factors": [] if arbitrage_safe else ["Resolution criteria may diverge across platforms."],
+            "arbitrage_safe": arbitrage_safe,
+            "resolution_conflict_score": risk_score,
+            "resolution_verdict": resolution_verdict,
+            "resolution_analysis": f"Learned safety probability {p_safe:.3f}.",
+            "safety_probability": round(p_safe, 4),
+        }
+
+    def is_decisive(self, result: dict[str, Any], min_confidence: float) -> bool:
+        """True when the result is confident enough to skip the LLM.
+
+        A non-match only needs a decisive match head. A match also needs a
+        decisive safety head, since its resolution verdict comes from there.
+        """
+        p = float(result["confidence"])
+        if p <= 1.0 - min_confidence:
+            return True
+        if p < min_confidence:
+            return False
+        p_safe = float(result.get("safety_probability", 0.5))
+        return p_safe >= min_confidence or p_safe <= 1.0 - min_confidence
+
+    @staticmethod
+    def capped(result: dict[str, Any]) -> dict[str, Any]:
+        """Copy of an indecisive result with a SAFE verdict downgraded to CAUTION."""
+        if result.get("resolution_verdict") != "SAFE":
+            return result
+        return {
+            **result,
+            "resolution_verdict": "CAUTION",
+            "arbitrage_safe": False,
+            "risk_factors": [*result.get("risk_factors", []), "Learned verifier was not confident; not LLM-checked."],
+        }
+
+
+def save_local_verifier(model: dict[str, Any], path: Path) -> None:
+    """Persist a trained model JSON."""
+    jsonio.write_json(model, path)
+
+
+def load_local_verifier(path: Path) -> LearnedVerifier | None:
+    """Load a trained model, or None when missing or incompatible."""
+    if not path.exists():
+        return None
+    try:
+        return LearnedVerifier(jsonio.read_json(path))
+    except Exception:
+        return None
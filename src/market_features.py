@@ -0,0 +1,130 @@
+"""Per-market feature index shared by local verification tiers.
+
+Titles and descriptions are tokenized once per market per cycle into sets of
+interned integer IDs, dates are parsed to ordinals and numeric entities are
+normalized, so pair-level checks reduce to a few set intersections.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date
+from typing import Any
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_NUMBER_RE = re.compile(r"(\d+(?:[.,]\d+)*)\s*(k|m|b|t|bn|trillion|billion|million|%)?")
+_SCALE = {"k": 1e3, "m": 1e6, "b": 1e9, "bn": 1e9, "t": 1e12, "million": 1e6, "billion": 1e9, "trillion": 1e12}
+
+# Event anchors the hand-tuned fallback requires at least one of.
+STRONG_TOKENS = frozenset(
+    {"bitcoin", "india", "world", "cup", "mars", "usdc", "ethereum", "gold", "recession", "solana", "etf", "gdp"}
+)
+
+
+def numeric_entities(text: str) -> frozenset[float]:
+    """Extract normalized numeric entities (150k -> 150000.0, 70% -> 70.0)."""
+    values: set[float] = set()
+    for raw, suffix in _NUMBER_RE.findall(text.lower()):
+        try:
+            value = float(raw.replace(",", ""))
+        except ValueError:
+            continue
+        values.add(value * _SCALE.get(suffix, 1.0))
+    return frozenset(values)
+
+
+def date_ordinal(value: Any) -> int | None:
+    """Parse an ISO date into a proleptic ordinal, or None."""
+    try:
+        return date.fromisoformat(str(value)).toordinal()
+    except ValueError:
+        return None
+
+
+class MarketFeatures:
+    """Pre-parsed features of one market."""
+
+    __slots__ = ("text_tokens", "title_tokens", "date_text", "date_ordinal", "category", "numbers", "strong_tokens")
+
+    def __init__(
+        self,
+        text_tokens: frozenset[int],
+        title_tokens: frozenset[int],
+        date_text: str,
+        date_ordinal: int | None,
+        category: str,
+        numbers: frozenset[float],
+        strong_tokens: frozenset[int],
+    ):
+        self.text_tokens = text_tokens
+        self.title_tokens = title_tokens
+        self.date_text = date_text
+        self.date_ordinal = date_ordinal
+        self.category = category
+        self.numbers = numbers
+        self.strong_tokens = strong_tokens
+
+
+def jaccard(lhs: frozenset[Any], rhs: frozenset[Any]) -> float:
+    """Jaccard index using one intersection and set sizes."""
+    if not lhs or not rhs:
+        return 0.0
+    inter = len(lhs & rhs)
+    return inter / (len(lhs) + len(rhs) - inter)
+
+
+class MarketFeatureIndex:
+    """Cycle-scoped cache of MarketFeatures keyed by market identity and content."""
+
+    def __init__(self) -> None:
+        self.vocab: dict[str, int] = {}
+        self._features: dict[tuple[str, ...], MarketFeatures] = {}
+        self.strong_ids = frozenset(self.intern(token) for token in STRONG_TOKENS)
+
+    def intern(self, token: str) -> int:
+        """Return the integer ID for token, assigning one if new."""
+        token_id = self.vocab.get(token)
+        if token_id is None:
+            token_id = len(self.vocab)
+            self.vocab[token] = token_id
+        return token_id
+
+    def _token_ids(self, text: str) -> frozenset[int]:
+        intern = self.intern
+        return frozenset(intern(token) for token in _TOKEN_RE.findall(text))
+
+    def features(self, market: dict[str, Any]) -> MarketFeatures:
+        """Return cached features for market, computing them on first use."""
+        title = str(market.get("title", ""))
+        description = str(market.get("description", ""))
+        date_text = str(market.get("resolution_date", ""))
+        category = str(market.get("category", ""))
+        key = (str(market.get("market_id", "")), title, description, date_text, category)
+        cached = self._features.get(key)
+        if cached is not None:
+            return cached
+
+        title_lower = title.lower()
+        text_lower = f"{title_lower} {description.lower()}"
+        text_tokens = self._token_ids(text_lower)
+        features = MarketFeatures(
+            text_tokens=text_tokens,
+            title_tokens=self._token_ids(title_lower),
+            date_text=date_text,
+            date_ordinal=date_ordinal(date_text),
+            category=category.strip().lower(),
+            numbers=numeric_entities(text_lower),
+            strong_tokens=text_tokens & self.strong_ids,
+        )
+        self._features[key] = features
+        return features
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+
+def day_gap(fa: MarketFeatures, fb: MarketFeatures) -> int | None:
+    """Absolute resolution-date gap in days, when both dates parse."""
+    if fa.date_ordinal is None or fb.date_ordinal is None:
+        return None
+    return abs(fa.date_ordinal - fb.date_ordinal)
@@ -0,0 +1,225 @@
+"""Compact slotted market record with pre-parsed prices, liquidity and dates.
+
+Normalized markets are JSON-shaped dicts whose prices live in an `outcomes`
+list that every stage re-scans. `Market` keeps the same data in `__slots__`:
+yes/no price and liquidity as plain attributes, the minimum side liquidity,
+the resolution date as an ordinal, and interned platform/category strings.
+Anything else (source ids, token ids, quality fields, order books) is kept in
+`extra`, and the original key order is kept as a shared, interned layout, so
+`Market.from_dict(d).to_dict() == d` including key order.
+
+`Market` implements the read-only `Mapping` protocol, so code that reads
+`market["platform"]` or `market.get("title")` works unchanged. Collection
+builds one `Market` per normalized market and every stage after it (delta
+sync, embedding, pairing, verification, detection, the `OpportunityBook`)
+passes that same object along; changes go through `with_prices` and
+`with_orderbook`, which copy the slots instead of rebuilding the dict. The
+detector's price, liquidity and date helpers use the attributes directly.
+Dicts come back only at the edges: `jsonio` encodes any `Mapping` as its
+dict, and `to_dict()` (or `as_market_dict`) serves other encoders.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Iterator
+
+from src.market_features import date_ordinal
+
+_CORE_KEYS = frozenset({"platform", "market_id", "title", "description", "resolution_date", "category"})
+_OUTCOME_KEYS = ("name", "price", "liquidity")
+# Shared key-order tuples, so each market holds a reference instead of a copy.
+_LAYOUTS: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+
+def _layout(keys: tuple[str, ...]) -> tuple[str, ...]:
+    return _LAYOUTS.setdefault(keys, keys)
+
+
+def _standard_outcomes(outcomes: Any) -> bool:
+    """True for exactly [Yes, No] outcome dicts with name/price/liquidity keys and float prices."""
+    if not isinstance(outcomes, list) or len(outcomes) != 2:
+        return False
+    for outcome, name in zip(outcomes, ("Yes", "No")):
+        if not isinstance(outcome, dict) or tuple(outcome) != _OUTCOME_KEYS or outcome["name"] != name:
+            return False
+        if type(outcome["price"]) is not float or type(outcome["liquidity"]) not in (int, float):
+            return False
+    return True
+
+
+class Market(Mapping):
+    """One normalized market; see the module docstring for the dict mapping."""
+
+    __slots__ = (
+        "platform",
+        "market_id",
+        "title",
+        "description",
+        "category",
+        "resolution_date",
+        "resolution_ordinal",
+        "yes_price",
+        "no_price",
+        "yes_liquidity",
+        "no_liquidity",
+        "min_liquidity",
+        "extra",
+        "layout",
+    )
+
+    def __init__(
+        self,
+        platform: str,
+        market_id: str,
+        title: str,
+        description: str,
+        category: str,
+        resolution_date: str,
+        yes_price: float,
+        no_price: float,
+        yes_liquidity: float,
+        no_liquidity: float,
+        extra: dict[str, Any] | None = None,
+        layout: tuple[str, ...] | None = None,
+    ):
+        self.platform = sys.intern(platform)
+        self.market_id = market_id
+        self.title = title
+        self.description = description
+        self.category = sys.intern(category)
+        self.resolution_date = resolution_date
+        self.resolution_ordinal = date_ordinal(resolution_date)
+        self.yes_price = yes_price
+        self.no_price = no_price
+        self.yes_liquidity = yes_liquidity
+        self.no_liquidity = no_liquidity
+        self.min_liquidity = float(min(yes_liquidity, no_liquidity))
+        self.extra = extra or None
+        self.layout = layout or _layout(
+            ("platform", "market_id", "title", "description", "outcomes", "resolution_date", "category")
+            + tuple(self.extra or ())
+        )
+
+    @classmethod
+    def from_dict(cls, market: dict[str, Any]) -> Market:
+        """Build from a normalized market dict; unusual fields are kept verbatim in `extra`."""
+        if isinstance(market, Market):
+            return market
+        extra = {key: value for key, value in market.items() if key not in _CORE_KEYS and key != "outcomes"}
+        outcomes = market.get("outcomes")
+        if _standard_outcomes(outcomes):
+            yes, no = outcomes
+            yes_price, no_price = yes["price"], no["price"]
+            yes_liquidity, no_liquidity = yes["liquidity"], no["liquidity"]
+        else:
+            # Kept as-is for a lossless round trip; prices are derived like the detector does.
+            if "outcomes" in market:
+                extra["outcomes"] = outcomes
+            yes_price = no_price = 0.0
+            liquidities = []
+            for outcome in outcomes or []:
+                name = str(outcome.get("name", "")).strip().lower()
+                if name == "yes":
+                    yes_price = float(outcome.get("price", 0.0))
+                elif name == "no":
+                    no_price = float(outcome.get("price", 0.0))
+                liquidities.append(float(outcome.get("liquidity", 0.0)))
+            yes_liquidity = no_liquidity = min(liquidities) if liquidities else 0.0
+        return cls(
+            platform=str(market.get("platform", "")),
+            market_id=market.get("market_id", ""),
+            title=market.get("title", ""),
+            description=market.get("description", ""),
+            category=str(market.get("category", "")),
+            resolution_date=market.get("resolution_date", ""),
+            yes_price=yes_price,
+            no_price=no_price,
+            yes_liquidity=yes_liquidity,
+            no_liquidity=no_liquidity,
+            extra=extra,
+            layout=_layout(tuple(market)),
+        )
+
+    @property
+    def has_standard_outcomes(self) -> bool:
+        """False when outcomes are missing, or were not a plain Yes/No pair and are kept in `extra`."""
+        return "outcomes" in self.layout and (self.extra is None or "outcomes" not in self.extra)
+
+    def _outcomes(self) -> list[dict[str, Any]]:
+        if self.extra is not None and "outcomes" in self.extra:
+            return self.extra["outcomes"]
+        return [
+            {"name": "Yes", "price": self.yes_price, "liquidity": self.yes_liquidity},
+            {"name": "No", "price": self.no_price, "liquidity": self.no_liquidity},
+        ]
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "outcomes":
+            if "outcomes" not in self.layout:
+                raise KeyError(key)
+            return self._outcomes()
+        if key in _CORE_KEYS and key in self.layout:
+            return getattr(self, key)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.layout)
+
+    def __len__(self) -> int:
+        return len(self.layout)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Rebuild the normalized dict, in the original key order."""
+        return {key: self[key] for key in self.layout}
+
+    def _copy(self) -> Market:
+        clone = Market.__new__(Market)
+        for slot in Market.__slots__:
+            setattr(clone, slot, getattr(self, slot))
+        return clone
+
+    def with_prices(self, yes_price: float, no_price: float) -> Market:
+        """Copy with new Yes/No prices, rounded and without a stale order book, like `data_collector.with_prices`."""
+        if not self.has_standard_outcomes:
+            from src.data_collector import with_prices
+
+            return Market.from_dict(with_prices(self.to_dict(), yes_price, no_price))
+        clone = self._copy()
+        clone.yes_price = round(yes_price, 4)
+        clone.no_price = round(no_price, 4)
+        if self.extra is not None and "orderbook" in self.extra:
+            clone.extra = {key: value for key, value in self.extra.items() if key != "orderbook"} or None
+            clone.layout = _layout(tuple(key for key in self.layout if key != "orderbook"))
+        return clone
+
+    def with_orderbook(self, orderbook: dict[str, Any] | None) -> Market:
+        """Copy with `orderbook` set to a fetched depth ladder, or removed when None."""
+        clone = self._copy()
+        extra = {key: value for key, value in (self.extra or {}).items() if key != "orderbook"}
+        if orderbook is None:
+            clone.layout = _layout(tuple(key for key in self.layout if key != "orderbook"))
+        else:
+            extra["orderbook"] = orderbook
+            if "orderbook" not in self.layout:
+                clone.layout = _layout(self.layout + ("orderbook",))
+        clone.extra = extra or None
+        return clone
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Market):
+            return self.to_dict() == other.to_dict()
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"Market({self.platform!r}, {self.market_id!r}, yes={self.yes_price}, no={self.no_price})"
+
+
+def as_market_dict(market: Market | dict[str, Any]) -> dict[str, Any]:
+    """Return a JSON-ready dict for a Market or pass a dict through."""
+    return market.to_dict() if isinstance(market, Market) else market
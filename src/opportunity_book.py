@@ -0,0 +1,215 @@
+"""In-memory opportunity book with incremental re-scoring on price ticks.
+
+The book indexes accepted matches by market id and by equivalence cluster. A
+price update for one market recomputes only the pairwise opportunities that
+involve it and the event-level opportunity of its cluster, keeps a ranked
+list current with bisect insertion, and emits add/update/remove events
+(tagged "pair" or "cluster") to its subscribers.
+"""
+
+from __future__ import annotations
+
+import bisect
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from src.arbitrage_detector import _detect_rowwise, _is_tradeable_match, detect_cluster_opportunities
+from src.event_clustering import UnionFind, market_key
+from src.market_model import Market
+from src.orderbook import attach_depth_sizing
+
+if TYPE_CHECKING:
+    from src.fee_schedules import FeeTable
+
+BookEvent = dict[str, Any]
+
+
+def _match_key(item: dict[str, Any]) -> str:
+    return f"{market_key(item['market_a'])}|{market_key(item['market_b'])}"
+
+
+def _event(
+    kind: str, key: str, previous: dict[str, Any] | None, opportunity: dict[str, Any] | None
+) -> BookEvent | None:
+    if opportunity is None:
+        return None if previous is None else {"type": "remove", "kind": kind, "key": key, "opportunity": previous}
+    if previous is None:
+        return {"type": "add", "kind": kind, "key": key, "opportunity": opportunity}
+    if previous["economics"] == opportunity["economics"] and previous["score"] == opportunity["score"]:
+        return None
+    return {
+        "type": "update",
+        "kind": kind,
+        "key": key,
+        "opportunity": opportunity,
+        "previous_score": previous["score"],
+    }
+
+
+class OpportunityBook:
+    """Ranked, market-indexed view over opportunities from accepted matches."""
+
+    def __init__(
+        self,
+        fee_rate: float = 0.01,
+        slippage_rate: float = 0.005,
+        gas_cost_usd: float = 0.004,
+        fee_table: FeeTable | None = None,
+        depth_sizing: bool = False,
+    ):
+        self.fee_rate = fee_rate
+        self.slippage_rate = slippage_rate
+        self.gas_cost_usd = gas_cost_usd
+        self.fee_table = fee_table
+        self.depth_sizing = depth_sizing
+        self._matches: dict[str, dict[str, Any]] = {}
+        self._by_market: dict[str, set[str]] = {}
+        # Slotted markets: a price tick replaces two floats instead of copying outcome dicts.
+        self._markets: dict[str, Market] = {}
+        self._opportunities: dict[str, dict[str, Any]] = {}
+        self._ranking: list[tuple[float, str]] = []
+        # Cluster root per market, the match keys forming each cluster, and its event-level opportunity.
+        self._cluster_of: dict[str, str] = {}
+        self._cluster_matches: dict[str, list[str]] = {}
+        self._clusters: dict[str, dict[str, Any]] = {}
+        self._subscribers: list[Callable[[BookEvent], None]] = []
+
+    def subscribe(self, callback: Callable[[BookEvent], None]) -> None:
+        """Register a callback invoked with every add/update/remove event."""
+        self._subscribers.append(callback)
+
+    def load_matches(self, accepted_matches: list[dict[str, Any]]) -> list[BookEvent]:
+        """Replace the tracked match set and return the resulting events.
+
+        Opportunities that survive the reload with the same economics emit
+        nothing; the rest are reported as added, updated or removed.
+        """
+        self._matches.clear()
+        self._by_market.clear()
+        self._markets.clear()
+        self._cluster_matches.clear()
+        uf = UnionFind()
+        for item in accepted_matches:
+            if not _is_tradeable_match(item):
+                continue
+            key = _match_key(item)
+            self._matches[key] = item
+            for market in (item["market_a"], item["market_b"]):
+                mid = market_key(market)
+                self._markets[mid] = Market.from_dict(market)
+                self._by_market.setdefault(mid, set()).add(key)
+            uf.union(market_key(item["market_a"]), market_key(item["market_b"]))
+        self._cluster_of = {mid: uf.find(mid) for mid in self._markets}
+        for key, item in self._matches.items():
+            self._cluster_matches.setdefault(self._cluster_of[market_key(item["market_a"])], []).append(key)
+
+        events = [self._set(key, None) for key in list(self._opportunities) if key not in self._matches]
+        events += [self._set_cluster(root, None) for root in list(self._clusters) if root not in self._cluster_matches]
+        events += [self._recompute(key) for key in self._matches]
+        events += [self._recompute_cluster(root) for root in self._cluster_matches]
+        return self._emit(events)
+
+    def apply_price_update(self, market_id: str, yes_price: float, no_price: float) -> list[BookEvent]:
+        """Apply one market's new prices and re-score only the matches and cluster that use it."""
+        market = self._markets.get(market_id)
+        if market is None:
+            return []
+        updated = market.with_prices(yes_price, no_price)
+        if updated.yes_price == market.yes_price and updated.no_price == market.no_price:
+            return []
+        self._markets[market_id] = updated
+        return self._rescore([market_id])
+
+    def update_markets(self, markets: Iterable[dict[str, Any]]) -> list[BookEvent]:
+        """Replace tracked markets' records (e.g. new prices plus a fresh order book) and re-score them."""
+        changed = []
+        for market in markets:
+            mid = market_key(market)
+            if mid in self._markets:
+                self._markets[mid] = market if isinstance(market, Market) else Market.from_dict(market)
+                changed.append(mid)
+        return self._rescore(changed)
+
+    def ranked(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Return opportunities ordered by score, best first."""
+        keys = self._ranking if limit is None else self._ranking[:limit]
+        return [self._opportunities[key] for _, key in keys]
+
+    def clusters(self) -> list[dict[str, Any]]:
+        """Return event-level opportunities, one per cluster, ordered by score."""
+        return sorted(self._clusters.values(), key=lambda row: row["score"], reverse=True)
+
+    def matches(self) -> list[dict[str, Any]]:
+        """Return tracked matches carrying the latest known market prices."""
+        return [self._current_item(key) for key in self._matches]
+
+    def __len__(self) -> int:
+        return len(self._opportunities)
+
+    def _current_item(self, key: str) -> dict[str, Any]:
+        item = self._matches[key]
+        return {
+            **item,
+            "market_a": self._markets[market_key(item["market_a"])],
+            "market_b": self._markets[market_key(item["market_b"])],
+        }
+
+    def _rescore(self, market_ids: list[str]) -> list[BookEvent]:
+        keys = dict.fromkeys(key for mid in market_ids for key in sorted(self._by_market.get(mid, ())))
+        roots = dict.fromkeys(self._cluster_of[mid] for mid in market_ids if mid in self._cluster_of)
+        events = [self._recompute(key) for key in keys]
+        events += [self._recompute_cluster(root) for root in roots if root in self._cluster_matches]
+        return self._emit(events)
+
+    def _size(self, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Depth-size rows; those no longer profitable at executable depth are dropped."""
+        if self.depth_sizing and rows:
+            attach_depth_sizing(rows, fee_rate=self.fee_rate, gas_cost_usd=self.gas_cost_usd, fee_table=self.fee_table)
+            rows = [row for row in rows if row["economics"]["net_profit"] > 0]
+        return rows
+
+    def _recompute(self, key: str) -> BookEvent | None:
+        rows = self._size(
+            _detect_rowwise(
+                [self._current_item(key)], self.fee_rate, self.slippage_rate, self.gas_cost_usd, self.fee_table
+            )
+        )
+        return self._set(key, rows[0] if rows else None)
+
+    def _recompute_cluster(self, root: str) -> BookEvent | None:
+        rows = self._size(
+            detect_cluster_opportunities(
+                [self._current_item(key) for key in self._cluster_matches[root]],
+                self.fee_rate,
+                self.slippage_rate,
+                self.gas_cost_usd,
+                self.fee_table,
+            )
+        )
+        return self._set_cluster(root, rows[0] if rows else None)
+
+    def _set(self, key: str, opportunity: dict[str, Any] | None) -> BookEvent | None:
+        previous = self._opportunities.get(key)
+        if previous is not None:
+            idx = bisect.bisect_left(self._ranking, (-previous["score"], key))
+            del self._ranking[idx]
+        if opportunity is None:
+            self._opportunities.pop(key, None)
+        else:
+            self._opportunities[key] = opportunity
+            bisect.insort(self._ranking, (-opportunity["score"], key))
+        return _event("pair", key, previous, opportunity)
+
+    def _set_cluster(self, root: str, opportunity: dict[str, Any] | None) -> BookEvent | None:
+        previous = self._clusters.get(root)
+        if opportunity is None:
+            self._clusters.pop(root, None)
+        else:
+            self._clusters[root] = opportunity
+        return _event("cluster", root, previous, opportunity)
+
+    def _emit(self, events: list[BookEvent | None]) -> list[BookEvent]:
+        out = [event for event in events if event is not None]
+        for event in out:
+            for callback in self._subscribers:
+                callback(event)
+        return out
@@ -0,0 +1,299 @@
+"""Order-book depth model and size-aware arbitrage economics.
+
+A market may carry `orderbook = {"yes": [[price, size], ...], "no": [...]}`
+holding ask levels (price per contract in dollars, size in contracts). When
+no book is attached, a single level is synthesized from the outcome price and
+its USD liquidity. Sizing walks both legs' ladders together and stops at the
+first level where one more YES+NO pair no longer pays out more than it costs.
+When both markets carry real books, the walked size and profit replace the
+opportunity's flat-slippage economics and score; the flat slippage rate
+remains the fallback for markets without a book. Fees are a flat rate on
+notional, or per-leg fee curves and chain gas from a `FeeTable`.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable
+
+from src.market_model import Market
+
+if TYPE_CHECKING:
+    from src.fee_schedules import FeeTable
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - fall back to the two-pointer walk
+    np = None  # type: ignore[assignment]
+
+Ladder = list[tuple[float, float]]
+# Taker fee in USD per contract bought at a price; must also accept NumPy arrays.
+LegFee = Callable[[Any], Any]
+
+
+def ladder_for(market: dict[str, Any], side: str) -> Ladder:
+    """Return ascending ask levels for side ("yes" or "no") of a market."""
+    book = market.get("orderbook") or {}
+    levels = book.get(side)
+    if levels:
+        ladder = [(float(price), float(size)) for price, size in levels if float(size) > 0 and float(price) > 0]
+        ladder.sort()
+        return ladder
+
+    for outcome in market.get("outcomes", []):
+        if str(outcome.get("name", "")).strip().lower() == side:
+            price = float(outcome.get("price", 0.0))
+            liquidity = float(outcome.get("liquidity", 0.0))
+            if price > 0 and liquidity > 0:
+                return [(price, liquidity / price)]
+    return []
+
+
+def _empty_sizing() -> dict[str, float]:
+    return {
+        "max_size": 0.0,
+        "total_cost": 0.0,
+        "fee_cost": 0.0,
+        "gas_cost_usd": 0.0,
+        "avg_pair_cost": 0.0,
+        "net_profit_usd": 0.0,
+        "net_profit_per_unit": 0.0,
+        "levels_consumed": 0,
+    }
+
+
+def _finish(size: float, cost: float, fees: float, levels: int, gas_cost_usd: float) -> dict[str, float]:
+    if size <= 0:
+        return _empty_sizing()
+    total_cost = cost + fees + gas_cost_usd
+    net = size - total_cost
+    if net <= 0:
+        return _empty_sizing()
+    return {
+        "max_size": round(size, 4),
+        "total_cost": round(total_cost, 6),
+        "fee_cost": round(fees, 6),
+        "gas_cost_usd": round(gas_cost_usd, 6),
+        "avg_pair_cost": round(cost / size, 6),
+        "net_profit_usd": round(net, 6),
+        "net_profit_per_unit": round(net / size, 6),
+        "levels_consumed": levels,
+    }
+
+
+def _walk_python(yes: Ladder, no: Ladder, yes_fee: LegFee, no_fee: LegFee) -> tuple[float, float, float, int]:
+    i = j = 0
+    size = cost = fees = 0.0
+    rem_y = yes[0][1] if yes else 0.0
+    rem_n = no[0][1] if no else 0.0
+    levels = 0
+    while i < len(yes) and j < len(no):
+        pair_price = yes[i][0] + no[j][0]
+        pair_fee = yes_fee(yes[i][0]) + no_fee(no[j][0])
+        if pair_price + pair_fee >= 1.0:
+            break
+        qty = min(rem_y, rem_n)
+        size += qty
+        cost += qty * pair_price
+        fees += qty * pair_fee
+        levels += 1
+        rem_y -= qty
+        rem_n -= qty
+        if rem_y <= 0:
+            i += 1
+            rem_y = yes[i][1] if i < len(yes) else 0.0
+        if rem_n <= 0:
+            j += 1
+            rem_n = no[j][1] if j < len(no) else 0.0
+    return size, cost, fees, levels
+
+
+def _walk_numpy(yes: Ladder, no: Ladder, yes_fee: LegFee, no_fee: LegFee) -> tuple[float, float, float, int]:
+    y = np.asarray(yes, dtype=np.float64)
+    n = np.asarray(no, dtype=np.float64)
+    cum_y = np.cumsum(y[:, 1])
+    cum_n = np.cumsum(n[:, 1])
+    # Every cumulative-size breakpoint of either ladder starts a new segment
+    # where both marginal prices are constant.
+    ends = np.union1d(cum_y, cum_n)
+    ends = ends[ends <= min(cum_y[-1], cum_n[-1])]
+    starts = np.concatenate(([0.0], ends[:-1]))
+    widths = ends - starts
+    price_y = y[np.searchsorted(cum_y, ends, side="left"), 0]
+    price_n = n[np.searchsorted(cum_n, ends, side="left"), 0]
+    pair_price = price_y + price_n
+    pair_fee = yes_fee(price_y) + no_fee(price_n)
+    # Ask ladders are ascending and fees grow with price, so profitable segments form a prefix.
+    unprofitable = np.flatnonzero(pair_price + pair_fee >= 1.0)
+    profitable = int(unprofitable[0]) if unprofitable.size else len(pair_price)
+    size = float(widths[:profitable].sum())
+    cost = float((widths[:profitable] * pair_price[:profitable]).sum())
+    fees = float((widths[:profitable] * pair_fee[:profitable]).sum())
+    return size, cost, fees, profitable
+
+
+def size_direction(
+    yes_ladder: Ladder,
+    no_ladder: Ladder,
+    fee_rate: float = 0.01,
+    gas_cost_usd: float = 0.004,
+    yes_fee: LegFee | None = None,
+    no_fee: LegFee | None = None,
+) -> dict[str, float]:
+    """Maximum profitable size and size-weighted net profit for one YES+NO direction.
+
+    Each pair of contracts pays $1. Fees are fee_rate on notional unless a
+    leg has its own fee function (e.g. `FeeSchedule.leg_fee`); gas is a fixed
+    cost per trade and is charged once.
+    """
+    if not yes_ladder or not no_ladder:
+        return _empty_sizing()
+
+    def flat(price: Any) -> Any:
+        return price * fee_rate
+
+    yes_fee = yes_fee or flat
+    no_fee = no_fee or flat
+    if np is not None:
+        size, cost, fees, levels = _walk_numpy(yes_ladder, no_ladder, yes_fee, no_fee)
+    else:
+        size, cost, fees, levels = _walk_python(yes_ladder, no_ladder, yes_fee, no_fee)
+    return _finish(size, cost, fees, levels, gas_cost_usd)
+
+
+def _size_legs(
+    yes_market: dict[str, Any],
+    no_market: dict[str, Any],
+    yes_ladder: Ladder,
+    no_ladder: Ladder,
+    fee_rate: float,
+    gas_cost_usd: float,
+    fee_table: FeeTable | None,
+) -> dict[str, float]:
+    if fee_table is None:
+        return size_direction(yes_ladder, no_ladder, fee_rate, gas_cost_usd)
+    yes_sched = fee_table.schedule(yes_market.get("platform", ""))
+    no_sched = fee_table.schedule(no_market.get("platform", ""))
+    return size_direction(
+        yes_ladder,
+        no_ladder,
+        gas_cost_usd=yes_sched.leg_gas_usd + no_sched.leg_gas_usd,
+        yes_fee=yes_sched.leg_fee,
+        no_fee=no_sched.leg_fee,
+    )
+
+
+def strip_orderbooks(opportunities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Drop depth ladders from each opportunity's markets (in place) before it is persisted.
+
+    Markets are replaced by copies, so the accepted matches keep their books.
+    """
+    for row in opportunities:
+        for side in ("market_a", "market_b"):
+            market = row.get(side)
+            if isinstance(market, Market) and "orderbook" in market:
+                row[side] = market.with_orderbook(None)
+            elif isinstance(market, dict) and "orderbook" in market:
+                row[side] = {key: value for key, value in market.items() if key != "orderbook"}
+    return opportunities
+
+
+def _depth_economics(sizing: dict[str, float], top_pair_price: float) -> dict[str, float]:
+    """Per-contract-pair economics of a walked size, shaped like `_direction_metrics`.
+
+    Slippage is the size-weighted pair price above the top of book; fees
+    and gas are spread over the walked size.
+    """
+    size = sizing["max_size"]
+    if size <= 0:
+        return {
+            "gross_cost": round(top_pair_price, 6),
+            "fee_cost": 0.0,
+            "slippage_cost": 0.0,
+            "gas_cost_usd": 0.0,
+            "net_cost": 0.0,
+            "gross_profit": round(1.0 - top_pair_price, 6),
+            "net_profit": 0.0,
+            "profit_pct": 0.0,
+            "max_size": 0.0,
+            "net_profit_usd": 0.0,
+            "source": "orderbook",
+        }
+    net_cost = sizing["total_cost"] / size
+    return {
+        "gross_cost": round(top_pair_price, 6),
+        "fee_cost": round(sizing["fee_cost"] / size, 6),
+        "slippage_cost": round(sizing["avg_pair_cost"] - top_pair_price, 6),
+        "gas_cost_usd": round(sizing["gas_cost_usd"] / size, 6),
+        "net_cost": round(net_cost, 6),
+        "gross_profit": round(1.0 - top_pair_price, 6),
+        "net_profit": sizing["net_profit_per_unit"],
+        "profit_pct": round(sizing["net_profit_usd"] / sizing["total_cost"] * 100.0, 6),
+        "max_size": size,
+        "net_profit_usd": sizing["net_profit_usd"],
+        "source": "orderbook",
+    }
+
+
+def _apply_depth(row: dict[str, Any], ladders: dict[str, tuple[Ladder, Ladder]]) -> None:
+    """Replace a row's economics, direction and score with its depth-sized best direction.
+
+    Pairwise rows may switch direction; cluster rows keep the legs the
+    cluster search chose. Score weights profit_pct by the walked notional
+    instead of top-of-book liquidity.
+    """
+    directions = [row["direction"]] if "cluster_id" in row else ["A_yes_B_no", "B_yes_A_no"]
+    directions = [name for name in directions if all(ladders[name])]
+    if not directions:
+        return
+    best = max(directions, key=lambda name: (row["depth_sizing"][name]["net_profit_usd"], name == row["direction"]))
+    sizing = row["depth_sizing"][best]
+    yes_ladder, no_ladder = ladders[best]
+    economics = _depth_economics(sizing, yes_ladder[0][0] + no_ladder[0][0])
+    yes_market, no_market = (
+        (row["market_a"], row["market_b"]) if best == "A_yes_B_no" else (row["market_b"], row["market_a"])
+    )
+    row["direction"] = best
+    row["economics"] = economics
+    confidence = float(row.get("ai_confidence", 0.0))
+    row["score"] = round(economics["profit_pct"] * confidence * (sizing["total_cost"] / 10000.0), 6)
+    row["recommended_action"] = f"Buy YES on {yes_market['platform']} and NO on {no_market['platform']}"
+
+
+def attach_depth_sizing(
+    opportunities: list[dict[str, Any]],
+    fee_rate: float = 0.01,
+    gas_cost_usd: float = 0.004,
+    fee_table: FeeTable | None = None,
+) -> list[dict[str, Any]]:
+    """Add `depth_sizing` for both directions to each opportunity (in place).
+
+    When both markets carry order books, the depth-sized best direction also
+    replaces the row's economics and score (net_profit 0 means no size is
+    profitable at depth); rows without books keep their flat-slippage
+    economics. With fee_table, each leg pays its platform's fee curve and
+    chain gas instead of the flat fee_rate and gas_cost_usd.
+    """
+    ladders: dict[tuple[int, str], Ladder] = {}
+
+    def ladder(market: dict[str, Any], side: str) -> Ladder:
+        key = (id(market), side)
+        if key not in ladders:
+            ladders[key] = ladder_for(market, side)
+        return ladders[key]
+
+    for row in opportunities:
+        market_a = row["market_a"]
+        market_b = row["market_b"]
+        legs = {
+            "A_yes_B_no": (ladder(market_a, "yes"), ladder(market_b, "no")),
+            "B_yes_A_no": (ladder(market_b, "yes"), ladder(market_a, "no")),
+        }
+        booked = bool(market_a.get("orderbook") and market_b.get("orderbook"))
+        row["depth_sizing"] = {
+            "A_yes_B_no": _size_legs(market_a, market_b, *legs["A_yes_B_no"], fee_rate, gas_cost_usd, fee_table),
+            "B_yes_A_no": _size_legs(market_b, market_a, *legs["B_yes_A_no"], fee_rate, gas_cost_usd, fee_table),
+            "source": "orderbook" if booked else "top_of_book_liquidity",
+        }
+        if booked:
+            _apply_depth(row, legs)
+    return opportunities
@@ -0,0 +1,356 @@
+"""Streaming price ingestion from venue WebSocket channels.
+
+A `PriceStream` holds one WebSocket per venue feed, subscribes to the markets
+of the current accepted-match set, and folds every book, price-change or
+ticker message into a `PriceTable` of latest (yes, no) prices. Changed prices
+are pushed to an `on_update` callback, which the agent points at its
+`OpportunityBook`, so opportunities are re-scored and persisted per tick
+instead of per polling interval.
+
+Raw messages can be recorded to JSONL and replayed by `MockFeedServer`, a
+local stand-in that serves each venue path at the recorded pace.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+try:
+    from websockets.asyncio.client import connect
+    from websockets.asyncio.server import serve
+except ModuleNotFoundError:  # pragma: no cover - streaming is opt-in
+    connect = None  # type: ignore[assignment]
+    serve = None  # type: ignore[assignment]
+
+from src import jsonio
+from src.connectors.kalshi import _extract_prices as _kalshi_prices
+
+logger = logging.getLogger(__name__)
+
+POLYMARKET_WS = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+KALSHI_WS = "wss://api.elections.kalshi.com/trade-api/ws/v2"
+
+PriceUpdate = tuple[str, float, float]
+
+
+def _require_websockets() -> None:
+    if connect is None:
+        raise RuntimeError("Price streaming needs the 'websockets' package: pip install websockets")
+
+
+def _yes_no(market: dict[str, Any]) -> list[float]:
+    prices = {str(o.get("name", "")).lower(): float(o.get("price", 0.0)) for o in market.get("outcomes", [])}
+    return [prices.get("yes", 0.0), prices.get("no", 0.0)]
+
+
+class PriceTable:
+    """Latest (yes, no) price and update time per market id; thread-safe."""
+
+    def __init__(self) -> None:
+        self._prices: dict[str, tuple[float, float, float]] = {}
+        self._lock = threading.Lock()
+
+    def update(self, market_id: str, yes_price: float, no_price: float) -> bool:
+        """Store a price; return True if it differs from the previous one."""
+        with self._lock:
+            previous = self._prices.get(market_id)
+            self._prices[market_id] = (yes_price, no_price, time.monotonic())
+            return previous is None or previous[:2] != (yes_price, no_price)
+
+    def snapshot(
+        self, market_ids: list[str] | None = None, max_age_seconds: float | None = None
+    ) -> dict[str, tuple[float, float]]:
+        """Return {market_id: (yes, no)}, optionally only ids updated within max_age_seconds."""
+        now = time.monotonic()
+        with self._lock:
+            items = self._prices.items() if market_ids is None else (
+                (mid, self._prices[mid]) for mid in market_ids if mid in self._prices
+            )
+            return {
+                mid: (yes, no)
+                for mid, (yes, no, updated) in items
+                if max_age_seconds is None or now - updated <= max_age_seconds
+            }
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+
+class PolymarketFeed:
+    """CLOB market channel: per-token books, price changes and last trades."""
+
+    name = "Polymarket"
+
+    def __init__(self, markets: list[dict[str, Any]], url: str = POLYMARKET_WS):
+        self.url = url
+        self.headers: dict[str, str] = {}
+        self._tokens: dict[str, tuple[str, int]] = {}
+        self._state: dict[str, list[float]] = {}
+        self._last_trade: dict[str, float] = {}
+        for market in markets:
+            token_ids = market.get("token_ids") or []
+            if market.get("platform") != "Polymarket" or len(token_ids) < 2:
+                continue
+            market_id = str(market["market_id"])
+            self._state[market_id] = _yes_no(market)
+            for side, token_id in enumerate(token_ids[:2]):
+                self._tokens[str(token_id)] = (market_id, side)
+
+    def __bool__(self) -> bool:
+        return bool(self._tokens)
+
+    def subscribe_messages(self) -> list[dict[str, Any]]:
+        return [{"type": "market", "assets_ids": list(self._tokens)}]
+
+    def _token_price(self, asset_id: str, best_bid: Any, best_ask: Any) -> float | None:
+        try:
+            return round((float(best_bid) + float(best_ask)) / 2.0, 4)
+        except (TypeError, ValueError):
+            return self._last_trade.get(asset_id)
+
+    def _apply(self, asset_id: str, price: float | None) -> PriceUpdate | None:
+        target = self._tokens.get(asset_id)
+        if target is None or price is None:
+            return None
+        market_id, side = target
+        prices = self._state[market_id]
+        prices[side] = price
+        return market_id, prices[0], prices[1]
+
+    def parse(self, message: Any) -> list[PriceUpdate]:
+        """Translate one channel message (or list of messages) into price updates."""
+        if isinstance(message, list):
+            return [update for item in message for update in self.parse(item)]
+        if not isinstance(message, dict):
+            return []
+        event = message.get("event_type")
+        updates: list[PriceUpdate | None] = []
+        if event == "book":
+            bids = [float(level["price"]) for level in message.get("bids", []) if "price" in level]
+            asks = [float(level["price"]) for level in message.get("asks", []) if "price" in level]
+            asset_id = str(message.get("asset_id", ""))
+            best_bid = max(bids) if bids else None
+            best_ask = min(asks) if asks else None
+            updates.append(self._apply(asset_id, self._token_price(asset_id, best_bid, best_ask)))
+        elif event == "price_change":
+            for change in message.get("price_changes", []):
+                asset_id = str(change.get("asset_id", ""))
+                price = self._token_price(asset_id, change.get("best_bid"), change.get("best_ask"))
+                updates.append(self._apply(asset_id, price))
+        elif event == "last_trade_price":
+            asset_id = str(message.get("asset_id", ""))
+            try:
+                self._last_trade[asset_id] = float(message["price"])
+            except (KeyError, TypeError, ValueError):
+                return []
+            updates.append(self._apply(asset_id, self._last_trade[asset_id]))
+        return [update for update in updates if update is not None]
+
+
+class KalshiFeed:
+    """Kalshi `ticker` channel. Kalshi requires signed API-key headers on connect."""
+
+    name = "Kalshi"
+
+    def __init__(self, markets: list[dict[str, Any]], url: str = KALSHI_WS, headers: dict[str, str] | None = None):
+        self.url = url
+        self.headers = dict(headers or {})
+        self._tickers = {
+            str(market["source_id"]): str(market["market_id"])
+            for market in markets
+            if market.get("platform") == "Kalshi" and market.get("source_id")
+        }
+
+    def __bool__(self) -> bool:
+        return bool(self._tickers)
+
+    def subscribe_messages(self) -> list[dict[str, Any]]:
+        return [{"id": 1, "cmd": "subscribe", "params": {"channels": ["ticker"], "market_tickers": list(self._tickers)}}]
+
+    def parse(self, message: Any) -> list[PriceUpdate]:
+        if not isinstance(message, dict) or message.get("type") != "ticker":
+            return []
+        msg = message.get("msg", {})
+        market_id = self._tickers.get(str(msg.get("market_ticker", "")))
+        if market_id is None:
+            return []
+        yes_price, no_price = _kalshi_prices({"last_price": msg.get("price", 0), **msg})
+        return [(market_id, round(yes_price, 4), round(no_price, 4))] if yes_price > 0 else []
+
+
+def default_feeds(
+    markets: list[dict[str, Any]], kalshi_headers: dict[str, str] | None = None
+) -> list[PolymarketFeed | KalshiFeed]:
+    """Feeds covering the given markets; Kalshi is included only with auth headers."""
+    feeds: list[PolymarketFeed | KalshiFeed] = [PolymarketFeed(markets)]
+    if kalshi_headers:
+        feeds.append(KalshiFeed(markets, headers=kalshi_headers))
+    return [feed for feed in feeds if feed]
+
+
+class PriceStream:
+    """Run venue feeds on a background event loop and keep a latest-price table."""
+
+    def __init__(
+        self,
+        feeds: list[Any],
+        on_update: Callable[[str, float, float], None] | None = None,
+        table: PriceTable | None = None,
+        record_path: Path | None = None,
+        reconnect_max_seconds: float = 30.0,
+    ):
+        self.feeds = feeds
+        self.on_update = on_update
+        self.table = table or PriceTable()
+        self.record_path = record_path
+        self.reconnect_max_seconds = reconnect_max_seconds
+        self.stats = {"messages": 0, "updates": 0, "reconnects": 0}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._started = time.monotonic()
+
+    def _record(self, feed: Any, message: Any) -> None:
+        if self.record_path is None:
+            return
+        entry = {"t": round(time.monotonic() - self._started, 4), "venue": feed.name, "message": message}
+        with self.record_path.open("a", encoding="utf-8") as handle:
+            handle.write(jsonio.dumps(entry) + "\n")
+
+    async def _run_feed(self, feed: Any) -> None:
+        attempt = 0
+        while not self._stopping.is_set():
+            try:
+                async with connect(feed.url, additional_headers=feed.headers or None) as ws:
+                    for subscribe in feed.subscribe_messages():
+                        await ws.send(jsonio.dumps(subscribe))
+                    attempt = 0
+                    async for raw in ws:
+                        try:
+                            message = jsonio.loads(raw)
+                        except (TypeError, ValueError):
+                            continue
+                        self.stats["messages"] += 1
+                        self._record(feed, message)
+                        for market_id, yes_price, no_price in feed.parse(message):
+                            if self.table.update(market_id, yes_price, no_price):
+                                self.stats["updates"] += 1
+                                if self.on_update is not None:
+                                    self.on_update(market_id, yes_price, no_price)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("%s price feed disconnected: %s", feed.name, exc)
+            if self._stopping.is_set():
+                return
+            self.stats["reconnects"] += 1
+            await asyncio.sleep(random.uniform(0.0, min(self.reconnect_max_seconds, 0.5 * (2**attempt))))
+            attempt += 1
+
+    async def run(self) -> None:
+        """Run every feed until cancelled."""
+        _require_websockets()
+        await asyncio.gather(*(self._run_feed(feed) for feed in self.feeds))
+
+    def start(self) -> None:
+        """Run the stream on a daemon thread with its own event loop."""
+        _require_websockets()
+        self._loop = asyncio.new_event_loop()
+        self._task = self._loop.create_task(self.run())
+        self._thread = threading.Thread(target=self._run_loop, name="price-stream", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self) -> None:
+        assert self._loop is not None and self._task is not None
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Cancel the feeds and wait for the stream thread to exit."""
+        self._stopping.set()
+        if self._loop is not None and self._task is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def load_recorded_ticks(path: Path) -> list[dict[str, Any]]:
+    """Read {"t", "venue", "message"} records written by PriceStream(record_path=...)."""
+    with path.open("r", encoding="utf-8") as handle:
+        return [jsonio.loads(line) for line in handle if line.strip()]
+
+
+class MockFeedServer:
+    """Local WebSocket server replaying recorded ticks per venue.
+
+    Each venue is served at `/<venue name lowercased>`. After a client sends
+    its first (subscribe) message, that venue's ticks are replayed at the
+    recorded spacing divided by `speed` (0 sends them back to back). Send
+    times are kept in `sent_at` for latency measurements.
+    """
+
+    def __init__(self, ticks: list[dict[str, Any]], speed: float = 1.0, host: str = "127.0.0.1"):
+        self.ticks = ticks
+        self.speed = speed
+        self.host = host
+        self.port = 0
+        self.sent_at: list[float] = []
+        self._ready = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop: asyncio.Event | None = None
+        self._thread: threading.Thread | None = None
+
+    def url(self, venue: str) -> str:
+        return f"ws://{self.host}:{self.port}/{venue.lower()}"
+
+    async def _handler(self, ws: Any) -> None:
+        venue = ws.request.path.strip("/")
+        await ws.recv()
+        loop = asyncio.get_running_loop()
+        first: float | None = None
+        started = loop.time()
+        for tick in self.ticks:
+            if str(tick.get("venue", "")).lower() != venue:
+                continue
+            first = float(tick["t"]) if first is None else first
+            if self.speed > 0:
+                # Absolute schedule, so short sleeps do not accumulate drift.
+                delay = started + (float(tick["t"]) - first) / self.speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            self.sent_at.append(time.perf_counter())
+            await ws.send(jsonio.dumps(tick["message"]))
+        await ws.wait_closed()
+
+    async def _serve(self) -> None:
+        self._stop = asyncio.Event()
+        async with serve(self._handler, self.host, 0) as server:
+            self.port = next(iter(server.sockets)).getsockname()[1]
+            self._ready.set()
+            await self._stop.wait()
+
+    def start(self) -> MockFeedServer:
+        _require_websockets()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_until_complete, args=(self._serve(),), daemon=True)
+        self._thread.start()
+        self._ready.wait(5.0)
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread is not None:
+            self._thread.join(5.0)
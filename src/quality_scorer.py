@@ -1,9 +1,33 @@
-"""Market quality scoring for ArbSense."""
+"""Market quality scoring for ArbSense.
+
+Term lists are compiled once per `QualityScorer` into `TermMatcher`s that
+scan a whole batch of concatenated market texts at once, instead of every
+term being searched in every market separately. Results are cached by a hash of the fields the
+score depends on (title, description, resolution date and outcome names, not
+prices), so markets unchanged since the last cycle cost one dict lookup.
+`load_quality_scorer` reads term lists from data/quality_terms.json and
+reuses the compiled scorer until the file changes.
+"""
 
 from __future__ import annotations
 
+import hashlib
 import re
-from typing import Any
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, Iterable
+
+from src import jsonio
+
+DEFAULT_AMBIGUOUS_TERMS = ("soon", "maybe", "could", "someday", "eventually")
+DEFAULT_SPAM_TERMS = ("world end", "guaranteed moon", "1000x")
+
+GRADES = ("A", "B", "C", "D", "F")
+SPAM_REASON = "speculative/spam signals"
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+# Joins batch texts; terms containing it are dropped, so no match spans two markets.
+_SEPARATOR = "\x00"
 
 
 def quality_grade(score: int) -> str:
@@ -19,54 +43,202 @@ def quality_grade(score: int) -> str:
     return "F"
 
 
+class TermMatcher:
+    """Lower-case substring matcher for a term list, applied to a whole batch of texts at once.
+
+    Each term is searched with `str.find` over the joined batch, which in
+    CPython beats a regex alternation for short term lists; after a hit the
+    scan resumes at the next text, so a term costs at most one find per
+    flagged market plus one pass over the batch.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        unique = {str(term).lower() for term in terms if term and _SEPARATOR not in str(term)}
+        # A term containing a shorter one can never flag a text the shorter one misses.
+        self.terms = tuple(sorted(t for t in unique if not any(o != t and o in t for o in unique)))
+
+    def flag(self, blob: str, starts: list[int]) -> set[int]:
+        """Indices of the texts joined in blob (beginning at starts) that contain any term."""
+        flagged: set[int] = set()
+        last = len(starts) - 1
+        for term in self.terms:
+            position = blob.find(term)
+            while position >= 0:
+                index = bisect_right(starts, position) - 1
+                flagged.add(index)
+                if index == last:
+                    break
+                position = blob.find(term, starts[index + 1])
+        return flagged
+
+
+def _has_binary_outcomes(outcomes: Any) -> bool:
+    if not isinstance(outcomes, list) or len(outcomes) != 2:
+        return False
+    first, second = outcomes
+    if not isinstance(first, dict) or not isinstance(second, dict):
+        return False
+    names = (str(first.get("name", "")).strip().lower(), str(second.get("name", "")).strip().lower())
+    return names == ("yes", "no") or names == ("no", "yes")
+
+
+class QualityScorer:
+    """Compiled term matchers plus a content-hash cache of (score, grade, reasoning)."""
+
+    def __init__(
+        self,
+        ambiguous_terms: Iterable[str] = DEFAULT_AMBIGUOUS_TERMS,
+        spam_terms: Iterable[str] = DEFAULT_SPAM_TERMS,
+        max_entries: int = 100_000,
+    ):
+        self.ambiguous = TermMatcher(ambiguous_terms)
+        self.spam = TermMatcher(spam_terms)
+        self.max_entries = max_entries
+        self._cache: dict[bytes, tuple[int, str, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _fields(market: Any) -> tuple[str, str, str, bool]:
+        return (
+            str(market.get("title", "")),
+            str(market.get("description", "")),
+            str(market.get("resolution_date", "")),
+            _has_binary_outcomes(market.get("outcomes", [])),
+        )
+
+    @staticmethod
+    def _key(fields: tuple[str, str, str, bool]) -> bytes:
+        title, description, date_text, binary = fields
+        text = _SEPARATOR.join((title, description, date_text, "1" if binary else "0"))
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def _score_fields(self, batch: list[tuple[str, str, str, bool]]) -> list[tuple[int, str, str]]:
+        """Score uncached markets; term lists are matched once over the whole batch."""
+        texts = [f"{title} {description}".lower() for title, description, _, _ in batch]
+        starts: list[int] = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        blob = _SEPARATOR.join(texts)
+        ambiguous = self.ambiguous.flag(blob, starts)
+        spam = self.spam.flag(blob, starts)
+
+        results: list[tuple[int, str, str]] = []
+        for index, (title, description, date_text, binary) in enumerate(batch):
+            score = 50
+            reasons: list[str] = []
+            if len(title.split()) >= 5:
+                score += 8
+                reasons.append("clear title")
+            if len(description.split()) >= 10:
+                score += 12
+                reasons.append("detailed criteria")
+            if _DATE_RE.match(date_text):
+                score += 10
+                reasons.append("explicit deadline")
+            if binary:
+                score += 10
+                reasons.append("binary outcomes")
+            if index in ambiguous:
+                score -= 15
+                reasons.append("ambiguous phrasing")
+            if index in spam:
+                score -= 20
+                reasons.append(SPAM_REASON)
+            score = max(0, min(100, score))
+            results.append((score, quality_grade(score), ", ".join(reasons) if reasons else "baseline clarity"))
+        return results
+
+    def score_many(self, markets: Iterable[Any]) -> list[tuple[int, str, str]]:
+        """Return (score, grade, reasoning) per market, in order."""
+        results: list[tuple[int, str, str] | None] = []
+        pending: dict[bytes, list[int]] = {}
+        pending_fields: list[tuple[str, str, str, bool]] = []
+        cache = self._cache
+        for market in markets:
+            fields = self._fields(market)
+            key = self._key(fields)
+            cached = cache.get(key)
+            if cached is not None:
+                self.hits += 1
+                results.append(cached)
+                continue
+            self.misses += 1
+            if key not in pending:
+                pending[key] = []
+                pending_fields.append(fields)
+            pending[key].append(len(results))
+            results.append(None)
+
+        if pending:
+            if len(cache) + len(pending) > self.max_entries:
+                cache.clear()
+            for (key, positions), scored in zip(pending.items(), self._score_fields(pending_fields)):
+                cache[key] = scored
+                for position in positions:
+                    results[position] = scored
+        return results  # type: ignore[return-value]
+
+    def score(self, market: Any) -> tuple[int, str, str]:
+        return self.score_many([market])[0]
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+_DEFAULT_SCORER = QualityScorer()
+_LOADED: dict[str, tuple[int, QualityScorer]] = {}
+
+
+def load_quality_scorer(path: Path | None = None) -> QualityScorer:
+    """Scorer for the term lists in a JSON file, or the default scorer when it is missing.
+
+    The file holds `{"ambiguous_terms": [...], "spam_terms": [...]}`; an
+    omitted list keeps its default. The compiled scorer and its cache are
+    reused until the file's modification time changes.
+    """
+    if path is None or not path.exists():
+        return _DEFAULT_SCORER
+    mtime = path.stat().st_mtime_ns
+    loaded = _LOADED.get(str(path))
+    if loaded is not None and loaded[0] == mtime:
+        return loaded[1]
+    overrides = jsonio.read_json(path)
+    scorer = QualityScorer(
+        ambiguous_terms=overrides.get("ambiguous_terms", DEFAULT_AMBIGUOUS_TERMS),
+        spam_terms=overrides.get("spam_terms", DEFAULT_SPAM_TERMS),
+    )
+    _LOADED[str(path)] = (mtime, scorer)
+    return scorer
+
+
 def score_market_quality(market: dict[str, Any]) -> tuple[int, str, str]:
     """Return deterministic quality score, grade, and concise reasoning."""
-    score = 50
-    reasons: list[str] = []
-
-    title = str(market.get("title", ""))
-    description = str(market.get("description", ""))
-    date_text = str(market.get("resolution_date", ""))
-    outcomes = market.get("outcomes", [])
-
-    if len(title.split()) >= 5:
-        score += 8
-        reasons.append("clear title")
-    if len(description.split()) >= 10:
-        score += 12
-        reasons.append("detailed criteria")
-    if re.match(r"^\d{4}-\d{2}-\d{2}$", date_text):
-        score += 10
-        reasons.append("explicit deadline")
-    if isinstance(outcomes, list) and len(outcomes) == 2:
-        names = {str(o.get("name", "")).strip().lower() for o in outcomes if isinstance(o, dict)}
-        if names == {"yes", "no"}:
-            score += 10
-            reasons.append("binary outcomes")
-
-    ambiguous_terms = {"soon", "maybe", "could", "someday", "eventually"}
-    text = f"{title} {description}".lower()
-    if any(term in text for term in ambiguous_terms):
-        score -= 15
-        reasons.append("ambiguous phrasing")
-
-    spam_terms = {"world end", "guaranteed moon", "1000x"}
-    if any(term in text for term in spam_terms):
-        score -= 20
-        reasons.append("speculative/spam signals")
-
-    score = max(0, min(100, score))
-    grade = quality_grade(score)
-    reasoning = ", ".join(reasons) if reasons else "baseline clarity"
-    return score, grade, reasoning
-
-
-def enrich_with_quality_scores(markets: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """Add quality score metadata to each market."""
+    return _DEFAULT_SCORER.score(market)
+
+
+def passes_quality_gate(market: Any, min_grade: str = "D", block_spam: bool = True) -> bool:
+    """False for markets graded below min_grade or flagged as spam; unscored markets pass."""
+    grade = market.get("quality_grade")
+    if grade in GRADES and GRADES.index(grade) > GRADES.index(min_grade):
+        return False
+    return not (block_spam and SPAM_REASON in str(market.get("quality_reasoning", "")))
+
+
+def enrich_with_quality_scores(
+    markets: list[dict[str, Any]], scorer: QualityScorer | None = None, in_place: bool = False
+) -> list[dict[str, Any]]:
+    """Add quality score metadata to each market.
+
+    With in_place the markets are annotated directly instead of copied; use
+    it for freshly collected dicts nobody else holds.
+    """
+    scored = (scorer or _DEFAULT_SCORER).score_many(markets)
     enriched: list[dict[str, Any]] = []
-    for market in markets:
-        score, grade, reasoning = score_market_quality(market)
-        market_with_quality = dict(market)
+    for market, (score, grade, reasoning) in zip(markets, scored):
+        market_with_quality = market if in_place else dict(market)
         market_with_quality["quality_score"] = score
         market_with_quality["quality_grade"] = grade
         market_with_quality["quality_reasoning"] = reasoning
@@ -4,9 +4,14 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Any
+from typing import Any, Callable
 
+from src import jsonio
 from src.config import Settings
+from src.fixtures import through_fixtures
+from src.local_verifier import LearnedVerifier, load_local_verifier
+from src.market_features import MarketFeatureIndex, date_ordinal, day_gap, jaccard
+from src.market_model import as_market_dict
 
 try:
     from anthropic import Anthropic
@@ -30,10 +35,10 @@ Prioritize precision over recall. Reject uncertain matches.
 Compare these markets:
 
 Market A:
-{json.dumps(market_a, indent=2)}
+{json.dumps(as_market_dict(market_a), indent=2)}
 
 Market B:
-{json.dumps(market_b, indent=2)}
+{json.dumps(as_market_dict(market_b), indent=2)}
 
 Embedding similarity score: {similarity_score:.6f}
 
@@ -66,11 +71,11 @@ def _extract_json(text: str) -> dict[str, Any]:
     """Extract JSON object from model output safely."""
     text = text.strip()
     if text.startswith("{") and text.endswith("}"):
-        return json.loads(text)
+        return jsonio.loads(text)
     match = re.search(r"\{.*\}", text, re.DOTALL)
     if not match:
         raise ValueError("No JSON object found in model output.")
-    return json.loads(match.group(0))
+    return jsonio.loads(match.group(0))
 
 
 def _validate_result(raw: dict[str, Any]) -> dict[str, Any]:
@@ -96,40 +101,21 @@ def _validate_result(raw: dict[str, Any]) -> dict[str, Any]:
 
 
 def _local_precision_fallback(
-    market_a: dict[str, Any], market_b: dict[str, Any], similarity_score: float
+    market_a: dict[str, Any],
+    market_b: dict[str, Any],
+    similarity_score: float,
+    index: MarketFeatureIndex | None = None,
 ) -> dict[str, Any]:
     """Deterministic precision-first fallback verifier for offline mode."""
-    title_a = str(market_a.get("title", "")).lower()
-    title_b = str(market_b.get("title", "")).lower()
-    desc_a = str(market_a.get("description", "")).lower()
-    desc_b = str(market_b.get("description", "")).lower()
-    text_a = f"{title_a} {desc_a}"
-    text_b = f"{title_b} {desc_b}"
-
-    date_a = str(market_a.get("resolution_date", ""))
-    date_b = str(market_b.get("resolution_date", ""))
-    cat_a = str(market_a.get("category", "")).lower()
-    cat_b = str(market_b.get("category", "")).lower()
-
-    def score_overlap(lhs: str, rhs: str) -> float:
-        lhs_tokens = set(re.findall(r"[a-z0-9]+", lhs))
-        rhs_tokens = set(re.findall(r"[a-z0-9]+", rhs))
-        if not lhs_tokens or not rhs_tokens:
-            return 0.0
-        inter = len(lhs_tokens.intersection(rhs_tokens))
-        union = len(lhs_tokens.union(rhs_tokens))
-        return inter / union
-
-    overlap = score_overlap(text_a, text_b)
-    common_tokens = set(re.findall(r"[a-z0-9]+", text_a)).intersection(
-        set(re.findall(r"[a-z0-9]+", text_b))
-    )
-    strong_token_hit = any(
-        token in common_tokens
-        for token in {"bitcoin", "india", "world", "cup", "mars", "usdc", "ethereum", "gold", "recession", "solana", "etf", "gdp"}
-    )
-    same_date = date_a == date_b and bool(date_a)
-    same_category = cat_a == cat_b and bool(cat_a)
+    if index is None:
+        index = MarketFeatureIndex()
+    fa = index.features(market_a)
+    fb = index.features(market_b)
+
+    overlap = jaccard(fa.text_tokens, fb.text_tokens)
+    strong_token_hit = bool(fa.strong_tokens & fb.strong_tokens)
+    same_date = fa.date_text == fb.date_text and bool(fa.date_text)
+    same_category = fa.category == fb.category and bool(fa.category)
     precision_gate = (
         similarity_score >= 0.71
         and overlap >= 0.24
@@ -196,23 +182,27 @@ def _verify_with_anthropic(
     settings: Settings, market_a: dict[str, Any], market_b: dict[str, Any], similarity_score: float
 ) -> dict[str, Any]:
     """Verify using Anthropic API."""
-    if Anthropic is None:
-        raise RuntimeError("anthropic package unavailable")
-    if not settings.anthropic_api_key:
-        raise RuntimeError("ANTHROPIC_API_KEY missing")
-
-    client = Anthropic(api_key=settings.anthropic_api_key)
     prompt = _verification_prompt(market_a, market_b, similarity_score)
-    response = client.messages.create(
-        model=settings.verifier_model,
-        max_tokens=900,
-        temperature=0,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    content = ""
-    for block in response.content:
-        if getattr(block, "type", "") == "text":
-            content += block.text
+
+    def live() -> str:
+        if Anthropic is None:
+            raise RuntimeError("anthropic package unavailable")
+        if not settings.anthropic_api_key:
+            raise RuntimeError("ANTHROPIC_API_KEY missing")
+        client = Anthropic(api_key=settings.anthropic_api_key)
+        response = client.messages.create(
+            model=settings.verifier_model,
+            max_tokens=900,
+            temperature=0,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        content = ""
+        for block in response.content:
+            if getattr(block, "type", "") == "text":
+                content += block.text
+        return content
+
+    content = through_fixtures("anthropic.messages", {"model": settings.verifier_model, "prompt": prompt}, live)
     return _validate_result(_extract_json(content))
 
 
@@ -220,51 +210,88 @@ def _verify_with_openai(
     settings: Settings, market_a: dict[str, Any], market_b: dict[str, Any], similarity_score: float
 ) -> dict[str, Any]:
     """Fallback verification using OpenAI chat model."""
-    if OpenAI is None:
-        raise RuntimeError("openai package unavailable")
-    if not settings.openai_api_key:
-        raise RuntimeError("OPENAI_API_KEY missing")
-
-    client = OpenAI(api_key=settings.openai_api_key)
     prompt = _verification_prompt(market_a, market_b, similarity_score)
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        temperature=0,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    content = response.choices[0].message.content or "{}"
+
+    def live() -> str:
+        if OpenAI is None:
+            raise RuntimeError("openai package unavailable")
+        if not settings.openai_api_key:
+            raise RuntimeError("OPENAI_API_KEY missing")
+        client = OpenAI(api_key=settings.openai_api_key)
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
+            temperature=0,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        return response.choices[0].message.content or "{}"
+
+    content = through_fixtures("openai.chat", {"model": "gpt-4o-mini", "prompt": prompt}, live)
     return _validate_result(_extract_json(content))
 
 
+# (market_a, market_b, similarity_score) -> (verification, provider); defaults to `verify_pair`.
+PairVerifier = Callable[[dict[str, Any], dict[str, Any], float], tuple[dict[str, Any], str]]
+
+
 def verify_pair(
-    market_a: dict[str, Any], market_b: dict[str, Any], similarity_score: float, settings: Settings
+    market_a: dict[str, Any],
+    market_b: dict[str, Any],
+    similarity_score: float,
+    settings: Settings,
+    learned: LearnedVerifier | None = None,
+    index: MarketFeatureIndex | None = None,
 ) -> tuple[dict[str, Any], str]:
-    """Verify one candidate pair using Anthropic, then OpenAI, then local fallback."""
+    """Verify one candidate pair using the learned tier, Anthropic, OpenAI, then local fallback.
+
+    The learned verifier answers directly only when its match probability
+    (and, for matches, its safety probability) is decisive; otherwise it is
+    kept as the offline fallback ahead of the hand-tuned rules, with a SAFE
+    verdict capped at CAUTION.
+    """
+    learned_result = None
+    if learned is not None:
+        learned_result = learned.verify(market_a, market_b, similarity_score, index)
+        if learned.is_decisive(learned_result, settings.learned_verifier_confidence):
+            return learned_result, "local_model"
     try:
         return _verify_with_anthropic(settings, market_a, market_b, similarity_score), "anthropic"
     except Exception:
         try:
             return _verify_with_openai(settings, market_a, market_b, similarity_score), "openai"
         except Exception:
-            return _local_precision_fallback(market_a, market_b, similarity_score), "local_fallback"
+            if learned_result is not None:
+                return learned.capped(learned_result), "local_model"
+            return _local_precision_fallback(market_a, market_b, similarity_score, index), "local_fallback"
+
+
+def load_learned_verifier(settings: Settings) -> LearnedVerifier | None:
+    """Load the trained local verifier from the data directory, if present."""
+    return load_local_verifier(settings.data_dir / "local_verifier.json")
 
 
 def verify_candidate_pairs(
-    candidate_pairs: list[dict[str, Any]], settings: Settings
+    candidate_pairs: list[dict[str, Any]], settings: Settings, verifier: PairVerifier | None = None
 ) -> tuple[list[dict[str, Any]], str]:
     """Verify candidate pairs with per-run call guardrails."""
     limit = settings.max_verification_calls_per_run
     selected = candidate_pairs[:limit]
 
+    learned = load_learned_verifier(settings) if verifier is None else None
+    index = MarketFeatureIndex()
     verified: list[dict[str, Any]] = []
     provider_used = "local_fallback"
     for pair in selected:
-        result, provider = verify_pair(
-            market_a=pair["market_a"],
-            market_b=pair["market_b"],
-            similarity_score=float(pair["similarity_score"]),
-            settings=settings,
-        )
+        if verifier is not None:
+            result, provider = verifier(pair["market_a"], pair["market_b"], float(pair["similarity_score"]))
+        else:
+            result, provider = verify_pair(
+                market_a=pair["market_a"],
+                market_b=pair["market_b"],
+                similarity_score=float(pair["similarity_score"]),
+                settings=settings,
+                learned=learned,
+                index=index,
+            )
         provider_used = provider
         verified.append(
             {
@@ -272,7 +299,8 @@ def verify_candidate_pairs(
                 "market_a": pair["market_a"],
                 "market_b": pair["market_b"],
                 "verification": result,
-                "time_decay_days": _resolution_day_gap(pair["market_a"], pair["market_b"]),
+                "provider": provider,
+                "time_decay_days": _resolution_day_gap(pair["market_a"], pair["market_b"], index),
             }
         )
 
@@ -280,15 +308,18 @@ def verify_candidate_pairs(
     return verified, provider_used
 
 
-def _resolution_day_gap(market_a: dict[str, Any], market_b: dict[str, Any]) -> int | None:
-    """Return absolute resolution-date gap in days, when parseable."""
-    from datetime import date
+def _resolution_day_gap(
+    market_a: dict[str, Any], market_b: dict[str, Any], index: MarketFeatureIndex | None = None
+) -> int | None:
+    """Return absolute resolution-date gap in days, when parseable.
 
-    da = str(market_a.get("resolution_date", ""))
-    db = str(market_b.get("resolution_date", ""))
-    try:
-        d1 = date.fromisoformat(da)
-        d2 = date.fromisoformat(db)
-    except ValueError:
+    Without an index only the two dates are parsed; building a throwaway
+    index would tokenize both markets just to compare them.
+    """
+    if index is not None:
+        return day_gap(index.features(market_a), index.features(market_b))
+    day_a = date_ordinal(market_a.get("resolution_date", ""))
+    day_b = date_ordinal(market_b.get("resolution_date", ""))
+    if day_a is None or day_b is None:
         return None
-    return abs((d1 - d2).days)
+    return abs(day_a - day_b)
@@ -0,0 +1,203 @@
+"""Columnar market snapshot store in Parquet, one file per agent cycle.
+
+Layout: `<root>/date=YYYY-MM-DD/cycle-<UTC timestamp>.parquet` (hive
+partitioning on the UTC date). Each row is one market with typed columns for
+the fields backtests and analytics filter on, plus the full normalized market
+as JSON in `record` so snapshots replay losslessly. Rows are sorted by
+platform, so row-group statistics let platform filters skip data; time-range
+filters prune whole date partitions first, then row groups by `snapshot_ts`.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time as dt_time, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from src import jsonio
+from src.market_model import Market
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ModuleNotFoundError:  # pragma: no cover - snapshots fall back to JSONL
+    pa = None  # type: ignore[assignment]
+    ds = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+ROW_GROUP_SIZE = 8192
+
+
+def parquet_available() -> bool:
+    return pa is not None
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("The Parquet snapshot store needs the 'pyarrow' package: pip install pyarrow")
+
+
+def snapshot_schema() -> pa.Schema:
+    """Column types of one snapshot file (the `date` partition column is added on read)."""
+    _require_pyarrow()
+    return pa.schema(
+        [
+            ("snapshot_ts", pa.timestamp("us", tz="UTC")),
+            ("position", pa.int32()),
+            ("platform", pa.dictionary(pa.int32(), pa.string())),
+            ("market_id", pa.string()),
+            ("title", pa.string()),
+            ("category", pa.dictionary(pa.int32(), pa.string())),
+            ("yes_price", pa.float64()),
+            ("no_price", pa.float64()),
+            ("yes_liquidity", pa.float64()),
+            ("no_liquidity", pa.float64()),
+            ("min_liquidity", pa.float64()),
+            ("resolution_date", pa.date32()),
+            ("quality_score", pa.int32()),
+            ("record", pa.string()),
+        ]
+    )
+
+
+def _as_utc(value: datetime | str) -> datetime:
+    moment = datetime.fromisoformat(value) if isinstance(value, str) else value
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment.astimezone(timezone.utc)
+
+
+def range_bound(value: datetime | date | str | None, end: bool) -> datetime | None:
+    """Datetime bound for a range filter; a bare date covers that whole UTC day."""
+    if value is None:
+        return None
+    if isinstance(value, str) and len(value) == 10:
+        value = date.fromisoformat(value)
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime.combine(value, dt_time.max if end else dt_time.min, tzinfo=timezone.utc)
+    return _as_utc(value)
+
+
+def _quality_score(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ParquetSnapshotStore:
+    """Append-only per-cycle Parquet snapshots with predicate-pushdown reads."""
+
+    def __init__(self, root: Path):
+        _require_pyarrow()
+        self.root = root
+
+    def append(self, markets: Iterable[dict[str, Any]], timestamp: datetime | str | None = None) -> Path:
+        """Write one cycle's markets as a new partition file and return its path."""
+        moment = _as_utc(timestamp) if timestamp is not None else datetime.now(timezone.utc)
+        columns: dict[str, list[Any]] = {name: [] for name in snapshot_schema().names}
+        rows = [Market.from_dict(market) for market in markets]
+        order = sorted(range(len(rows)), key=lambda i: (rows[i].platform, str(rows[i].market_id)))
+        for position in order:
+            market = rows[position]
+            columns["snapshot_ts"].append(moment)
+            columns["position"].append(position)
+            columns["platform"].append(market.platform)
+            columns["market_id"].append(str(market.market_id))
+            columns["title"].append(market.title)
+            columns["category"].append(market.category)
+            columns["yes_price"].append(float(market.yes_price))
+            columns["no_price"].append(float(market.no_price))
+            columns["yes_liquidity"].append(float(market.yes_liquidity))
+            columns["no_liquidity"].append(float(market.no_liquidity))
+            columns["min_liquidity"].append(market.min_liquidity)
+            ordinal = market.resolution_ordinal
+            columns["resolution_date"].append(None if ordinal is None else ordinal - _EPOCH_ORDINAL)
+            columns["quality_score"].append(_quality_score(market.get("quality_score")))
+            columns["record"].append(jsonio.dumps(market.to_dict()))
+        table = pa.table(columns, schema=snapshot_schema())
+
+        partition = self.root / f"date={moment.date().isoformat()}"
+        partition.mkdir(parents=True, exist_ok=True)
+        path = partition / f"cycle-{moment.strftime('%Y%m%dT%H%M%S%fZ')}.parquet"
+        # Dot-prefixed files are ignored by dataset discovery until the rename.
+        staging = partition / f".{path.name}.tmp"
+        pq.write_table(table, staging, compression="zstd", row_group_size=ROW_GROUP_SIZE)
+        staging.replace(path)
+        return path
+
+    def _dataset(self) -> ds.Dataset:
+        partitioning = ds.partitioning(pa.schema([("date", pa.date32())]), flavor="hive")
+        return ds.dataset(self.root, format="parquet", partitioning=partitioning)
+
+    @staticmethod
+    def _filter(
+        platforms: Iterable[str] | None,
+        start: datetime | date | str | None,
+        end: datetime | date | str | None,
+    ) -> ds.Expression | None:
+        expression = None
+
+        def both(term: ds.Expression) -> ds.Expression:
+            return term if expression is None else expression & term
+
+        lower = range_bound(start, end=False)
+        upper = range_bound(end, end=True)
+        if lower is not None:
+            expression = both(ds.field("date") >= pa.scalar(lower.date(), pa.date32()))
+            expression = both(ds.field("snapshot_ts") >= pa.scalar(lower, pa.timestamp("us", tz="UTC")))
+        if upper is not None:
+            expression = both(ds.field("date") <= pa.scalar(upper.date(), pa.date32()))
+            expression = both(ds.field("snapshot_ts") <= pa.scalar(upper, pa.timestamp("us", tz="UTC")))
+        if platforms is not None:
+            expression = both(ds.field("platform").isin(list(platforms)))
+        return expression
+
+    def scan(
+        self,
+        platforms: Iterable[str] | None = None,
+        start: datetime | date | str | None = None,
+        end: datetime | date | str | None = None,
+        columns: list[str] | None = None,
+    ) -> pa.Table:
+        """Read matching rows across all cycles; filters are pushed down to partitions and row groups.
+
+        Omit `record` from columns for analytics: the typed columns alone are
+        far cheaper to read. `to_pandas()` on the result gives a DataFrame.
+        """
+        if not self.root.exists():
+            return snapshot_schema().empty_table()
+        return self._dataset().to_table(columns=columns, filter=self._filter(platforms, start, end))
+
+    def iter_snapshots(
+        self,
+        platforms: Iterable[str] | None = None,
+        start: datetime | date | str | None = None,
+        end: datetime | date | str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield `{"timestamp", "markets"}` per cycle in time order, one file at a time.
+
+        Markets come back in their original collection order, so a replay
+        matches the JSONL snapshot path.
+        """
+        if not self.root.exists():
+            return
+        expression = self._filter(platforms, start, end)
+        dataset = self._dataset()
+        fragments = sorted(dataset.get_fragments(filter=expression), key=lambda f: Path(f.path).name)
+        for fragment in fragments:
+            table = fragment.to_table(
+                schema=dataset.schema, columns=["snapshot_ts", "position", "record"], filter=expression
+            )
+            if table.num_rows == 0:
+                continue
+            rows = sorted(zip(table.column("position").to_pylist(), table.column("record").to_pylist()))
+            yield {
+                "timestamp": table.column("snapshot_ts")[0].as_py().isoformat(),
+                "markets": [jsonio.loads(record) for _, record in rows],
+            }
+
+
+def is_snapshot_store(path: Path) -> bool:
+    """True for a directory laid out as a Parquet snapshot store."""
+    return path.is_dir() and any(child.is_dir() and child.name.startswith("date=") for child in path.iterdir())
@@ -0,0 +1,448 @@
+"""Embedded SQLite store for agent pipeline state.
+
+One database (WAL mode) holds every cycle's markets, candidate pairs,
+verification verdicts and opportunities, plus the agent log. Each row keeps
+its full JSON record next to typed, indexed columns (cycle, market_id,
+platform, ...), so the API answers filtered queries with index lookups
+instead of re-reading whole JSON files. Writes for a stage are one batched
+transaction that also records the stage as completed for the cycle, and
+readers resolve each stage's latest completed cycle from that record, so a
+stage that produced no rows reads back as empty rather than as an older
+cycle's rows. WAL lets API readers query while the agent writes.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from src import jsonio
+from src.market_model import Market
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cycles (
+    cycle_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    meta TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS markets (
+    cycle_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    platform TEXT NOT NULL,
+    market_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    yes_price REAL,
+    no_price REAL,
+    min_liquidity REAL,
+    quality_score INTEGER,
+    record TEXT NOT NULL,
+    PRIMARY KEY (cycle_id, position)
+);
+CREATE INDEX IF NOT EXISTS markets_by_id ON markets (market_id, cycle_id);
+CREATE INDEX IF NOT EXISTS markets_by_platform ON markets (platform, cycle_id);
+CREATE TABLE IF NOT EXISTS pairs (
+    cycle_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    market_a TEXT NOT NULL,
+    market_b TEXT NOT NULL,
+    platform_a TEXT NOT NULL,
+    platform_b TEXT NOT NULL,
+    similarity REAL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (cycle_id, position)
+);
+CREATE INDEX IF NOT EXISTS pairs_by_a ON pairs (market_a, cycle_id);
+CREATE INDEX IF NOT EXISTS pairs_by_b ON pairs (market_b, cycle_id);
+CREATE TABLE IF NOT EXISTS verdicts (
+    cycle_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    market_a TEXT NOT NULL,
+    market_b TEXT NOT NULL,
+    platform_a TEXT NOT NULL,
+    platform_b TEXT NOT NULL,
+    is_match INTEGER NOT NULL,
+    accepted INTEGER NOT NULL,
+    confidence REAL,
+    provider TEXT,
+    record TEXT NOT NULL,
+    PRIMARY KEY (cycle_id, position)
+);
+CREATE INDEX IF NOT EXISTS verdicts_by_a ON verdicts (market_a, cycle_id);
+CREATE INDEX IF NOT EXISTS verdicts_by_b ON verdicts (market_b, cycle_id);
+CREATE TABLE IF NOT EXISTS opportunities (
+    cycle_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    market_a TEXT NOT NULL,
+    market_b TEXT NOT NULL,
+    platform_a TEXT NOT NULL,
+    platform_b TEXT NOT NULL,
+    safety TEXT NOT NULL,
+    spread_pct REAL,
+    score REAL,
+    selected INTEGER NOT NULL DEFAULT 0,
+    record TEXT NOT NULL,
+    PRIMARY KEY (cycle_id, kind, position)
+);
+CREATE INDEX IF NOT EXISTS opportunities_by_a ON opportunities (market_a, cycle_id);
+CREATE INDEX IF NOT EXISTS opportunities_by_b ON opportunities (market_b, cycle_id);
+CREATE TABLE IF NOT EXISTS logs (
+    log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cycle_id INTEGER,
+    timestamp TEXT NOT NULL,
+    type TEXT NOT NULL,
+    message TEXT NOT NULL,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS logs_by_cycle ON logs (cycle_id);
+CREATE TABLE IF NOT EXISTS stages (
+    stage TEXT NOT NULL,
+    cycle_id INTEGER NOT NULL,
+    completed_at TEXT NOT NULL,
+    PRIMARY KEY (stage, cycle_id)
+);
+"""
+
+OPPORTUNITY_KINDS = ("safe", "time_value", "cluster")
+_CYCLE_TABLES = ("markets", "pairs", "verdicts", "opportunities")
+
+
+def _dumps(value: Any) -> str:
+    return jsonio.dumps(value, default=str)
+
+
+def _complete_stage(conn: sqlite3.Connection, stage: str, cycle_id: int) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO stages VALUES (?, ?, ?)",
+        (stage, cycle_id, datetime.now(timezone.utc).isoformat()),
+    )
+
+
+def _pair_columns(row: dict[str, Any]) -> tuple[str, str, str, str]:
+    market_a = row.get("market_a", {}) or {}
+    market_b = row.get("market_b", {}) or {}
+    return (
+        str(market_a.get("market_id", "")),
+        str(market_b.get("market_id", "")),
+        str(market_a.get("platform", "")),
+        str(market_b.get("platform", "")),
+    )
+
+
+class StateStore:
+    """SQLite pipeline state: one writer (the agent), any number of readers."""
+
+    def __init__(self, path: Path, readonly: bool = False, retain_cycles: int = 500):
+        self.path = path
+        self.readonly = readonly
+        self.retain_cycles = retain_cycles
+        self.cycle_id: int | None = None
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._pending_logs: list[tuple[Any, ...]] = []
+        if not readonly:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection; readers open the file read-only."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.readonly:
+                conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=5.0)
+            else:
+                conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """One write transaction; queued log entries are committed with it."""
+        with self._write_lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                if self._pending_logs:
+                    conn.executemany(
+                        "INSERT INTO logs (cycle_id, timestamp, type, message, extra) VALUES (?, ?, ?, ?, ?)",
+                        self._pending_logs,
+                    )
+                    self._pending_logs = []
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ── writes ──────────────────────────────────────────────────────
+
+    def start_cycle(self, started_at: str | None = None) -> int:
+        """Open a new cycle and drop cycles beyond the retention window."""
+        started_at = started_at or datetime.now(timezone.utc).isoformat()
+        with self._transaction() as conn:
+            self.cycle_id = int(conn.execute("INSERT INTO cycles (started_at) VALUES (?)", (started_at,)).lastrowid)
+            oldest = self.cycle_id - self.retain_cycles
+            if self.retain_cycles > 0 and oldest > 0:
+                for table in (*_CYCLE_TABLES, "logs", "stages"):
+                    conn.execute(f"DELETE FROM {table} WHERE cycle_id <= ?", (oldest,))
+                conn.execute("DELETE FROM cycles WHERE cycle_id <= ?", (oldest,))
+        return self.cycle_id
+
+    def _current_cycle(self) -> int:
+        return self.cycle_id if self.cycle_id is not None else self.start_cycle()
+
+    def update_cycle_meta(self, **meta: Any) -> None:
+        """Merge stage metadata (providers, thresholds, counts) into the cycle row."""
+        cycle_id = self._current_cycle()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT meta FROM cycles WHERE cycle_id = ?", (cycle_id,)).fetchone()
+            merged = {**jsonio.loads(row["meta"] if row else "{}"), **meta}
+            conn.execute("UPDATE cycles SET meta = ? WHERE cycle_id = ?", (_dumps(merged), cycle_id))
+
+    def write_markets(self, markets: Iterable[dict[str, Any]]) -> None:
+        rows = []
+        cycle_id = self._current_cycle()
+        for position, market in enumerate(markets):
+            parsed = Market.from_dict(market)
+            quality = market.get("quality_score")
+            rows.append(
+                (
+                    cycle_id,
+                    position,
+                    parsed.platform,
+                    str(parsed.market_id),
+                    parsed.title,
+                    parsed.yes_price,
+                    parsed.no_price,
+                    parsed.min_liquidity,
+                    int(quality) if isinstance(quality, (int, float)) else None,
+                    _dumps(parsed.to_dict()),
+                )
+            )
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM markets WHERE cycle_id = ?", (cycle_id,))
+            conn.executemany("INSERT INTO markets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            _complete_stage(conn, "markets", cycle_id)
+
+    def write_pairs(self, pairs: Iterable[dict[str, Any]]) -> None:
+        cycle_id = self._current_cycle()
+        rows = [
+            (cycle_id, position, *_pair_columns(pair), float(pair.get("similarity_score", 0.0)), _dumps(pair))
+            for position, pair in enumerate(pairs)
+        ]
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM pairs WHERE cycle_id = ?", (cycle_id,))
+            conn.executemany("INSERT INTO pairs VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            _complete_stage(conn, "pairs", cycle_id)
+
+    def write_verdicts(self, verified_rows: Iterable[dict[str, Any]], match_threshold: float) -> None:
+        cycle_id = self._current_cycle()
+        rows = []
+        for position, row in enumerate(verified_rows):
+            verification = row.get("verification", {}) or {}
+            is_match = bool(verification.get("is_match", False))
+            confidence = float(verification.get("confidence", 0.0))
+            rows.append(
+                (
+                    cycle_id,
+                    position,
+                    *_pair_columns(row),
+                    int(is_match),
+                    int(is_match and confidence >= match_threshold),
+                    confidence,
+                    str(row.get("provider", "")),
+                    _dumps(row),
+                )
+            )
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM verdicts WHERE cycle_id = ?", (cycle_id,))
+            conn.executemany("INSERT INTO verdicts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            _complete_stage(conn, "verdicts", cycle_id)
+
+    def write_opportunities(
+        self, by_kind: dict[str, list[dict[str, Any]]], selected: list[dict[str, Any]] | None = None
+    ) -> None:
+        """Replace this cycle's opportunities; reprice passes call this again for the same cycle."""
+        cycle_id = self._current_cycle()
+        selected_ids = {id(opp) for opp in selected or []}
+        rows = []
+        for kind in OPPORTUNITY_KINDS:
+            for position, opp in enumerate(by_kind.get(kind, [])):
+                verification = opp.get("verification", {}) or {}
+                rows.append(
+                    (
+                        cycle_id,
+                        kind,
+                        position,
+                        *_pair_columns(opp),
+                        str(verification.get("resolution_verdict", "CAUTION")),
+                        float(opp.get("spread_pct", 0.0)),
+                        float(opp.get("score", 0.0)),
+                        int(id(opp) in selected_ids),
+                        _dumps(opp),
+                    )
+                )
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM opportunities WHERE cycle_id = ?", (cycle_id,))
+            conn.executemany("INSERT INTO opportunities VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            _complete_stage(conn, "opportunities", cycle_id)
+
+    def log(self, entry: dict[str, Any], flush: bool = False) -> None:
+        """Queue a log entry; it is committed with the next write, or now when flush is set."""
+        extra = entry.get("extra")
+        self._pending_logs.append(
+            (
+                self.cycle_id,
+                str(entry.get("timestamp", "")),
+                str(entry.get("type", "system")),
+                str(entry.get("message", "")),
+                _dumps(extra) if extra else None,
+            )
+        )
+        if flush:
+            self.flush()
+
+    def flush(self) -> None:
+        """Commit queued log entries."""
+        if self._pending_logs:
+            with self._transaction():
+                pass
+
+    # ── reads ───────────────────────────────────────────────────────
+
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> list[sqlite3.Row]:
+        try:
+            return self._connection().execute(sql, tuple(params)).fetchall()
+        except sqlite3.OperationalError:
+            # Read-only readers see no tables until the agent has created them.
+            return []
+
+    def _latest_cycle(self, stage: str) -> int | None:
+        """Latest cycle that completed stage, even if it wrote no rows."""
+        rows = self._query("SELECT MAX(cycle_id) AS cycle_id FROM stages WHERE stage = ?", [stage])
+        return rows[0]["cycle_id"] if rows else None
+
+    def markets(self, platform: str | None = None, market_id: str | None = None) -> list[dict[str, Any]]:
+        """Markets of the latest collected cycle, optionally for one platform or market."""
+        cycle_id = self._latest_cycle("markets")
+        sql = "SELECT record FROM markets WHERE cycle_id = ?"
+        params: list[Any] = [cycle_id]
+        if platform is not None:
+            sql += " AND platform = ?"
+            params.append(platform)
+        if market_id is not None:
+            sql += " AND market_id = ?"
+            params.append(market_id)
+        return [jsonio.loads(row["record"]) for row in self._query(sql + " ORDER BY position", params)]
+
+    def _pair_rows(self, table: str, extra_where: str, market_id: str | None, order: str) -> list[sqlite3.Row]:
+        cycle_id = self._latest_cycle(table)
+        if market_id is None:
+            return self._query(
+                f"SELECT record FROM {table} WHERE cycle_id = ?{extra_where} ORDER BY {order}", [cycle_id]
+            )
+        # Two index lookups instead of an OR that would scan the cycle.
+        return self._query(
+            f"SELECT record FROM {table} WHERE cycle_id = ? AND market_a = ?{extra_where} "
+            f"UNION ALL SELECT record FROM {table} WHERE cycle_id = ? AND market_b = ?{extra_where}",
+            [cycle_id, market_id, cycle_id, market_id],
+        )
+
+    def verdicts(self, market_id: str | None = None, accepted_only: bool = False) -> list[dict[str, Any]]:
+        """Verification rows of the latest verifying cycle; accepted_only keeps matches above the threshold."""
+        where = " AND accepted = 1" if accepted_only else ""
+        return [jsonio.loads(row["record"]) for row in self._pair_rows("verdicts", where, market_id, "position")]
+
+    def opportunities(
+        self, kinds: Iterable[str] = ("safe", "time_value"), market_id: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Opportunities of the latest published cycle, in kind then rank order."""
+        # Only known kinds are interpolated into the SQL.
+        wanted = [kind for kind in OPPORTUNITY_KINDS if kind in set(kinds)]
+        if not wanted:
+            return []
+        where = " AND kind IN ({})".format(", ".join(f"'{kind}'" for kind in wanted))
+        ranks = " ".join(f"WHEN '{kind}' THEN {rank}" for rank, kind in enumerate(wanted))
+        order = f"CASE kind {ranks} END, position"
+        return [jsonio.loads(row["record"]) for row in self._pair_rows("opportunities", where, market_id, order)]
+
+    def top_opportunity(self) -> dict[str, Any] | None:
+        cycle_id = self._latest_cycle("opportunities")
+        rows = self._query("SELECT record FROM opportunities WHERE cycle_id = ? AND selected = 1 LIMIT 1", [cycle_id])
+        return jsonio.loads(rows[0]["record"]) if rows else None
+
+    def logs(self, limit: int = 100) -> list[dict[str, Any]]:
+        """Latest log entries, newest first."""
+        rows = self._query("SELECT timestamp, type, message, extra FROM logs ORDER BY log_id DESC LIMIT ?", [limit])
+        out = []
+        for row in rows:
+            entry = {"timestamp": row["timestamp"], "type": row["type"], "message": row["message"]}
+            if row["extra"]:
+                entry["extra"] = jsonio.loads(row["extra"])
+            out.append(entry)
+        return out
+
+    def _one(self, sql: str, params: Iterable[Any]) -> sqlite3.Row | None:
+        rows = self._query(sql, params)
+        return rows[0] if rows else None
+
+    def stats(self) -> dict[str, Any]:
+        """Dashboard aggregates, computed in SQL over the latest completed cycle of each stage."""
+        market_cycle = self._latest_cycle("markets")
+        markets = self._one(
+            "SELECT COUNT(*) AS n, AVG(COALESCE(quality_score, 0)) AS quality FROM markets WHERE cycle_id = ?",
+            [market_cycle],
+        )
+        platforms = self._query(
+            "SELECT DISTINCT platform FROM markets WHERE cycle_id = ? ORDER BY platform", [market_cycle]
+        )
+        matches = self._one(
+            "SELECT COUNT(*) AS n, AVG(confidence) AS confidence FROM verdicts WHERE cycle_id = ? AND is_match = 1",
+            [self._latest_cycle("verdicts")],
+        )
+        opps = self._one(
+            "SELECT COUNT(*) AS n, AVG(spread_pct) AS avg_spread, MAX(spread_pct) AS best_spread, "
+            "SUM(safety = 'SAFE') AS safe, SUM(safety = 'CAUTION') AS caution, SUM(safety = 'DANGER') AS danger "
+            "FROM opportunities WHERE cycle_id = ? AND kind IN ('safe', 'time_value')",
+            [self._latest_cycle("opportunities")],
+        )
+        return {
+            "markets_scanned": int(markets["n"]) if markets else 0,
+            "platform_names": [row["platform"] for row in platforms],
+            "avg_quality_score": float(markets["quality"] or 0.0) if markets else 0.0,
+            "matched_pairs": int(matches["n"]) if matches else 0,
+            "avg_confidence": float(matches["confidence"] or 0.0) if matches else 0.0,
+            "total_opportunities": int(opps["n"]) if opps else 0,
+            "safe_opportunities": int(opps["safe"] or 0) if opps else 0,
+            "caution_opportunities": int(opps["caution"] or 0) if opps else 0,
+            "danger_opportunities": int(opps["danger"] or 0) if opps else 0,
+            "avg_spread_pct": float(opps["avg_spread"] or 0.0) if opps else 0.0,
+            "best_spread_pct": float(opps["best_spread"] or 0.0) if opps else 0.0,
+        }
+
+    def pulse(self) -> dict[str, Any]:
+        """Market count, safe opportunity count and mean positive safe spread for the live stream."""
+        markets = self._one("SELECT COUNT(*) AS n FROM markets WHERE cycle_id = ?", [self._latest_cycle("markets")])
+        opps = self._one(
+            "SELECT COUNT(*) AS n, AVG(CASE WHEN spread_pct > 0 THEN spread_pct END) AS avg_spread "
+            "FROM opportunities WHERE cycle_id = ? AND kind = 'safe'",
+            [self._latest_cycle("opportunities")],
+        )
+        return {
+            "markets_scanned": int(markets["n"]) if markets else 0,
+            "opportunities": int(opps["n"]) if opps else 0,
+            "avg_spread": float(opps["avg_spread"] or 0.0) if opps else 0.0,
+        }